@@ -1,10 +1,12 @@
-from flask import Flask, jsonify, request, session
+from flask import Flask, jsonify, request, session, send_file
 from controllers.user_management import UserManagement
 from database.initializer import DatabaseInitializer
 from database.manager import DatabaseManager
 from database.persistence.group_persistence import GroupPersistence
 from database.persistence.message_persistence import MessagePersistence
 from database.persistence.event_persistence import EventPersistence
+from database.persistence.sync_run_persistence import SyncRunPersistence
+from database.persistence.login_event_persistence import LoginEventPersistence
 import logging
 import os
 from dotenv import load_dotenv
@@ -15,7 +17,17 @@ from flask_cors import CORS
 from functools import wraps
 from mediator.mediator import Mediator
 from components.components import SACIBotComponent, GroupManagerComponent, MessageManagerComponent
-from datetime import datetime
+from services.message_broker import MessageBroker, MessageNotificationListener, MEMBERSHIP_CHANGED
+from services.job_manager import JobManager
+from services.login_audit import LoginAuditService
+from services.password_hasher import PasswordHasher, PasswordHasherBusyError
+from business.login_html_report_generator import LoginHtmlReportGenerator
+from business.login_pdf_report_generator import LoginPdfReportGenerator
+from services.saci_sync_service import SaciSyncRunner, SaciSyncScheduler
+from config.settings import MESSAGE_PUSH_BACKEND, SSE_HEARTBEAT_SECONDS, SACI_SYNC_INTERVAL_SECONDS, STREAM_FETCH_SIZE, PASSWORD_HASH_RETRY_AFTER_SECONDS
+from datetime import datetime, timedelta
+import queue
+import tempfile
 
 facade = ChatCIFacade()
 load_dotenv()
@@ -144,6 +156,55 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# Respostas JSON em streaming para listas grandes (?stream=true)
+def wants_stream():
+    return request.args.get('stream', '').lower() in ('1', 'true')
+
+def stream_json_list(envelope, key, rows, transform=None):
+    """
+    Responde {**envelope, key: [...]} escrevendo o array em pedaços conforme as linhas chegam do cursor.
+    A primeira linha é lida antes de responder, para que falhas na consulta ainda virem um 500 normal.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    transform = transform or (lambda row: row)
+
+    def generate():
+        head = "".join(f"{app.json.dumps(k)}: {app.json.dumps(v)}, " for k, v in envelope.items())
+        yield "{" + head + app.json.dumps(key) + ": ["
+        if first is not None:
+            chunk = [app.json.dumps(transform(first))]
+            separator = ""
+            try:
+                for row in rows:
+                    chunk.append(app.json.dumps(transform(row)))
+                    if len(chunk) >= STREAM_FETCH_SIZE:
+                        yield separator + ", ".join(chunk)
+                        separator = ", "
+                        chunk = []
+            except Exception as e:
+                # O status 200 já foi enviado: interrompe a resposta, que chega truncada (JSON inválido)
+                logger.error(f"Erro durante resposta em streaming de {key}: {e}")
+                raise
+            if chunk:
+                yield separator + ", ".join(chunk)
+        yield "]}"
+
+    response = app.response_class(generate(), mimetype='application/json')
+    # Devolve a conexão do cursor mesmo se o cliente desconectar antes do fim
+    if hasattr(rows, 'close'):
+        response.call_on_close(rows.close)
+    return response
+
+def format_member(member):
+    """Formata um membro lido em modo compacto (namedtuple)"""
+    return {
+        "id": member.id,
+        "username": member.username,
+        "nome": f"{member.first_name} {member.last_name}".strip(),
+        "email": member.email
+    }
+
 user_manager = UserManagement()
 # instancia de cada dao
 group_manager = GroupPersistence()
@@ -162,6 +223,38 @@ mediator.register_component('bot', saci_component)
 mediator.register_component('group_manager', group_component)
 mediator.register_component('message_manager', message_component)
 
+# JOBS EM SEGUNDO PLANO (integração SACI)
+job_manager = JobManager()
+
+# SINCRONIZAÇÃO SACI: execuções manuais e agendadas passam pelo mesmo lock e histórico
+sync_run_manager = SyncRunPersistence()
+login_event_manager = LoginEventPersistence()
+saci_sync_runner = SaciSyncRunner(
+    lambda progress: mediator.notify("RUN_INTEGRATION", {"progress": progress}),
+    sync_run_manager
+)
+
+# ENTREGA DE MENSAGENS EM TEMPO REAL (SSE)
+message_broker = MessageBroker()
+# Remoções e banimentos acordam os streams do grupo, que conferem o acesso no cache
+group_manager.membership_cache.add_listener(message_broker.membership_changed)
+message_listener = None
+saci_sync_scheduler = None
+
+def start_background_services():
+    """
+    Inicia as threads de fundo (listener de NOTIFY das mensagens e agendador da sincronização SACI).
+    Chamada só pelo processo que atende as requisições, e não na importação do módulo:
+    importar o app (testes, shell) não deve abrir conexões LISTEN nem iniciar o scraper.
+    """
+    global message_listener, saci_sync_scheduler
+    if MESSAGE_PUSH_BACKEND == 'postgres':
+        message_listener = MessageNotificationListener(message_manager)
+        message_listener.start()
+    if SACI_SYNC_INTERVAL_SECONDS > 0:
+        saci_sync_scheduler = SaciSyncScheduler(saci_sync_runner)
+        saci_sync_scheduler.start()
+
 def init_db():
     try:
         logger.info("Inicializando o banco de dados...")
@@ -226,6 +319,13 @@ def test_auth():
         }
     })
 
+def password_hasher_busy_response(error: PasswordHasherBusyError):
+    """429 com Retry-After quando o executor de hashing de senhas está cheio"""
+    return jsonify({
+        "success": False,
+        "error": str(error)
+    }), 429, {"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)}
+
 @app.route("/api/login", methods=["POST", "OPTIONS"])
 def login():
     """
@@ -285,6 +385,15 @@ def login():
               type: boolean
             error:
               type: string
+      429:
+        description: Password hashing is saturated, retry after the Retry-After header
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            error:
+              type: string
     """
     if request.method == "OPTIONS":
         return jsonify({}), 200
@@ -313,7 +422,7 @@ def login():
                 "error": "Email e senha são obrigatórios"
             }), 400
         
-        usuario = facade.login(email, senha)
+        usuario = facade.login(email, senha, request.remote_addr)
         
         if usuario:
             session['user_id'] = usuario['id']
@@ -345,6 +454,8 @@ def login():
                 "success": False,
                 "error": "Usuário ou senha incorretos"
             }), 401
+    except PasswordHasherBusyError as e:
+        return password_hasher_busy_response(e)
     except Exception as e:
         logger.error(f"Erro no login: {e}")
         return jsonify({
@@ -407,6 +518,15 @@ def cadastro():
               type: boolean
             error:
               type: string
+      429:
+        description: Password hashing is saturated, retry after the Retry-After header
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            error:
+              type: string
     """
     if request.method == "OPTIONS":
         return jsonify({}), 200
@@ -476,6 +596,8 @@ def cadastro():
                 "success": False,
                 "error": "Erro ao realizar cadastro"
             }), 400
+    except PasswordHasherBusyError as e:
+        return password_hasher_busy_response(e)
     except Exception as e:
         logger.error(f"Erro no cadastro: {e}")
         return jsonify({
@@ -633,6 +755,12 @@ def grupos():
     ---
     tags:
       - Groups
+    parameters:
+      - name: stream
+        in: query
+        type: boolean
+        required: false
+        description: Stream the list from a server-side cursor instead of building it in memory
     responses:
       200:
         description: Groups retrieved successfully
@@ -663,11 +791,18 @@ def grupos():
         return jsonify({"success": False, "error": "Não autorizado"}), 401
     
     try:
-        all_groups = group_manager.get_all_groups()
         user_id = session.get('user_id')
         user_groups = group_manager.get_user_groups(user_id)
         user_group_ids = [group['id'] for group in user_groups]
-        
+
+        if wants_stream():
+            return stream_json_list(
+                {"success": True, "user_groups": user_group_ids},
+                "all_groups",
+                group_manager.iter_all_groups()
+            )
+
+        all_groups = group_manager.get_all_groups()
         return jsonify({
             "success": True,
             "all_groups": all_groups,
@@ -879,6 +1014,15 @@ def enviar_mensagem(grupo_id):
               type: boolean
             error:
               type: string
+      409:
+        description: The group was closed (its SACI turma no longer exists) and accepts no new messages
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            error:
+              type: string
     """
     if 'user_id' not in session:
         return jsonify({"success": False, "error": "Não autorizado"}), 401
@@ -891,6 +1035,12 @@ def enviar_mensagem(grupo_id):
                 "success": False,
                 "error": "Você não é membro deste grupo"
             }), 403
+
+        if group_manager.is_closed(grupo_id):
+            return jsonify({
+                "success": False,
+                "error": "Este grupo foi encerrado e não aceita novas mensagens"
+            }), 409
         
         data = request.get_json()
         text = data.get('text')
@@ -1013,7 +1163,27 @@ def get_mensagens(grupo_id):
         in: query
         type: integer
         required: false
-        description: Number of messages to skip (default 0)
+        description: Number of messages to skip (deprecated, prefer cursor)
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Opaque cursor returned as next_cursor by the previous page
+      - name: after_id
+        in: query
+        type: integer
+        required: false
+        description: Return the messages following this message ID, oldest first (incremental polling); continue from the largest returned ID while it is below latest_id
+      - name: before_id
+        in: query
+        type: integer
+        required: false
+        description: Return only messages older than this message ID (history)
+      - name: If-None-Match
+        in: header
+        type: string
+        required: false
+        description: ETag from a previous response; 304 is returned if no new messages exist
     responses:
       200:
         description: Messages retrieved successfully
@@ -1038,6 +1208,13 @@ def get_mensagens(grupo_id):
                   created_at:
                     type: string
                     format: date-time
+            latest_id:
+              type: integer
+            next_cursor:
+              type: string
+              description: Cursor for the next (older) page, null when there are no more messages
+      304:
+        description: No new messages since the ETag sent in If-None-Match
       401:
         description: Not authorized
         schema:
@@ -1071,13 +1248,55 @@ def get_mensagens(grupo_id):
         
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
+        after_id = request.args.get('after_id', type=int)
+        before_id = request.args.get('before_id', type=int)
+        cursor_token = request.args.get('cursor')
 
-        messages = message_manager.get_group_messages(grupo_id, limit, offset)
+        cursor = None
+        if cursor_token:
+            try:
+                cursor = message_manager.decode_cursor(cursor_token)
+            except ValueError:
+                return jsonify({
+                    "success": False,
+                    "error": "Cursor inválido"
+                }), 400
+
+        # ETag baseado na última mensagem do grupo: se nada mudou, não consulta as mensagens
+        latest_id = message_manager.get_latest_message_id(grupo_id)
+        etag = f"g{grupo_id}-m{latest_id or 0}"
+
+        is_history = before_id is not None or cursor is not None
+
+        if not is_history and request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+
+        next_cursor = None
+        if after_id is not None:
+            if latest_id is None or after_id >= latest_id:
+                messages = []
+            else:
+                messages = message_manager.get_group_messages_after(grupo_id, after_id, limit)
+        elif before_id is not None:
+            messages = message_manager.get_group_messages_before(grupo_id, before_id, limit)
+        elif offset:
+            messages = message_manager.get_group_messages(grupo_id, limit, offset)
+        else:
+            messages, next_page = message_manager.get_group_messages_page(grupo_id, cursor, limit)
+            next_cursor = message_manager.encode_cursor(next_page)
         
-        return jsonify({
+        response = jsonify({
             "success": True,
-            "messages": messages
+            "messages": messages,
+            "latest_id": latest_id,
+            "next_cursor": next_cursor
         })
+        if not is_history:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         logger.error(f"Erro ao buscar mensagens: {e}")
         return jsonify({
@@ -1085,6 +1304,84 @@ def get_mensagens(grupo_id):
             "error": "Erro interno do servidor"
         }), 500
         
+@app.route("/api/grupos/<int:grupo_id>/mensagens/stream", methods=["GET"])
+def stream_mensagens(grupo_id):
+    """
+    Stream new messages of a group (Server-Sent Events)
+    ---
+    tags:
+      - Messages
+    produces:
+      - text/event-stream
+    parameters:
+      - name: grupo_id
+        in: path
+        type: integer
+        required: true
+        description: Group ID
+    responses:
+      200:
+        description: Event stream; each "message" event carries one message as JSON. A "revoked" event is sent and the stream closed when the user is removed from or banned in the group
+      401:
+        description: Not authorized
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            error:
+              type: string
+      403:
+        description: Not a member of the group, or banned from it
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            error:
+              type: string
+    """
+    if 'user_id' not in session:
+        return jsonify({"success": False, "error": "Não autorizado"}), 401
+
+    user_id = session.get('user_id')
+
+    auth = group_manager.get_group_authorization(grupo_id, user_id)
+    if not auth['is_member'] or auth['is_banned']:
+        return jsonify({
+            "success": False,
+            "error": "Você não é membro deste grupo"
+        }), 403
+
+    subscription = message_broker.subscribe(grupo_id)
+
+    def generate():
+        # Sai do grupo ou banido durante a conexão: avisa o cliente e encerra o stream
+        revoked = "event: revoked\ndata: {}\n\n"
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    message = subscription.get(timeout=SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    message = None
+                # Acesso conferido no cache de membros: a invalidação (remoção/banimento neste processo)
+                # acorda o stream na hora; alterações feitas em outra réplica valem quando a entrada expira (TTL)
+                if not group_manager.is_member(grupo_id, user_id) or group_manager.is_banned(grupo_id, user_id):
+                    yield revoked
+                    return
+                if message is None:
+                    yield ": keep-alive\n\n"
+                elif message is not MEMBERSHIP_CHANGED:
+                    yield f"id: {message['id']}\nevent: message\ndata: {app.json.dumps(message)}\n\n"
+        finally:
+            message_broker.unsubscribe(grupo_id, subscription)
+
+    return app.response_class(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route("/api/grupos/<int:grupo_id>/membros/<int:user_id>/banir", methods=["POST"])
 @admin_required
 def banir_membro(grupo_id, user_id):
@@ -1155,23 +1452,20 @@ def banir_membro(grupo_id, user_id):
               type: string
     """
     try:
-        group = group_manager.get_group_by_id(grupo_id)
-        if not group:
+        auth = group_manager.get_group_authorization(grupo_id, user_id)
+        if not auth['group_exists']:
             return jsonify({
                 "success": False,
                 "error": "Grupo não encontrado"
             }), 404
 
-        from controllers.user_management import UserManagement
-        user_manager = UserManagement()
-        user = user_manager.get_user_by_id(user_id)
-        if not user:
+        if not auth['user_exists']:
             return jsonify({
                 "success": False,
                 "error": "Usuário não encontrado"
             }), 404
 
-        if group_manager.is_banned(grupo_id, user_id):
+        if auth['is_banned']:
             return jsonify({
                 "success": False,
                 "error": "Usuário já está banido deste grupo"
@@ -1265,23 +1559,20 @@ def desbanir_membro(grupo_id, user_id):
               type: string
     """
     try:
-        group = group_manager.get_group_by_id(grupo_id)
-        if not group:
+        auth = group_manager.get_group_authorization(grupo_id, user_id)
+        if not auth['group_exists']:
             return jsonify({
                 "success": False,
                 "error": "Grupo não encontrado"
             }), 404
 
-        from controllers.user_management import UserManagement
-        user_manager = UserManagement()
-        user = user_manager.get_user_by_id(user_id)
-        if not user:
+        if not auth['user_exists']:
             return jsonify({
                 "success": False,
                 "error": "Usuário não encontrado"
             }), 404
 
-        if not group_manager.is_banned(grupo_id, user_id):
+        if not auth['is_banned']:
             return jsonify({
                 "success": False,
                 "error": "Usuário não está banido deste grupo"
@@ -1322,6 +1613,11 @@ def listar_membros_grupo(grupo_id):
         type: integer
         required: true
         description: Group ID
+      - name: stream
+        in: query
+        type: boolean
+        required: false
+        description: Stream the list from a server-side cursor instead of building it in memory
     responses:
       200:
         description: Group members retrieved successfully
@@ -1387,16 +1683,16 @@ def listar_membros_grupo(grupo_id):
                 "error": "Você não é membro deste grupo"
             }), 403
 
-        members = group_manager.get_group_members(grupo_id)
+        if wants_stream():
+            return stream_json_list(
+                {"success": True},
+                "members",
+                group_manager.iter_group_members(grupo_id, compact=True),
+                format_member
+            )
 
-        formatted_members = []
-        for member in members:
-            formatted_members.append({
-                "id": member['id'],
-                "username": member['username'],
-                "nome": f"{member['first_name']} {member['last_name']}".strip(),
-                "email": member['email']
-            })
+        members = group_manager.get_group_members(grupo_id, compact=True)
+        formatted_members = [format_member(member) for member in members]
         
         return jsonify({
             "success": True,
@@ -1427,6 +1723,11 @@ def listar_membros_banidos(grupo_id):
         type: integer
         required: true
         description: Group ID
+      - name: stream
+        in: query
+        type: boolean
+        required: false
+        description: Stream the list from a server-side cursor instead of building it in memory
     responses:
       200:
         description: Banned members retrieved successfully
@@ -1484,16 +1785,16 @@ def listar_membros_banidos(grupo_id):
                 "error": "Grupo não encontrado"
             }), 404
 
-        banned_members = group_manager.get_banned_members(grupo_id)
+        if wants_stream():
+            return stream_json_list(
+                {"success": True},
+                "banned_members",
+                group_manager.iter_banned_members(grupo_id, compact=True),
+                format_member
+            )
 
-        formatted_banned_members = []
-        for member in banned_members:
-            formatted_banned_members.append({
-                "id": member['id'],
-                "username": member['username'],
-                "nome": f"{member['first_name']} {member['last_name']}".strip(),
-                "email": member['email']
-            })
+        banned_members = group_manager.get_banned_members(grupo_id, compact=True)
+        formatted_banned_members = [format_member(member) for member in banned_members]
         
         return jsonify({
             "success": True,
@@ -1542,7 +1843,7 @@ def logout():
 @admin_required
 def admin_scrape_saci():
     """
-    Execute SACI scraping integration
+    Start the SACI scraping integration as a background job
     ---
     tags:
       - Admin
@@ -1550,23 +1851,20 @@ def admin_scrape_saci():
       - bearerAuth: []
       - sessionAuth: []
     responses:
-      200:
-        description: Integration results
+      202:
+        description: Job accepted (or the already running integration job is returned)
         schema:
           type: object
           properties:
             success:
               type: boolean
-            turmas_found:
-              type: integer
-            groups_created:
-              type: integer
-            groups_existing:
-              type: integer
-            errors:
-              type: array
-              items:
-                type: string
+            job_id:
+              type: string
+            status:
+              type: string
+            deduplicated:
+              type: boolean
+              description: True when an integration was already running and its job was returned
       401:
         description: Unauthorized
         schema:
@@ -1596,20 +1894,520 @@ def admin_scrape_saci():
               type: string
     """
     try:
-        # Usar o Mediator para executar a integração
-        result = mediator.notify("RUN_INTEGRATION")
+        # A integração roda em segundo plano; o cliente acompanha pelo endpoint de status
+        job, created = job_manager.submit(
+            "saci_integration",
+            lambda progress: saci_sync_runner.run('manual', progress)
+        )
         
         return jsonify({
             "success": True,
-            "turmas_found": result['turmas_found'],
-            "groups_created": result['groups_created'],
-            "groups_existing": result['groups_existing'],
-            "errors": result['errors']
-        })
+            "job_id": job.id,
+            "status": job.status,
+            "deduplicated": not created
+        }), 202
     except Exception as e:
         logger.error(f"Erro na integração SACI: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route("/api/admin/jobs/<job_id>", methods=["GET"])
+@admin_required
+def admin_job_status(job_id):
+    """
+    Get the status of a background job
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+      - sessionAuth: []
+    parameters:
+      - name: job_id
+        in: path
+        type: string
+        required: true
+        description: Job ID returned when the job was submitted
+    responses:
+      200:
+        description: Job status
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            job:
+              type: object
+              properties:
+                id:
+                  type: string
+                kind:
+                  type: string
+                status:
+                  type: string
+                  enum: [queued, running, succeeded, failed]
+                phase:
+                  type: string
+                progress:
+                  type: number
+                result:
+                  type: object
+                error:
+                  type: string
+      404:
+        description: Job not found
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            error:
+              type: string
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({
+            "success": False,
+            "error": "Job não encontrado"
+        }), 404
+
+    return jsonify({
+        "success": True,
+        "job": job.to_dict()
+    })
+
+@app.route("/api/admin/saci-sync/runs", methods=["GET"])
+@admin_required
+def admin_saci_sync_runs():
+    """
+    History of SACI sync runs (manual and scheduled)
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+      - sessionAuth: []
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        default: 20
+        description: Maximum number of runs to return (max 100)
+    responses:
+      200:
+        description: Most recent runs first
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            runs:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  trigger:
+                    type: string
+                    enum: [scheduled, manual]
+                  status:
+                    type: string
+                    enum: [succeeded, failed]
+                  started_at:
+                    type: string
+                  duration_ms:
+                    type: integer
+                  turmas_found:
+                    type: integer
+                  groups_created:
+                    type: integer
+                  groups_updated:
+                    type: integer
+                  groups_closed:
+                    type: integer
+                  errors:
+                    type: integer
+                  error_message:
+                    type: string
+      400:
+        description: Invalid limit
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden
+      500:
+        description: Server error
+    """
+    try:
+        limit = min(int(request.args.get('limit', 20)), 100)
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "Parâmetro limit inválido"
+        }), 400
+
+    try:
+        runs = sync_run_manager.get_recent_runs(limit)
+        for run in runs:
+            run['started_at'] = run['started_at'].isoformat()
+        return jsonify({
+            "success": True,
+            "runs": runs
+        })
+    except Exception as e:
+        logger.error(f"Erro ao buscar histórico da sincronização SACI: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route("/api/admin/login-reports/html", methods=["GET"])
+@admin_required
+def admin_login_report_html():
+    """
+    Login report as an HTML document, streamed from the login history table
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+      - sessionAuth: []
+    produces:
+      - text/html
+    responses:
+      200:
+        description: HTML document with one paragraph per login
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden
+    """
+    # Inclui os logins que ainda estão na fila do escritor
+    LoginAuditService().flush(timeout=1.0)
+    return app.response_class(LoginHtmlReportGenerator().iter_document(), mimetype='text/html')
+
+@app.route("/api/admin/login-reports/pdf", methods=["GET"])
+@admin_required
+def admin_login_report_pdf():
+    """
+    Paginated PDF login report rendered on demand from the login history
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+      - sessionAuth: []
+    produces:
+      - application/pdf
+    parameters:
+      - name: start
+        in: query
+        type: string
+        format: date
+        required: false
+        description: First day included (YYYY-MM-DD)
+      - name: end
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Last day included (YYYY-MM-DD)
+    responses:
+      200:
+        description: PDF document, one line per login
+      400:
+        description: Invalid date
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            error:
+              type: string
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden
+      500:
+        description: Server error
+    """
+    try:
+        start = datetime.strptime(request.args['start'], '%Y-%m-%d').date() if request.args.get('start') else None
+        end = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if request.args.get('end') else None
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "Datas devem estar no formato AAAA-MM-DD"
+        }), 400
+
+    # Renderizado num arquivo temporário (não em memória) que o send_file envia em pedaços e fecha ao final
+    report_file = tempfile.TemporaryFile()
+    try:
+        LoginAuditService().flush(timeout=1.0)
+        LoginPdfReportGenerator(start=start, end=end, output=report_file).generateReport()
+        report_file.seek(0)
+        return send_file(report_file, mimetype='application/pdf', as_attachment=True,
+                         download_name='login_report.pdf')
+    except Exception as e:
+        report_file.close()
+        logger.error(f"Erro ao gerar relatório de login em PDF: {e}")
+        return jsonify({"success": False, "error": "Erro interno do servidor"}), 500
+
+@app.route("/api/admin/logins/daily", methods=["GET"])
+@admin_required
+def admin_logins_daily():
+    """
+    Successful and failed logins per day
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+      - sessionAuth: []
+    parameters:
+      - name: days
+        in: query
+        type: integer
+        required: false
+        default: 30
+        description: Number of days to look back (max 366)
+    responses:
+      200:
+        description: One entry per day with logins, oldest first
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            days:
+              type: array
+              items:
+                type: object
+                properties:
+                  day:
+                    type: string
+                    format: date
+                  successful:
+                    type: integer
+                  failed:
+                    type: integer
+                  unique_users:
+                    type: integer
+      400:
+        description: Invalid days
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden
+      500:
+        description: Server error
+    """
+    try:
+        days = max(min(int(request.args.get('days', 30)), 366), 1)
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "Parâmetro days inválido"
+        }), 400
+
+    try:
+        since = datetime.combine(datetime.now().date() - timedelta(days=days - 1), datetime.min.time())
+        rows = login_event_manager.get_logins_per_day(since)
+        for row in rows:
+            row['day'] = row['day'].isoformat()
+        return jsonify({
+            "success": True,
+            "days": rows
+        })
+    except Exception as e:
+        logger.error(f"Erro ao buscar logins por dia: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route("/api/admin/logins/last", methods=["GET"])
+@admin_required
+def admin_logins_last():
+    """
+    Last successful login of each user, most recent first
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+      - sessionAuth: []
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        default: 50
+        description: Maximum number of users to return (max 500)
+    responses:
+      200:
+        description: Last login per user
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            users:
+              type: array
+              items:
+                type: object
+                properties:
+                  user_id:
+                    type: integer
+                  username:
+                    type: string
+                  last_login:
+                    type: string
+                  ip:
+                    type: string
+      400:
+        description: Invalid limit
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden
+      500:
+        description: Server error
+    """
+    try:
+        limit = min(int(request.args.get('limit', 50)), 500)
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "Parâmetro limit inválido"
+        }), 400
+
+    try:
+        users = login_event_manager.get_last_logins(limit)
+        for user in users:
+            user['last_login'] = user['last_login'].isoformat()
+        return jsonify({
+            "success": True,
+            "users": users
+        })
+    except Exception as e:
+        logger.error(f"Erro ao buscar últimos logins: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route("/api/admin/logins/failed", methods=["GET"])
+@admin_required
+def admin_logins_failed():
+    """
+    Failed login attempts grouped by login and IP
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+      - sessionAuth: []
+    parameters:
+      - name: hours
+        in: query
+        type: integer
+        required: false
+        default: 24
+        description: Number of hours to look back (max 720)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        default: 100
+        description: Maximum number of entries to return (max 500)
+    responses:
+      200:
+        description: Most frequent attempts first
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            attempts:
+              type: array
+              items:
+                type: object
+                properties:
+                  login:
+                    type: string
+                  ip:
+                    type: string
+                  attempts:
+                    type: integer
+                  last_attempt:
+                    type: string
+      400:
+        description: Invalid parameters
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden
+      500:
+        description: Server error
+    """
+    try:
+        hours = max(min(int(request.args.get('hours', 24)), 720), 1)
+        limit = min(int(request.args.get('limit', 100)), 500)
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "Parâmetros hours e limit devem ser inteiros"
+        }), 400
+
+    try:
+        attempts = login_event_manager.get_failed_attempts(datetime.now() - timedelta(hours=hours), limit)
+        for attempt in attempts:
+            attempt['last_attempt'] = attempt['last_attempt'].isoformat()
+        return jsonify({
+            "success": True,
+            "attempts": attempts
+        })
+    except Exception as e:
+        logger.error(f"Erro ao buscar tentativas de login malsucedidas: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route("/api/admin/metrics", methods=["GET"])
+@admin_required
+def admin_metrics():
+    """
+    Runtime metrics for monitoring
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+      - sessionAuth: []
+    responses:
+      200:
+        description: Current metrics
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+            membership_cache:
+              type: object
+              description: Hit/miss counters of the group membership cache
+            login_audit:
+              type: object
+              description: Login audit pipeline (queued, written, batches, failed batches, dropped events)
+            password_hasher:
+              type: object
+              description: Password hashing executor (queued, running, rejected/timeout counters, hash latency histogram)
+            database_pool:
+              type: object
+              description: Connection pool usage (in_use, idle, waiting), exhaustion/timeout counters and wait time histogram
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden
+    """
+    return jsonify({
+        "success": True,
+        "membership_cache": group_manager.membership_cache.stats(),
+        "database_pool": DatabaseManager().pool_stats(),
+        "login_audit": LoginAuditService().stats(),
+        "password_hasher": PasswordHasher().stats()
+    })
+
 @app.route("/api/eventos", methods=["GET"])
 def get_eventos():
     """
@@ -1617,6 +2415,12 @@ def get_eventos():
     ---
     tags:
       - Events
+    parameters:
+      - name: stream
+        in: query
+        type: boolean
+        required: false
+        description: Stream the list from a server-side cursor instead of building it in memory
     responses:
       200:
         description: Events retrieved successfully
@@ -1655,7 +2459,9 @@ def get_eventos():
               type: string
     """
     try:
-        
+        if wants_stream():
+            return stream_json_list({"success": True}, "events", event_manager.iter_all_events())
+
         events = event_manager.get_all_events()
         
         return jsonify({
@@ -2200,8 +3006,13 @@ init_db()
 if __name__ == "__main__":
     try:
         db_manager = DatabaseManager()
+        debug = True
+        # Com o reloader do modo debug este bloco roda também no processo que só vigia os arquivos;
+        # as threads de fundo sobem apenas no processo filho que atende as requisições
+        if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+            start_background_services()
         # Configura o servidor para aceitar apenas HTTP
-        app.run(debug=True, host='0.0.0.0', port=5001, ssl_context=None)
+        app.run(debug=debug, host='0.0.0.0', port=5001, ssl_context=None)
     except Exception as e:
         logger.error(f"Erro ao iniciar o aplicativo: {e}")
     finally:
@@ -0,0 +1,55 @@
+"""
+Benchmark do relatório de login em PDF com muitas entradas (padrão: 100 mil).
+
+Por padrão os logins são sintéticos e gerados sob demanda, como chegam do cursor no servidor,
+então não é preciso banco. Com --db o relatório lê a tabela login_events (variáveis POSTGRES_*).
+O PDF é gravado num arquivo temporário, como no endpoint de administração.
+
+Uso (a partir da pasta ChatCI):
+    python -m benchmarks.bench_login_pdf [--entries 100000] [--db]
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from business.login_event import LoginEvent
+from business.login_pdf_report_generator import LoginPdfReportGenerator
+
+def synthetic_events(entries: int):
+    start = datetime(2025, 1, 1)
+    for i in range(entries):
+        yield LoginEvent(f"usuario{i % 500}", i % 500, start + timedelta(seconds=30 * i))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=100000)
+    parser.add_argument('--db', action='store_true', help="lê os logins da tabela login_events")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryFile() as output:
+        generator = LoginPdfReportGenerator(output=output)
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            if args.db:
+                generator.generateReport()
+            else:
+                generator.events = synthetic_events(args.entries)
+                generator.saveReport()
+        except Exception as e:
+            print(f"Falha ao gerar o relatório: {e}")
+            sys.exit(2)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        size = output.tell()
+
+    print(f"{generator.total} logins, {size / (1024 * 1024):.1f} MB de PDF")
+    print(f"  tempo: {elapsed:.2f} s ({generator.total / elapsed:.0f} linhas/s)")
+    print(f"  pico de memória alocada: {peak / (1024 * 1024):.1f} MB")
+
+if __name__ == '__main__':
+    main()
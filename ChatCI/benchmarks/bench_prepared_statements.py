@@ -0,0 +1,84 @@
+"""
+Benchmark das consultas quentes com e sem prepared statements (PREPARE/EXECUTE por conexão).
+
+Precisa de um PostgreSQL com o esquema do ChatCI; a conexão usa as mesmas variáveis
+POSTGRES_* do config/settings.py. Cada thread simula uma requisição por iteração,
+pegando uma conexão do pool, como a aplicação faz.
+
+Uso (a partir da pasta ChatCI):
+    python -m benchmarks.bench_prepared_statements [--threads 8] [--calls 2000] [--group-id 1] [--email x@y]
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from database.manager import DatabaseManager
+from database.persistence import base_persistence
+from database.persistence.group_persistence import GroupPersistence
+from database.persistence.message_persistence import MessagePersistence
+from database.persistence.user_persistence import UserPersistence
+
+def workloads(group_id: int, email: str):
+    """Consultas do conjunto quente, chamadas pelos próprios métodos dos DAOs"""
+    groups = GroupPersistence()
+    messages = MessagePersistence()
+    users = UserPersistence()
+
+    def membership():
+        # Sem o cache, para que toda chamada chegue ao banco
+        groups.membership_cache.invalidate(group_id)
+        groups.is_member(group_id, 0)
+
+    return {
+        'group_membership': membership,
+        'group_messages': lambda: messages.get_group_messages(group_id, 50, 0),
+        'group_messages_after': lambda: messages.get_group_messages_after(group_id, 0, 50),
+        'latest_message_id': lambda: messages.get_latest_message_id(group_id),
+        'user_by_email': lambda: users.get_user_by_email(email),
+    }
+
+def run(call, threads: int, calls: int):
+    """Executa calls chamadas distribuídas em threads; retorna (segundos, latências em ms)"""
+    def timed(_):
+        start = time.perf_counter()
+        call()
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = sorted(executor.map(timed, range(calls)))
+    return time.perf_counter() - start, latencies
+
+def percentile(values, fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--group-id', type=int, default=1)
+    parser.add_argument('--email', default='admin@chatci.com')
+    args = parser.parse_args()
+
+    try:
+        db_manager = DatabaseManager()
+    except Exception as e:
+        print(f"Banco indisponível ({e}); configure POSTGRES_HOST/PORT/DB/USER/PASSWORD e rode de novo.")
+        sys.exit(2)
+
+    print(f"{args.calls} chamadas por consulta, {args.threads} threads")
+    print(f"  {'consulta':<22} {'modo':<9} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    try:
+        for name, call in workloads(args.group_id, args.email).items():
+            for label, enabled in (('texto', False), ('prepared', True)):
+                base_persistence.PREPARED_STATEMENTS_ENABLED = enabled
+                call()  # aquecimento (inclui o PREPARE na primeira conexão)
+                elapsed, latencies = run(call, args.threads, args.calls)
+                print(f"  {name:<22} {label:<9} {args.calls / elapsed:8.0f} "
+                      f"{percentile(latencies, 0.5):8.2f} {percentile(latencies, 0.99):8.2f}")
+    finally:
+        db_manager.close_all_connections()
+
+if __name__ == '__main__':
+    main()
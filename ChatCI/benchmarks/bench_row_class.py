@@ -0,0 +1,65 @@
+"""
+Benchmark das linhas compactas (row_class) contra o dict por linha do _execute_query.
+
+Não precisa de banco: monta as linhas a partir de tuplas como as que o cursor devolve,
+usando o mesmo construtor de linhas do BasePersistence.
+
+Uso (a partir da pasta ChatCI):
+    python -m benchmarks.bench_row_class [--rows 100000] [--columns 5] [--repeat 5]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+
+from database.persistence.base_persistence import _row_builder
+
+def make_rows(rows: int, columns: int):
+    """Tuplas no formato do fetchall (id, texto, data...)"""
+    now = datetime.now()
+    base = (1, 'mensagem de teste', now, 42, 'usuario')
+    return [tuple((base[c % len(base)] if c else i) for c in range(columns)) for i in range(rows)]
+
+def build(raw_rows, columns_names, compact):
+    make = _row_builder(columns_names, compact)
+    return [make(row) for row in raw_rows]
+
+def measure_time(raw_rows, columns_names, compact, repeat):
+    """Melhor tempo entre as repetições, em milissegundos"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        build(raw_rows, columns_names, compact)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def measure_memory(raw_rows, columns_names, compact):
+    """Memória alocada pelas linhas construídas (sem contar as tuplas de origem), em MB"""
+    gc.collect()
+    tracemalloc.start()
+    result = build(raw_rows, columns_names, compact)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / (1024 * 1024)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--columns', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    columns_names = tuple(f"col{i}" for i in range(args.columns))
+    raw_rows = make_rows(args.rows, args.columns)
+
+    print(f"{args.rows} linhas, {args.columns} colunas (melhor de {args.repeat})")
+    for label, compact in (('dict', False), ('row_class', True)):
+        elapsed = measure_time(raw_rows, columns_names, compact, args.repeat)
+        memory = measure_memory(raw_rows, columns_names, compact)
+        print(f"  {label:<10} {elapsed:8.1f} ms  {memory:6.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,9 @@ from mediator.mediator import Mediator
 from components.components import SACIBotComponent, GroupManagerComponent, MessageManagerComponent
 from database.persistence.group_persistence import GroupPersistence
 from database.persistence.message_persistence import MessagePersistence
+from database.persistence.sync_run_persistence import SyncRunPersistence
+from services.saci_sync_service import SaciSyncRunner, SaciSyncScheduler
+from config.settings import SACI_SYNC_INTERVAL_SECONDS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('application')
@@ -21,9 +24,9 @@ class SACIApplication:
         self.mediator.register_component('group_manager', GroupManagerComponent())
         self.mediator.register_component('message_manager', MessageManagerComponent())
     
-    def run_integration(self):
+    def run_integration(self, progress=None):
         logger.info("Starting SACI integration...")
-        result = self.mediator.notify("RUN_INTEGRATION")
+        result = self.mediator.notify("RUN_INTEGRATION", {"progress": progress})
         
         logger.info(f"Integration complete:")
         logger.info(f"- Turmas found: {result['turmas_found']}")
@@ -31,4 +34,13 @@ class SACIApplication:
         logger.info(f"- Groups existing: {result['groups_existing']}")
         logger.info(f"- Errors: {result['errors']}")
         
-        return result
\ No newline at end of file
+        return result
+    
+    def run_scheduler(self, interval: float = None):
+        """Roda a sincronização periódica em primeiro plano (processo dedicado ao agendador)"""
+        interval = interval or SACI_SYNC_INTERVAL_SECONDS or 3600
+        runner = SaciSyncRunner(self.run_integration, SyncRunPersistence())
+        SaciSyncScheduler(runner, interval=interval).run()
+
+if __name__ == "__main__":
+    SACIApplication().run_scheduler()
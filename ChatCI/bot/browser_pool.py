@@ -0,0 +1,208 @@
+from contextlib import contextmanager
+from typing import Optional, List
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from config.settings import (CHROME_BIN, CHROMEDRIVER_PATH, BROWSER_POOL_MAX_SIZE, BROWSER_POOL_IDLE_TIMEOUT,
+                             BROWSER_POOL_MAX_USES, BROWSER_POOL_ACQUIRE_TIMEOUT)
+import atexit
+import os
+import platform
+import shutil
+import threading
+import time
+import logging
+
+logger = logging.getLogger('browser_pool')
+
+SYSTEM_CHROMEDRIVER_PATHS = ["/usr/bin/chromedriver", "/usr/lib/chromium/chromedriver"]
+
+def resolve_chromedriver_path() -> Optional[str]:
+    """
+    Descobre o chromedriver uma única vez: variável de ambiente, PATH, instalação do sistema
+    (pacote chromium-driver do dockerfile) e, por último, download pelo webdriver-manager.
+    """
+    if CHROMEDRIVER_PATH:
+        return CHROMEDRIVER_PATH
+
+    path = shutil.which("chromedriver")
+    if path:
+        return path
+
+    for path in SYSTEM_CHROMEDRIVER_PATHS:
+        if os.path.exists(path):
+            return path
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    except Exception as e:
+        logger.warning(f"Failed to resolve chromedriver with ChromeDriverManager: {e}")
+        return None
+
+class PooledBrowser:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+class BrowserPool:
+    """
+    Classe Singleton com navegadores Chrome headless reaproveitados entre execuções do scraper.
+    Os navegadores são criados sob demanda até max_size, verificados antes de cada empréstimo,
+    reciclados após max_uses e fechados quando ficam ociosos por mais de idle_timeout.
+    O lock só protege a lista de ociosos e a contagem: a verificação e o quit() de um navegador
+    acontecem fora dele, para que um navegador travado não bloqueie os outros empréstimos.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(BrowserPool, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, max_size: int = None, idle_timeout: float = None, max_uses: int = None):
+        if self._initialized:
+            return
+        self.max_size = max_size if max_size is not None else BROWSER_POOL_MAX_SIZE
+        self.idle_timeout = idle_timeout if idle_timeout is not None else BROWSER_POOL_IDLE_TIMEOUT
+        self.max_uses = max_uses if max_uses is not None else BROWSER_POOL_MAX_USES
+        self._idle: List[PooledBrowser] = []
+        self._size = 0
+        self._condition = threading.Condition()
+        self._driver_path = None
+        self._driver_path_resolved = False
+        self._reaper = threading.Thread(target=self._reap_loop, name='browser-pool-reaper', daemon=True)
+        self._reaper.start()
+        # Fecha os navegadores ociosos ao encerrar o processo, sem deixar chrome órfão
+        atexit.register(self.close_all)
+        self._initialized = True
+
+    @contextmanager
+    def borrow(self, timeout: float = BROWSER_POOL_ACQUIRE_TIMEOUT):
+        """Empresta um navegador; se o bloco falhar, o navegador é descartado em vez de devolvido"""
+        browser = self.acquire(timeout)
+        broken = False
+        try:
+            yield browser.driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(browser, broken)
+
+    def acquire(self, timeout: float = BROWSER_POOL_ACQUIRE_TIMEOUT) -> PooledBrowser:
+        deadline = time.monotonic() + timeout
+        while True:
+            browser = None
+            with self._condition:
+                while True:
+                    if self._idle:
+                        # Sai da lista ainda contando no tamanho do pool; é verificado fora do lock
+                        browser = self._idle.pop()
+                        break
+
+                    if self._size < self.max_size:
+                        # Reserva a vaga antes de criar o navegador fora do lock
+                        self._size += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("Nenhum navegador disponível no pool")
+                    self._condition.wait(remaining)
+
+            if browser is None:
+                break
+            if self._is_healthy(browser):
+                return browser
+            self._discard(browser)
+
+        try:
+            return PooledBrowser(self._create_driver())
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, browser: PooledBrowser, broken: bool = False):
+        browser.uses += 1
+        browser.last_used = time.monotonic()
+        if broken or browser.uses >= self.max_uses:
+            self._discard(browser)
+            return
+        with self._condition:
+            self._idle.append(browser)
+            self._condition.notify()
+
+    def close_all(self):
+        with self._condition:
+            browsers, self._idle = self._idle, []
+        for browser in browsers:
+            self._discard(browser)
+
+    def _reap_loop(self):
+        interval = max(self.idle_timeout / 2, 1)
+        while True:
+            time.sleep(interval)
+            self._reap_idle()
+
+    def _reap_idle(self):
+        now = time.monotonic()
+        with self._condition:
+            expired = [b for b in self._idle if now - b.last_used > self.idle_timeout]
+            for browser in expired:
+                self._idle.remove(browser)
+        for browser in expired:
+            self._discard(browser)
+
+    def _discard(self, browser: PooledBrowser):
+        """
+        Fecha um navegador que já saiu da lista de ociosos e só então libera a vaga;
+        chamar sem o lock (quit() pode demorar)
+        """
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.warning(f"Erro ao fechar navegador: {e}")
+        finally:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+
+    def _is_healthy(self, browser: PooledBrowser) -> bool:
+        try:
+            return browser.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _create_driver(self):
+        chrome_options = webdriver.ChromeOptions()
+
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+
+        if platform.system() == 'Linux':
+            chrome_options.add_argument('--disable-extensions')
+            chrome_options.add_argument('--disable-software-rasterizer')
+            chrome_options.add_argument('--window-size=1920,1080')
+
+        if CHROME_BIN:
+            chrome_options.binary_location = CHROME_BIN
+
+        if not self._driver_path_resolved:
+            self._driver_path = resolve_chromedriver_path()
+            self._driver_path_resolved = True
+
+        try:
+            if self._driver_path:
+                service = ChromeService(self._driver_path)
+                return webdriver.Chrome(service=service, options=chrome_options)
+            return webdriver.Chrome(options=chrome_options)
+        except Exception as e:
+            logger.error(f"Failed to initialize Chrome driver: {e}")
+            raise Exception("Could not initialize Chrome driver. Please ensure Chrome is installed.")
@@ -0,0 +1,51 @@
+from typing import List, Dict
+from urllib.request import Request, urlopen
+from bs4 import BeautifulSoup
+from config.settings import SACI_HTTP_TIMEOUT
+import logging
+
+logger = logging.getLogger('saci_http_scraper')
+
+# Ordem das colunas da tabela de turmas do SACI
+TURMA_FIELDS = ["code", "turma", "nome", "hora", "alunos", "departamento", "sala", "professor"]
+
+def parse_turmas_html(html: str) -> List[Dict]:
+    """Extrai as turmas de um HTML do SACI: cada <tr> com 8 <td> vira uma turma"""
+    soup = BeautifulSoup(html, "html.parser")
+    turmas = []
+
+    for row in soup.find_all("tr"):
+        cells = row.find_all("td")
+        if len(cells) == len(TURMA_FIELDS):
+            turmas.append({
+                field: cell.get_text(" ", strip=True)
+                for field, cell in zip(TURMA_FIELDS, cells)
+            })
+
+    return turmas
+
+class HttpSaciScraper:
+    """
+    Scraper sem navegador: baixa a página do SACI com uma requisição HTTP
+    e interpreta a tabela localmente.
+    """
+    def __init__(self, timeout: float = SACI_HTTP_TIMEOUT):
+        self.timeout = timeout
+
+    def fetch(self, url: str) -> str:
+        request = Request(url, headers={
+            "User-Agent": "Mozilla/5.0 (ChatCI SACI integration)",
+            "Accept": "text/html,application/xhtml+xml"
+        })
+        with urlopen(request, timeout=self.timeout) as response:
+            charset = response.headers.get_content_charset() or "utf-8"
+            return response.read().decode(charset, errors="replace")
+
+    def scrape(self, url: str) -> List[Dict]:
+        """
+        Retorna as turmas da página. Lista vazia indica que a tabela não veio no HTML
+        (ex.: página renderizada no cliente) e que o Selenium deve ser usado.
+        """
+        turmas = parse_turmas_html(self.fetch(url))
+        logger.info(f"Scraper HTTP encontrou {len(turmas)} turmas em {url}")
+        return turmas
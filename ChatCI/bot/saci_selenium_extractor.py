@@ -0,0 +1,61 @@
+from typing import List, Dict, Optional
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from bot.saci_http_scraper import TURMA_FIELDS
+import logging
+
+logger = logging.getLogger('saci_selenium_extractor')
+
+# Lê a tabela inteira numa única chamada ao navegador: só as linhas com todas as colunas de turma.
+# Enquanto a página ainda carrega (documento incompleto ou indicador de carregamento visível) retorna null.
+EXTRACT_TURMAS_SCRIPT = """
+const loading = document.querySelector(
+    '.v-progress-linear, .v-progress-circular, .v-skeleton-loader, .v-data-table__progress, [aria-busy="true"]'
+);
+if (document.readyState !== 'complete' || loading) {
+    return null;
+}
+return Array.from(document.querySelectorAll('tr'))
+    .map(tr => Array.from(tr.querySelectorAll('td')).map(td => td.innerText.trim()))
+    .filter(cells => cells.length === arguments[0]);
+"""
+
+class TableSettled:
+    """
+    Condição do WebDriverWait: a tabela só é aceita quando a página terminou de carregar
+    e as linhas lidas ficam idênticas em stable_polls leituras seguidas.
+    Evita devolver uma tabela renderizada pela metade, que faria a sincronização encerrar
+    os grupos das turmas que ainda não apareceram.
+    """
+    def __init__(self, stable_polls: int = 2):
+        self.stable_polls = stable_polls
+        self.previous = None
+        self.repeats = 0
+
+    def __call__(self, driver) -> Optional[List[List[str]]]:
+        rows = driver.execute_script(EXTRACT_TURMAS_SCRIPT, len(TURMA_FIELDS))
+        if not rows:
+            self.previous = None
+            self.repeats = 0
+            return None
+
+        if rows == self.previous:
+            self.repeats += 1
+        else:
+            self.previous = rows
+            self.repeats = 1
+        return rows if self.repeats >= self.stable_polls else None
+
+def extract_turmas(driver, timeout: float = 10, poll_frequency: float = 0.5) -> List[Dict]:
+    """
+    Espera a tabela de turmas carregar por completo e a extrai com um único execute_script por tentativa,
+    em vez de uma chamada ao WebDriver por célula e um sleep fixo.
+    Se a tabela não estabilizar dentro do timeout, retorna lista vazia (tratada como falha de leitura).
+    """
+    try:
+        rows = WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(TableSettled())
+    except TimeoutException:
+        logger.warning(f"Tabela de turmas não terminou de carregar em {timeout}s")
+        return []
+
+    return [dict(zip(TURMA_FIELDS, cells)) for cells in rows]
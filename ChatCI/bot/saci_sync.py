@@ -0,0 +1,58 @@
+from typing import List, Dict, Tuple, NamedTuple, Callable
+from bot.saci_http_scraper import TURMA_FIELDS
+import logging
+
+logger = logging.getLogger('saci_sync')
+
+def turma_key(turma: Dict) -> Tuple[str, str]:
+    """Identidade de uma turma do SACI: código da disciplina + número da turma"""
+    return (turma['code'], turma['turma'])
+
+def turma_data(turma: Dict) -> Dict[str, str]:
+    """Campos da turma guardados no grupo (groups.saci_data) para detectar mudanças"""
+    return {field: turma.get(field, "") for field in TURMA_FIELDS}
+
+def changed_fields(previous: Dict, current: Dict) -> List[str]:
+    return [field for field in TURMA_FIELDS if previous.get(field) != current.get(field)]
+
+class TurmasDiff(NamedTuple):
+    added: List[Dict]
+    changed: List[Tuple[Dict, Dict]]
+    removed: List[Dict]
+    unchanged: int
+
+def diff_turmas(groups: List[Dict], current: List[Dict], group_name: Callable[[Dict], str]) -> TurmasDiff:
+    """
+    Compara as turmas lidas do SACI com os grupos do banco (GroupDAO.get_saci_groups) pela chave (code, turma).
+    Uma turma muda quando os campos diferem dos guardados no grupo, quando o grupo está encerrado
+    ou quando o nome do grupo não é o esperado (renomeação pendente). Chaves repetidas mantêm a primeira ocorrência.
+    
+    Returns:
+        added (turmas sem grupo), changed (pares grupo, turma), removed (grupos abertos cuja turma sumiu)
+        e a quantidade de turmas sem mudança
+    """
+    groups_by_key = {(group['saci_code'], group['saci_turma']): group for group in groups}
+
+    added, changed = [], []
+    unchanged = 0
+    seen = set()
+    for turma in current:
+        key = turma_key(turma)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        group = groups_by_key.get(key)
+        if group is None:
+            added.append(turma)
+        elif (group['saci_data'] != turma_data(turma) or group['closed_at'] is not None
+              or group['name'] != group_name(turma)):
+            changed.append((group, turma))
+        else:
+            unchanged += 1
+
+    removed = [
+        group for key, group in groups_by_key.items()
+        if key not in seen and group['closed_at'] is None
+    ]
+    return TurmasDiff(added, changed, removed, unchanged)
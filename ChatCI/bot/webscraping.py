@@ -1,13 +1,7 @@
-from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from time import sleep
-import subprocess
-import os
 import json
 import re
 from datetime import datetime
@@ -15,6 +9,10 @@ from database.persistence.group_persistence import GroupPersistence
 from database.factory.user_dao_factory import UserDAOFactory
 from database.persistence.message_persistence import MessagePersistence
 from services.message_service import MessageService
+from bot.browser_pool import BrowserPool
+from bot.saci_http_scraper import HttpSaciScraper
+from bot.saci_selenium_extractor import extract_turmas
+from config.settings import SACI_URL, SACI_SCRAPER_BACKEND
 
 class SACIBot:
     def __init__(self):
@@ -23,58 +21,27 @@ class SACIBot:
         self.message_dao = MessagePersistence()
         self.message_service = MessageService()
         
-    def abrir_browser(self):
-        """Inicializa e abre o navegador Chrome"""
-        os.system("taskkill /f /im chrome.exe")
-        sleep(3)
-        subprocess.Popen(
-            '"C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe" --log-level=3 --remote-debugging-port=9222',
-            shell=True,
-        )
-        sleep(1)
-        self.options = webdriver.ChromeOptions()
-        self.options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
-        self.options.add_argument("--start-maximized")
-        self.options.add_argument("disable-infobars")
-        self.options.add_argument("--disable-extensions")
-        self.options.add_argument("--no-sandbox")
-        self.browser = webdriver.Chrome(
-            service=ChromeService(ChromeDriverManager().install()), options=self.options
-        )
-        self.browser.get("https://sa.ci.ufpb.br/salas/ci")
-
-    def fechar_browser(self):
-        """Fecha o navegador"""
-        self.browser.quit()
-
-    def extrair_turmas_saci(self):
-        """Extrai dados das turmas do SACI"""
-        self.esperar_elemento("pa-8", 10, "class")
-        sleep(2)
-        elements = self.browser.find_elements(By.CSS_SELECTOR, "tr")
-
-        turmas = []
+    def obter_turmas_saci(self):
+        """
+        Obtém as turmas do SACI. Com o backend 'http' tenta primeiro sem navegador
+        e só usa o Chrome (emprestado do BrowserPool) se a página não trouxer a tabela.
+        """
+        if SACI_SCRAPER_BACKEND == 'http':
+            try:
+                turmas = HttpSaciScraper().scrape(SACI_URL)
+                if turmas:
+                    return turmas
+                print("Tabela não encontrada via HTTP, usando o navegador")
+            except Exception as e:
+                print(f"Erro no scraping via HTTP, usando o navegador: {e}")
 
-        for element in elements:
-            tds = element.find_elements(By.CSS_SELECTOR, "td")
-            if len(tds) == 8:
-                turma = {
-                    "code": tds[0].text,
-                    "turma": tds[1].text,
-                    "nome": tds[2].text,
-                    "hora": tds[3].text,
-                    "alunos": tds[4].text,
-                    "departamento": tds[5].text,
-                    "sala": tds[6].text,
-                    "professor": tds[7].text,
-                }
-                turmas.append(turma)
+        with BrowserPool().borrow() as browser:
+            browser.get(SACI_URL)
+            return self.extrair_turmas_saci(browser)
 
-        # Salva os dados em um arquivo JSON
-        with open("turmas_saci.json", "w", encoding="UTF-8") as arq:
-            json.dump(turmas, arq, indent=4, ensure_ascii=False)
-        
-        return turmas
+    def extrair_turmas_saci(self, browser):
+        """Extrai dados das turmas do SACI da página aberta no navegador"""
+        return extract_turmas(browser, timeout=10)
 
     def criar_grupos_saci(self, turmas):
         """
@@ -82,6 +49,8 @@ class SACIBot:
         """
         created_groups = []
         existing_groups = []
+        groups = []
+        turmas_by_name = {}
         
         for turma in turmas:
             group_name = f"SACI - {turma['code']} - {turma['nome']} (T{turma['turma']})"
@@ -94,85 +63,101 @@ class SACIBot:
             description += f"Sala: {turma['sala']}\n"
             description += f"Departamento: {turma['departamento']}\n"
             description += f"Alunos inscritos: {turma['alunos']}"
-            
-            # Verifica se o grupo já existe
-            existing_group = self.group_dao.get_group_by_name(group_name)
-            
-            if not existing_group:
-                try:
-                    group_id = self.group_dao.create_group(group_name, description)
 
-                    self.message_service.send_group_welcome_message(group_id)
+            groups.append((group_name, description))
+            turmas_by_name.setdefault(group_name, turma)
 
-                    self._adicionar_professor_ao_grupo(group_id, turma['professor'])
-                    
-                    created_groups.append({
-                        "id": group_id,
-                        "name": group_name,
-                        "turma_data": turma
-                    })
-                    print(f"Grupo criado: {group_name}")
-                except Exception as e:
-                    print(f"Erro ao criar grupo {group_name}: {e}")
-            else:
-                existing_groups.append(group_name)
-                print(f"Grupo já existe: {group_name}")
+        # Cria todos os grupos numa única instrução; os que já existem são ignorados
+        try:
+            created, existing = self.group_dao.create_groups(groups)
+        except Exception as e:
+            print(f"Erro ao criar grupos: {e}")
+            return created_groups, existing_groups
+
+        # Resolve todos os professores das turmas novas numa única consulta
+        professores = self._resolver_professores(
+            [turmas_by_name[group['name']]['professor'] for group in created]
+        )
+
+        for group in created:
+            turma = turmas_by_name[group['name']]
+            try:
+                self._adicionar_professor_ao_grupo(group['id'], turma['professor'], professores)
+            except Exception as e:
+                print(f"Erro ao adicionar professor ao grupo {group['name']}: {e}")
+
+            created_groups.append({
+                "id": group['id'],
+                "name": group['name'],
+                "turma_data": turma
+            })
+            print(f"Grupo criado: {group['name']}")
+
+        for group in existing:
+            existing_groups.append(group['name'])
+            print(f"Grupo já existe: {group['name']}")
+
+        # Boas-vindas de todos os grupos novos numa única inserção
+        if created_groups:
+            try:
+                self.message_service.send_group_welcome_messages(created_groups)
+            except Exception as e:
+                print(f"Erro ao enviar mensagens de boas-vindas: {e}")
         
         return created_groups, existing_groups
 
-    def _adicionar_professor_ao_grupo(self, group_id, professor_name):
-        """
-        Tenta adicionar o professor como membro do grupo
-        """
+    def _separar_nome_professor(self, professor_name):
+        """Separa o nome do professor em (primeiro nome, sobrenome), ou None se inválido"""
         if professor_name and professor_name.strip():
             nome_limpo = re.sub(r'\s+', ' ', professor_name.strip())
             partes_nome = nome_limpo.split()
             
             if len(partes_nome) >= 2:
-                first_name = partes_nome[0]
-                last_name = ' '.join(partes_nome[1:])
-                
+                return partes_nome[0], ' '.join(partes_nome[1:])
+        return None
+
+    def _resolver_professores(self, professor_names):
+        """
+        Mapeia os nomes de professores das turmas para os usuários do sistema numa única consulta
+        """
+        nomes = {self._separar_nome_professor(name) for name in professor_names}
+        nomes.discard(None)
+        return self.user_dao.get_professors_by_names(list(nomes))
+
+    def _adicionar_professor_ao_grupo(self, group_id, professor_name, professores=None):
+        """
+        Tenta adicionar o professor como membro do grupo.
+        Se professores (resultado de _resolver_professores) for informado, não consulta o banco.
+        """
+        nome = self._separar_nome_professor(professor_name)
+        if nome:
+            first_name, last_name = nome
+            nome_limpo = f"{first_name} {last_name}"
+
+            if professores is not None:
+                professor = professores.get(nome)
+            else:
                 professor = self._buscar_professor(first_name, last_name)
-                
-                if professor:
-                    try:
-                        self.group_dao.add_member(group_id, professor['id'])
-                        print(f"Professor {nome_limpo} adicionado ao grupo")
 
-                        self.message_service.send_user_added_to_group_message(group_id, professor['id'])
-                    except Exception as e:
-                        print(f"Erro ao adicionar professor ao grupo: {e}")
-                else:
-                    print(f"Professor {nome_limpo} não encontrado no sistema")
+            if professor:
+                try:
+                    self.group_dao.add_member(group_id, professor['id'])
+                    print(f"Professor {nome_limpo} adicionado ao grupo")
+
+                    self.message_service.send_user_added_to_group_message(group_id, professor['id'])
+                except Exception as e:
+                    print(f"Erro ao adicionar professor ao grupo: {e}")
+            else:
+                print(f"Professor {nome_limpo} não encontrado no sistema")
 
     def _buscar_professor(self, first_name, last_name):
         """Busca um professor no sistema pelo nome"""
-        all_users = self.user_dao.get_all_users()
-        
-        for user in all_users:
-            if user['professor'] and \
-               user['first_name'].lower() == first_name.lower() and \
-               user['last_name'].lower() == last_name.lower():
-                return user
-        
-        return None
+        return self.user_dao.get_professor_by_name(first_name, last_name)
 
     def enviar_mensagem_inicial_para_novos_usuarios(self):
         """Envia mensagem de boas-vindas para todos os usuários sem mensagens"""
-        all_users = self.user_dao.get_all_users()
-        
-        for user in all_users:
-            system_group_name = f"Mensagens do Sistema - {user['username']}"
-            system_group = self.group_dao.get_group_by_name(system_group_name)
-            
-            if not system_group:
-                self.message_service.send_welcome_message_to_new_user(user['id'])
-                print(f"Mensagem de boas-vindas enviada para {user['username']}")
-            else:
-                messages = self.message_dao.get_group_messages(system_group['id'], limit=1)
-                if not messages:
-                    self.message_service.send_welcome_message_to_new_user(user['id'])
-                    print(f"Mensagem de boas-vindas enviada para {user['username']}")
+        enviadas = self.message_service.send_welcome_messages_to_new_users()
+        print(f"Mensagens de boas-vindas enviadas: {enviadas}")
 
     def enviar_aviso_integracao(self):
         """Envia aviso sobre a integração SACI para todos os grupos"""
@@ -195,23 +180,23 @@ class SACIBot:
         except Exception as e:
             print(f"Erro ao enviar aviso: {e}")
 
-    def esperar_elemento(self, elemento, tempo, metodo):
-        """Espera o elemento ser encontrado na página"""
+    def esperar_elemento(self, browser, elemento, tempo, metodo):
+        """Espera o elemento ser encontrado na página aberta no navegador"""
         try:
             if metodo == "class":
-                myElem = WebDriverWait(self.browser, tempo).until(
+                myElem = WebDriverWait(browser, tempo).until(
                     EC.presence_of_element_located((By.CLASS_NAME, elemento))
                 )
             elif metodo == "xpath":
-                myElem = WebDriverWait(self.browser, tempo).until(
+                myElem = WebDriverWait(browser, tempo).until(
                     EC.presence_of_element_located((By.XPATH, elemento))
                 )
             elif metodo == "id":
-                myElem = WebDriverWait(self.browser, tempo).until(
+                myElem = WebDriverWait(browser, tempo).until(
                     EC.presence_of_element_located((By.ID, elemento))
                 )
             elif metodo == "css":
-                myElem = WebDriverWait(self.browser, tempo).until(
+                myElem = WebDriverWait(browser, tempo).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, elemento))
                 )
             return myElem
@@ -232,11 +217,8 @@ class SACIBot:
         }
         
         try:
-            print("Acessando SACI...")
-            self.abrir_browser()
-
-            print("Extraindo turmas do SACI...")
-            turmas = self.extrair_turmas_saci()
+            print("Acessando SACI e extraindo turmas...")
+            turmas = self.obter_turmas_saci()
             result["turmas_encontradas"] = len(turmas)
 
             print("Criando grupos no sistema...")
@@ -271,7 +253,6 @@ class SACIBot:
             print(error_msg)
             result["errors"].append(str(e))
         finally:
-            self.fechar_browser()
             print("🏁 Integração finalizada")
             
         return result
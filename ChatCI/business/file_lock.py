@@ -0,0 +1,31 @@
+from contextlib import contextmanager
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+@contextmanager
+def locked_file(path: str, mode: str = 'a'):
+    """
+    Abre o arquivo com um lock exclusivo entre threads e processos (flock no Linux, msvcrt no Windows),
+    para que escritas concorrentes nos relatórios não se sobreponham.
+    """
+    with open(path, mode, encoding='utf-8') as file:
+        if fcntl:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            file.seek(0, os.SEEK_END)
+        try:
+            yield file
+            file.flush()
+        finally:
+            if fcntl:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
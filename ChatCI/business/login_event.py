@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Iterator, List, NamedTuple, Optional
+import html
+import os
+import re
+
+LOGIN_LOG_FILE = 'login_report.txt'
+# O log TXT é renomeado para este arquivo enquanto é importado para a tabela login_events
+LOGIN_LOG_IMPORTING_FILE = LOGIN_LOG_FILE + '.importing'
+# Relatórios HTML antigos (o documento reescrito a cada login e o arquivo de entradas que o substituiu),
+# importados uma única vez para a tabela login_events
+LEGACY_HTML_LOG_FILES = ('login_report.html', 'login_report_entries.html')
+HTML_ENTRY = re.compile(r'<p>(.*?)</p>')
+TIMESTAMP_FORMAT = '%d/%m/%Y %H:%M:%S'
+
+SUCCESS = 'success'
+MAX_LOGIN_LENGTH = 254
+FAILED = 'failed'
+
+class LoginEvent(NamedTuple):
+    """Uma tentativa de login, com o horário capturado no momento do login"""
+    username: str
+    user_id: Optional[int]
+    timestamp: datetime
+    ip: Optional[str] = None
+    outcome: str = SUCCESS
+
+    @classmethod
+    def from_user(cls, user, timestamp: datetime = None, ip: str = None) -> 'LoginEvent':
+        # aceita o usuário como dict (DAO) ou objeto
+        if isinstance(user, dict):
+            username = user.get('username', 'desconhecido')
+            user_id = user.get('id')
+        else:
+            username = getattr(user, 'username', 'desconhecido')
+            user_id = getattr(user, 'id', None)
+        return cls(username, user_id, timestamp or datetime.now(), ip)
+
+    @classmethod
+    def failed(cls, login: str, ip: str = None, user_id: int = None) -> 'LoginEvent':
+        """Tentativa malsucedida; login é o e-mail ou username informado"""
+        # o valor vem do formulário: limita ao tamanho da coluna para não derrubar o lote inteiro
+        return cls((login or '')[:MAX_LOGIN_LENGTH], user_id, datetime.now(), ip, FAILED)
+
+    @classmethod
+    def from_row(cls, row) -> 'LoginEvent':
+        """Converte uma linha de login_events (ver LoginEventPersistence.iter_login_events)"""
+        return cls(row['username'], row['user_id'], row['ts'], row['ip'], row['outcome'])
+
+    def to_row(self) -> tuple:
+        """Tupla (user_id, login, ts, ip, outcome) usada na inserção em lote"""
+        return (self.user_id, self.username, self.timestamp, self.ip, self.outcome)
+
+    def describe(self) -> str:
+        return f"Usuário {self.username} efetuou login em {self.timestamp.strftime(TIMESTAMP_FORMAT)}"
+
+    @classmethod
+    def parse(cls, line: str) -> Optional['LoginEvent']:
+        """Interpreta uma linha do log TXT (formato de describe); retorna None se a linha não for um login"""
+        prefix, separator, timestamp = line.strip().rpartition(" efetuou login em ")
+        if not separator or not prefix.startswith("Usuário "):
+            return None
+        try:
+            return cls(prefix[len("Usuário "):], None, datetime.strptime(timestamp, TIMESTAMP_FORMAT))
+        except ValueError:
+            return None
+
+def to_login_events(data) -> List[LoginEvent]:
+    """Normaliza o que os geradores recebem: um usuário, um LoginEvent ou uma lista de LoginEvents"""
+    if data is None:
+        return []
+    if isinstance(data, LoginEvent):
+        return [data]
+    if isinstance(data, list):
+        return [event if isinstance(event, LoginEvent) else LoginEvent.from_user(event) for event in data]
+    return [LoginEvent.from_user(data)]
+
+def iter_login_log(path: str = LOGIN_LOG_FILE) -> Iterator[LoginEvent]:
+    """Lê os logins do log TXT linha a linha (memória constante)"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            event = LoginEvent.parse(line)
+            if event is not None:
+                yield event
+
+def iter_html_login_log(path: str) -> Iterator[LoginEvent]:
+    """Lê os logins de um relatório HTML antigo (um <p> por login) linha a linha"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            for entry in HTML_ENTRY.findall(line):
+                event = LoginEvent.parse(html.unescape(entry))
+                if event is not None:
+                    yield event
@@ -1,52 +1,38 @@
+import html
 from datetime import datetime
-import os
-from business.report_generator import ReportGenerator
+from typing import Iterator
+from business.login_event import LoginEvent
+from database.persistence.login_event_persistence import LoginEventPersistence
 
-class LoginHtmlReportGenerator(ReportGenerator):
+HTML_HEADER = (
+    "<!DOCTYPE html>\n<html lang='pt-BR'>\n<head>\n"
+    "  <meta charset='UTF-8'>\n"
+    "  <title>Relatório de Login</title>\n"
+    "</head>\n<body>\n"
+)
+HTML_FOOTER = "</body>\n</html>"
+
+class LoginHtmlReportGenerator:
     """
-    Gera apenas o relatório de login em HTML.
+    Gera o relatório de login em HTML.
+    O documento é montado em streaming a partir da tabela login_events, com cabeçalho e rodapé fixos;
+    o histórico dos relatórios HTML antigos é importado para a tabela pelo LoginAuditService.
     """
 
-    def __init__(self):
-        self.data = None
-
-    def collectData(self, user):
-        if isinstance(user, dict):
-            username = user.get('username', 'desconhecido')
-        else:
-            username = getattr(user, 'username', 'desconhecido')
-        self.data = (
-            f"Usuário {username} efetuou login em "
-            f"{datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
-        )
-
-    def formatData(self):
-        # envolve em parágrafo HTML
-        return f"<p>{self.data}</p>\n"
-
-    def saveReport(self):
-        entry = self.formatData()
-        html_file = 'login_report.html'
-
-        if not os.path.exists(html_file):
-            # cria esqueleto HTML
-            with open(html_file, 'w', encoding='utf-8') as hf:
-                hf.write("<!DOCTYPE html>\n<html lang='pt-BR'>\n<head>\n")
-                hf.write("  <meta charset='UTF-8'>\n")
-                hf.write("  <title>Relatório de Login</title>\n")
-                hf.write("</head>\n<body>\n")
-                hf.write(entry)
-                hf.write("</body>\n</html>")
-        else:
-            # injeta antes de </body>
-            with open(html_file, 'r+', encoding='utf-8') as hf:
-                content = hf.read()
-                idx = content.rfind("</body>")
-                if idx != -1:
-                    new_content = content[:idx] + entry + content[idx:]
-                    hf.seek(0)
-                    hf.write(new_content)
-                    hf.truncate()
-                else:
-                    hf.seek(0, os.SEEK_END)
-                    hf.write(entry)
+    def iter_document(self, start: datetime = None, end: datetime = None,
+                      chunk_lines: int = 1000) -> Iterator[str]:
+        """Gera o documento HTML completo em pedaços de chunk_lines logins, lidos por um cursor no servidor"""
+        yield HTML_HEADER
+        rows = LoginEventPersistence().iter_login_events(start=start, end=end)
+        try:
+            chunk = []
+            for row in rows:
+                chunk.append(f"<p>{html.escape(LoginEvent.from_row(row).describe())}</p>\n")
+                if len(chunk) >= chunk_lines:
+                    yield "".join(chunk)
+                    chunk = []
+            if chunk:
+                yield "".join(chunk)
+        finally:
+            rows.close()
+        yield HTML_FOOTER
@@ -1,43 +1,73 @@
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 import os
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from business.report_generator import ReportGenerator
+from business.login_event import LoginEvent, to_login_events
+from database.persistence.login_event_persistence import LoginEventPersistence
 
 class LoginPdfReportGenerator(ReportGenerator):
     """
     Gera relatório de login em PDF usando ReportLab.
+    Sem usuário/lote informado, lê a tabela login_events em streaming, filtrada pelas datas start e end (inclusivas).
     """
 
-    def __init__(self):
-        self.data = None
+    def __init__(self, start: date = None, end: date = None, output='login_report.pdf'):
+        self.start = start
+        self.end = end
+        self.output = output  # caminho ou arquivo binário (ex.: BytesIO)
+        self.events = None
+        self.rows = None
+        self.total = 0
 
-    def collectData(self, user):
-        # Mesma lógica para extrair usuário e timestamp
-        if isinstance(user, dict):
-            username = user.get('username', 'desconhecido')
+    def collectData(self, user=None):
+        if user is None:
+            # cursor no servidor: as linhas só são lidas durante a renderização (índice em ts)
+            self.rows = LoginEventPersistence().iter_login_events(
+                start=datetime.combine(self.start, time.min) if self.start else None,
+                end=datetime.combine(self.end + timedelta(days=1), time.min) if self.end else None
+            )
+            self.events = (LoginEvent.from_row(row) for row in self.rows)
         else:
-            username = getattr(user, 'username', 'desconhecido')
-        timestamp = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
-        self.data = f"Usuário {username} efetuou login em {timestamp}"
+            self.events = to_login_events(user)
 
     def formatData(self):
-        # devolve uma lista de linhas (poderia ser só uma, mas facilita extensão)
-        return [self.data]
+        # uma linha por login, gerada sob demanda
+        return (event.describe() for event in self.events)
+
+    def _title(self):
+        period = ""
+        if self.start or self.end:
+            start = self.start.strftime('%d/%m/%Y') if self.start else "início"
+            end = self.end.strftime('%d/%m/%Y') if self.end else "hoje"
+            period = f" ({start} a {end})"
+        return f"Relatório de Login{period}"
 
     def saveReport(self):
-        lines = self.formatData()
-        pdf_path = 'login_report.pdf'
-        c = canvas.Canvas(pdf_path, pagesize=A4)
+        try:
+            self._render(self.formatData())
+        finally:
+            # se a renderização falhar no meio, fecha o cursor no servidor e devolve a conexão ao pool
+            if self.rows is not None:
+                self.rows.close()
+                self.rows = None
+        if isinstance(self.output, str):
+            print(f"PDF gerado com sucesso em: {os.path.abspath(self.output)}")
+
+    def _render(self, lines):
+        c = canvas.Canvas(self.output, pagesize=A4)
         width, height = A4
 
         y = height - 50  # margem superior
+        c.drawString(50, y, self._title())
+        y -= 30
+        self.total = 0
         for linha in lines:
             if y < 50:    # margem inferior, nova página
                 c.showPage()
                 y = height - 50
             c.drawString(50, y, linha)
             y -= 15      # espaçamento entre linhas
+            self.total += 1
 
         c.save()
-        print(f"PDF gerado com sucesso em: {os.path.abspath(pdf_path)}")
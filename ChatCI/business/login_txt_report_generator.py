@@ -1,6 +1,6 @@
-from datetime import datetime
-import os
 from business.report_generator import ReportGenerator
+from business.login_event import to_login_events, LOGIN_LOG_FILE
+from business.file_lock import locked_file
 
 class LoginTxtReportGenerator(ReportGenerator):
     """
@@ -8,24 +8,17 @@ class LoginTxtReportGenerator(ReportGenerator):
     """
 
     def __init__(self):
-        self.data = None
+        self.data = []
 
     def collectData(self, user):
-        # pega username de objeto ou dict
-        if isinstance(user, dict):
-            username = user.get('username', 'desconhecido')
-        else:
-            username = getattr(user, 'username', 'desconhecido')
-        self.data = (
-            f"Usuário {username} efetuou login em "
-            f"{datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
-        )
+        # um usuário ou um lote de LoginEvents
+        self.data = [event.describe() for event in to_login_events(user)]
 
     def formatData(self):
-        # para TXT basta o texto puro
-        return self.data
+        # para TXT basta o texto puro, uma linha por login
+        return "".join(line + '\n' for line in self.data)
 
     def saveReport(self):
-        # anexa uma linha ao arquivo login_report.txt
-        with open('login_report.txt', 'a', encoding='utf-8') as file:
-            file.write(self.formatData() + '\n')
+        # anexa o lote inteiro ao arquivo login_report.txt numa única escrita
+        with locked_file(LOGIN_LOG_FILE, 'a') as file:
+            file.write(self.formatData())
@@ -1,85 +1,55 @@
 from interface.interfaces import ICommand
-import json
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-import time
 import logging
 from typing import List, Dict
-import os
-import platform
+from bot.browser_pool import BrowserPool
+from bot.saci_http_scraper import HttpSaciScraper
+from bot.saci_selenium_extractor import extract_turmas
+from bot.saci_sync import diff_turmas, changed_fields, turma_data
+from config.settings import SACI_SCRAPER_BACKEND
 
 logger = logging.getLogger(__name__)
 
 class ScrapeCommand(ICommand):
-    def __init__(self, url: str):
+    def __init__(self, url: str, backend: str = SACI_SCRAPER_BACKEND):
         self.url = url
+        self.backend = backend
     
     def execute(self) -> List[Dict]:
-        try:
-            chrome_options = webdriver.ChromeOptions()
-
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-
-            if platform.system() == 'Linux':
-                chrome_options.add_argument('--disable-extensions')
-                chrome_options.add_argument('--disable-software-rasterizer')
-                chrome_options.add_argument('--window-size=1920,1080')
-
+        turmas = []
+        if self.backend == 'http':
             try:
-                service = ChromeService(ChromeDriverManager().install())
-                driver = webdriver.Chrome(service=service, options=chrome_options)
+                turmas = HttpSaciScraper().scrape(self.url)
             except Exception as e:
-                logger.warning(f"Failed to initialize with ChromeDriverManager: {e}")
+                logger.warning(f"HTTP scraping failed: {e}")
+            if not turmas:
+                logger.warning("HTTP scraper found no turmas, falling back to Selenium")
 
-                try:
-                    driver = webdriver.Chrome(options=chrome_options)
-                except Exception as e2:
-                    logger.error(f"Failed to initialize Chrome driver: {e2}")
-                    raise Exception("Could not initialize Chrome driver. Please ensure Chrome is installed.")
+        if not turmas:
+            turmas = self._scrape_with_selenium()
 
-            driver.get(self.url)
-
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "pa-8"))
-            )
-            time.sleep(2)
-
-            rows = driver.find_elements(By.CSS_SELECTOR, "tr")
-            turmas = []
-            
-            for row in rows:
-                cells = row.find_elements(By.CSS_SELECTOR, "td")
-                if len(cells) == 8:
-                    turma = {
-                        "code": cells[0].text,
-                        "turma": cells[1].text,
-                        "nome": cells[2].text,
-                        "hora": cells[3].text,
-                        "alunos": cells[4].text,
-                        "departamento": cells[5].text,
-                        "sala": cells[6].text,
-                        "professor": cells[7].text,
-                    }
-                    turmas.append(turma)
-
-            with open("turmas_saci.json", "w", encoding="UTF-8") as f:
-                json.dump(turmas, f, indent=4, ensure_ascii=False)
-            
-            return turmas
-            
+        return turmas
+    
+    def _scrape_with_selenium(self) -> List[Dict]:
+        try:
+            with BrowserPool().borrow() as driver:
+                driver.get(self.url)
+                return extract_turmas(driver, timeout=10)
         except Exception as e:
             logger.error(f"Scraping failed: {e}")
             raise
-        finally:
-            if 'driver' in locals():
-                driver.quit()
+
+def build_group_name(turma_data: Dict) -> str:
+    return f"SACI - {turma_data['code']} - {turma_data['nome']} (T{turma_data['turma']})"
+
+def build_group_description(turma_data: Dict) -> str:
+    return f"""Turma do SACI - {turma_data['nome']}
+                Código: {turma_data['code']}
+                Turma: {turma_data['turma']}
+                Professor: {turma_data['professor']}
+                Horário: {turma_data['hora']}
+                Sala: {turma_data['sala']}
+                Departamento: {turma_data['departamento']}
+                Alunos inscritos: {turma_data['alunos']}"""
 
 class CreateGroupCommand(ICommand):
     def __init__(self, group_dao, turma_data: Dict):
@@ -87,30 +57,130 @@ class CreateGroupCommand(ICommand):
         self.turma_data = turma_data
     
     def execute(self) -> Dict:
-        group_name = f"SACI - {self.turma_data['code']} - {self.turma_data['nome']} (T{self.turma_data['turma']})"
-        
-        description = f"""Turma do SACI - {self.turma_data['nome']}
-                Código: {self.turma_data['code']}
-                Turma: {self.turma_data['turma']}
-                Professor: {self.turma_data['professor']}
-                Horário: {self.turma_data['hora']}
-                Sala: {self.turma_data['sala']}
-                Departamento: {self.turma_data['departamento']}
-                Alunos inscritos: {self.turma_data['alunos']}"""
-
-        existing = self.group_dao.get_group_by_name(group_name)
+        group_name = build_group_name(self.turma_data)
+        description = build_group_description(self.turma_data)
+
+        created, existing = self.group_dao.create_groups([(group_name, description)])
         if existing:
-            return {"status": "exists", "group": existing}
+            return {"status": "exists", "group": existing[0]}
+
+        return {"status": "created", "group_id": created[0]['id'], "name": group_name}
+
+class CreateGroupsCommand(ICommand):
+    """Cria os grupos de todas as turmas numa única instrução (upsert por nome)"""
+    def __init__(self, group_dao, turmas: List[Dict]):
+        self.group_dao = group_dao
+        self.turmas = turmas
+    
+    def execute(self) -> Dict:
+        turmas_by_name = {}
+        groups = []
+        for turma in self.turmas:
+            group_name = build_group_name(turma)
+            turmas_by_name.setdefault(group_name, turma)
+            groups.append((group_name, build_group_description(turma)))
 
-        group_id = self.group_dao.create_group(group_name, description)
-        return {"status": "created", "group_id": group_id, "name": group_name}
+        created, existing = self.group_dao.create_groups(groups)
+        for group in created + existing:
+            group['turma'] = turmas_by_name[group['name']]
+        return {"created": created, "existing": existing}
+
+class SyncGroupsCommand(ICommand):
+    """
+    Sincroniza os grupos com as turmas do SACI comparando com os próprios grupos do banco
+    (chave code/turma e campos guardados em groups.saci_data), não com um arquivo local.
+    Só turmas novas, alteradas ou removidas geram escrita no banco. Deve rodar sob o
+    advisory lock da sincronização (SaciSyncRunner), para que réplicas não concorram.
+    """
+    def __init__(self, group_dao, turmas: List[Dict]):
+        self.group_dao = group_dao
+        self.turmas = turmas
+    
+    def execute(self) -> Dict:
+        if not self.turmas:
+            # Scraping vazio é tratado como falha de leitura, não como "todas as turmas foram removidas"
+            logger.warning("No turmas to sync, keeping groups untouched")
+            return {"created": [], "existing": [], "updated": [], "closed": 0, "unchanged": 0, "changes": []}
+
+        diff = diff_turmas(self.group_dao.get_saci_groups(), self.turmas, build_group_name)
+
+        # Turmas alteradas (ou reabertas) são atualizadas pelo ID do grupo
+        updated = self.group_dao.update_groups([
+            (group['id'], build_group_name(turma), build_group_description(turma), turma_data(turma))
+            for group, turma in diff.changed
+        ])
+
+        # Turmas novas são criadas; um grupo com o mesmo nome que ainda não tinha a chave do SACI é adotado
+        result = CreateGroupsCommand(self.group_dao, diff.added).execute()
+        created_ids = {group['id'] for group in result["created"]}
+        linked = self.group_dao.update_groups([
+            (group['id'], group['name'], build_group_description(group['turma']), turma_data(group['turma']))
+            for group in result["created"] + result["existing"]
+        ])
+        updated += [group for group in linked if group['id'] not in created_ids]
+
+        closed_count = self.group_dao.close_groups([group['id'] for group in diff.removed])
+
+        conflicts = {group['id'] for group in updated if group['name_conflict']}
+        if conflicts:
+            logger.warning(f"{len(conflicts)} groups kept their name because the new name is already in use")
+
+        changes = [
+            {"code": turma['code'], "turma": turma['turma'], "status": "added"}
+            for turma in diff.added
+        ] + [
+            {
+                "code": turma['code'],
+                "turma": turma['turma'],
+                "status": "reopened" if group['closed_at'] is not None else "changed",
+                "fields": changed_fields(group['saci_data'], turma) if group['saci_data'] else [],
+                "name_conflict": group['id'] in conflicts
+            }
+            for group, turma in diff.changed
+        ] + [
+            {"code": group['saci_code'], "turma": group['saci_turma'], "status": "removed"}
+            for group in diff.removed
+        ]
+
+        return {
+            "created": result["created"],
+            "existing": result["existing"],
+            "updated": updated,
+            "closed": closed_count,
+            "unchanged": diff.unchanged,
+            "changes": changes
+        }
 
 class SendMessageCommand(ICommand):
-    def __init__(self, message_dao, group_id: int, user_id: int, text: str):
+    def __init__(self, message_dao, group_id: int, user_id: int, text: str, notifier=None):
         self.message_dao = message_dao
         self.group_id = group_id
         self.user_id = user_id
         self.text = text
+        self.notifier = notifier
     
     def execute(self) -> int:
-        return self.message_dao.create_message(self.group_id, self.user_id, self.text)
\ No newline at end of file
+        message_id = self.message_dao.create_message(
+            self.group_id, self.user_id, self.text,
+            notify_channel=self.notifier.transaction_channel if self.notifier else None
+        )
+        if message_id and self.notifier:
+            self.notifier.message_created(self.group_id, message_id)
+        return message_id
+
+class SendMessagesCommand(ICommand):
+    def __init__(self, message_dao, messages: List[Dict], notifier=None):
+        self.message_dao = message_dao
+        self.messages = messages
+        self.notifier = notifier
+    
+    def execute(self) -> List[int]:
+        rows = [(m['group_id'], m['user_id'], m['text']) for m in self.messages]
+        message_ids = self.message_dao.create_messages(
+            rows, notify_channel=self.notifier.transaction_channel if self.notifier else None
+        )
+        if message_ids and self.notifier:
+            self.notifier.messages_created(
+                [(m['group_id'], message_id) for m, message_id in zip(self.messages, message_ids)]
+            )
+        return message_ids
\ No newline at end of file
@@ -11,4 +11,58 @@ DB_CONFIG = {
     'password': os.getenv('POSTGRES_PASSWORD', 'postgres'),
 }
 
-MAX_CONNECTIONS = int(os.getenv('MAX_CONNECTIONS', '10'))
\ No newline at end of file
+MAX_CONNECTIONS = int(os.getenv('MAX_CONNECTIONS', '10'))
+# Pool de conexões: espera por conexão livre, validação de ociosas e reciclagem por idade
+MIN_CONNECTIONS = int(os.getenv('MIN_CONNECTIONS', '1'))
+DB_POOL_ACQUIRE_TIMEOUT = float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '5'))
+DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', '1800'))
+DB_POOL_PRE_PING_AFTER = float(os.getenv('DB_POOL_PRE_PING_AFTER', '30'))
+# Linhas buscadas por vez nas respostas em streaming (cursor no servidor)
+STREAM_FETCH_SIZE = int(os.getenv('STREAM_FETCH_SIZE', '500'))
+# Prepared statements (PREPARE/EXECUTE por conexão) para as consultas mais frequentes
+PREPARED_STATEMENTS_ENABLED = os.getenv('PREPARED_STATEMENTS_ENABLED', 'true').lower() == 'true'
+
+# Entrega de mensagens em tempo real: 'postgres' usa LISTEN/NOTIFY, 'memory' publica direto no processo
+MESSAGE_PUSH_BACKEND = os.getenv('MESSAGE_PUSH_BACKEND', 'postgres')
+MESSAGE_NOTIFY_CHANNEL = os.getenv('MESSAGE_NOTIFY_CHANNEL', 'chatci_messages')
+SSE_HEARTBEAT_SECONDS = int(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+
+# Cache de membros/banidos por grupo (autorização no caminho quente)
+MEMBERSHIP_CACHE_TTL_SECONDS = float(os.getenv('MEMBERSHIP_CACHE_TTL_SECONDS', '30'))
+MEMBERSHIP_CACHE_MAX_GROUPS = int(os.getenv('MEMBERSHIP_CACHE_MAX_GROUPS', '1000'))
+
+# Jobs em segundo plano (integração SACI)
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+JOB_HISTORY_SIZE = int(os.getenv('JOB_HISTORY_SIZE', '50'))
+
+# Scraping do SACI: 'http' (requisição + BeautifulSoup, com fallback para o Selenium) ou 'selenium'
+SACI_URL = os.getenv('SACI_URL', 'https://sa.ci.ufpb.br/salas/ci')
+SACI_SCRAPER_BACKEND = os.getenv('SACI_SCRAPER_BACKEND', 'http')
+SACI_HTTP_TIMEOUT = float(os.getenv('SACI_HTTP_TIMEOUT', '10'))
+
+# Pool de navegadores headless do scraper
+CHROME_BIN = os.getenv('CHROME_BIN')
+CHROMEDRIVER_PATH = os.getenv('CHROMEDRIVER_PATH')
+BROWSER_POOL_MAX_SIZE = int(os.getenv('BROWSER_POOL_MAX_SIZE', '1'))
+BROWSER_POOL_IDLE_TIMEOUT = float(os.getenv('BROWSER_POOL_IDLE_TIMEOUT', '300'))
+BROWSER_POOL_MAX_USES = int(os.getenv('BROWSER_POOL_MAX_USES', '20'))
+BROWSER_POOL_ACQUIRE_TIMEOUT = float(os.getenv('BROWSER_POOL_ACQUIRE_TIMEOUT', '60'))
+
+# Sincronização periódica com o SACI (0 desativa o agendador dentro da aplicação)
+SACI_SYNC_INTERVAL_SECONDS = float(os.getenv('SACI_SYNC_INTERVAL_SECONDS', '0'))
+SACI_SYNC_RETRY_SECONDS = float(os.getenv('SACI_SYNC_RETRY_SECONDS', '60'))
+SACI_SYNC_MAX_BACKOFF_SECONDS = float(os.getenv('SACI_SYNC_MAX_BACKOFF_SECONDS', '3600'))
+SACI_SYNC_LOCK_KEY = int(os.getenv('SACI_SYNC_LOCK_KEY', '728841'))
+
+# Auditoria de logins: fila em memória consumida por um escritor em segundo plano
+LOGIN_AUDIT_QUEUE_SIZE = int(os.getenv('LOGIN_AUDIT_QUEUE_SIZE', '10000'))
+LOGIN_AUDIT_BATCH_SIZE = int(os.getenv('LOGIN_AUDIT_BATCH_SIZE', '200'))
+LOGIN_AUDIT_FLUSH_SECONDS = float(os.getenv('LOGIN_AUDIT_FLUSH_SECONDS', '1'))
+# Importação dos logs de login em arquivo para a tabela: uma réplica por vez
+LOGIN_IMPORT_LOCK_KEY = int(os.getenv('LOGIN_IMPORT_LOCK_KEY', '728842'))
+
+# Hashing de senhas (PBKDF2) num pool próprio: workers simultâneos, hashes em espera e tempo máximo
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 2)))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', '32'))
+PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', '10'))
+PASSWORD_HASH_RETRY_AFTER_SECONDS = int(os.getenv('PASSWORD_HASH_RETRY_AFTER_SECONDS', '2'))
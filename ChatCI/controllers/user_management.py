@@ -4,10 +4,8 @@ from controllers.user_validation import UserValidation
 from controllers.user_validators import IValidator, NameValidator, UsernameRegistrationValidator, LoginValidator
 from controllers.login_exception import  LoginException
 import logging
-import hashlib
-from business.login_txt_report_generator import LoginTxtReportGenerator
-from business.login_html_report_generator import LoginHtmlReportGenerator
-from business.login_pdf_report_generator import LoginPdfReportGenerator
+from services.login_audit import LoginAuditService
+from services.password_hasher import PasswordHasherBusyError
 
 
 logger = logging.getLogger('gerenciador_usuarios')
@@ -19,25 +17,20 @@ class UserManagement:
     def __init__(self):
         self.userDAO = UserDAOFactory.get_instance()
         self.profile_dao = ProfilePersistence()
+        self.login_audit = LoginAuditService()
         self.validator = None
     
-    def validar_login(self, email_ou_username, senha):
+    def validar_login(self, email_ou_username, senha, ip=None):
         validator = LoginValidator(self.userDAO) 
         try:
             usuario = validator.validate(email_ou_username, senha)
             logger.info(f'Login bem sucedido para o usuário {email_ou_username}')
-            # → Gera o relatório de login:
-            txt_gen = LoginTxtReportGenerator()
-            txt_gen.generateReport(usuario)
-
-            html_gen = LoginHtmlReportGenerator()
-            html_gen.generateReport(usuario)
-
-            pdf_gen = LoginPdfReportGenerator()
-            pdf_gen.generateReport(usuario)
+            # → Registra o login no histórico (gravado em segundo plano, em lote)
+            self.login_audit.record_login(usuario, ip)
             return usuario
         except LoginException as e:
             logger.error(f'Erro de login ou senha: {e}')
+            self.login_audit.record_failed_login(email_ou_username, ip)
             return None
     
     def adicionar_usuario(self, user):
@@ -71,6 +64,9 @@ class UserManagement:
             logger.info(f"Usuário {user.username} ({user.email}) criado com sucesso!")
             return user_id
             
+        except PasswordHasherBusyError:
+            # sobrecarga: a API responde 429 em vez de "erro ao cadastrar"
+            raise
         except Exception as e:
             logger.error(f"Erro ao adicionar usuário: {e}")
             return None
@@ -88,6 +84,8 @@ class UserManagement:
         """
         try:
             return self.userDAO.update_user(user_id, **dados)
+        except PasswordHasherBusyError:
+            raise
         except Exception as e:
             logger.error(f"Erro ao atualizar usuário: {e}")
             return False
@@ -2,7 +2,7 @@ from controllers.login_exception import LoginException
 from database.dao.user_dao import UserDAO
 import re
 import logging
-import hashlib
+from services.password_hasher import PasswordHasher
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger('gerenciador_usuarios')
@@ -36,24 +36,10 @@ class LoginValidator:
         return user
     
     def passwordValidator(self, password, dbPassword):
-        partes = dbPassword.split('$')
-        if len(partes) != 4:
-            return False
-            
-        algoritmo, iteracoes, salt, hash_armazenado = partes
-        iteracoes = int(iteracoes)
-        
         # verifica se a senha armazenada é igual ao hash da senha informada
-        # usando o mesmo algoritmo, salt e numero de iterações
-        # o hash é gerado com o mesmo algoritmo, salt e numero de iterações
-        hash_calculado = hashlib.pbkdf2_hmac(
-            'sha256',
-            password.encode('utf-8'),
-            salt.encode('utf-8'),
-            iteracoes
-        ).hex()
-        
-        return hash_calculado == hash_armazenado
+        # usando o mesmo algoritmo, salt e numero de iterações;
+        # o PBKDF2 roda no executor limitado (PasswordHasherBusyError se estiver cheio)
+        return PasswordHasher().verify_password(password, dbPassword)
 
 class NameValidator(IValidator):
     def validate(self, user):
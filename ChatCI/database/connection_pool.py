@@ -0,0 +1,207 @@
+from collections import deque
+from typing import Callable, Dict, Any
+from psycopg2 import pool
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+import bisect
+import threading
+import time
+import logging
+
+logger = logging.getLogger('connection_pool')
+
+# Limites (em ms) dos buckets do histograma de espera por conexão
+WAIT_BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000]
+
+class PoolTimeoutError(pool.PoolError):
+    """Nenhuma conexão ficou livre dentro do tempo de espera"""
+
+class PooledConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+class ConnectionPool:
+    """
+    Pool de conexões thread-safe com fila de espera.
+    Quando todas as conexões estão em uso, acquire espera até timeout em vez de falhar na hora.
+    Conexões ociosas há mais de pre_ping_after segundos são validadas com SELECT 1 antes de
+    serem entregues (ex.: após um restart do Postgres) e conexões mais velhas que max_lifetime
+    são recicladas.
+    """
+    def __init__(self, connect: Callable[[], Any], min_size: int, max_size: int,
+                 acquire_timeout: float, max_lifetime: float, pre_ping_after: float):
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_lifetime = max_lifetime
+        self.pre_ping_after = pre_ping_after
+        self._idle = deque()
+        self._in_use: Dict[int, PooledConnection] = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self._acquired_total = 0
+        self._exhausted_total = 0
+        self._timeouts_total = 0
+        self._recycled_total = 0
+        self._ping_failures_total = 0
+        self._wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_total_ms = 0.0
+
+        for _ in range(min_size):
+            self._idle.append(PooledConnection(self.connect()))
+            self._size += 1
+
+    def getconn(self, timeout: float = None):
+        """Retorna uma conexão válida, esperando na fila até timeout segundos se o pool estiver cheio"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        with self._condition:
+            if not self._idle and self._size >= self.max_size:
+                self._exhausted_total += 1
+
+        while True:
+            entry = self._reserve(deadline, timeout)
+            if entry is None:
+                break
+            # A validação (que pode ir ao banco) acontece fora do lock
+            problem = self._check(entry)
+            with self._condition:
+                if problem is None:
+                    return self._checkout(entry, start)
+                if problem == 'expired':
+                    self._recycled_total += 1
+                elif problem == 'ping':
+                    self._ping_failures_total += 1
+                self._discard(entry)
+                self._condition.notify()
+
+        try:
+            entry = PooledConnection(self.connect())
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            return self._checkout(entry, start)
+
+    def _reserve(self, deadline: float, timeout: float):
+        """
+        Retira uma conexão ociosa (retorna a entrada) ou reserva vaga para uma nova (retorna None),
+        esperando na fila enquanto o pool estiver cheio
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise pool.PoolError("Pool de conexões fechado")
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts_total += 1
+                    raise PoolTimeoutError(
+                        f"Nenhuma conexão livre após {timeout:.1f}s ({self.max_size} em uso)"
+                    )
+                self._waiting += 1
+                try:
+                    self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+    def putconn(self, connection):
+        """Devolve a conexão; conexões quebradas ou velhas demais são fechadas em vez de reaproveitadas"""
+        # O rollback vai ao banco: é feito antes de pegar o lock, para não travar getconn/stats das outras threads
+        if not connection.closed and connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+
+        with self._condition:
+            entry = self._in_use.pop(id(connection), None)
+            if entry is None:
+                logger.warning("Conexão devolvida não pertence ao pool")
+                return
+
+            entry.last_used = time.monotonic()
+            if self._closed or connection.closed or self._expired(entry):
+                self._discard(entry)
+            else:
+                self._idle.append(entry)
+            self._condition.notify()
+
+    def closeall(self):
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            acquired = self._acquired_total
+            buckets = {f"le_{limit}ms": count for limit, count in zip(WAIT_BUCKETS_MS, self._wait_buckets)}
+            buckets["gt_5000ms"] = self._wait_buckets[-1]
+            return {
+                "size": self._size,
+                "max_size": self.max_size,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "acquired_total": acquired,
+                "exhausted_total": self._exhausted_total,
+                "timeouts_total": self._timeouts_total,
+                "recycled_total": self._recycled_total,
+                "ping_failures_total": self._ping_failures_total,
+                "wait_avg_ms": round(self._wait_total_ms / acquired, 3) if acquired else 0.0,
+                "wait_histogram": buckets
+            }
+
+    def _checkout(self, entry: PooledConnection, start: float):
+        """Registra a conexão como em uso; chamar com o lock adquirido"""
+        waited_ms = (time.monotonic() - start) * 1000
+        self._acquired_total += 1
+        self._wait_total_ms += waited_ms
+        self._wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, waited_ms)] += 1
+        self._in_use[id(entry.connection)] = entry
+        return entry.connection
+
+    def _expired(self, entry: PooledConnection) -> bool:
+        return self.max_lifetime > 0 and time.monotonic() - entry.created_at > self.max_lifetime
+
+    def _check(self, entry: PooledConnection):
+        """Retorna None se a conexão pode ser usada, ou o motivo para descartá-la"""
+        if entry.connection.closed:
+            return 'closed'
+        if self._expired(entry):
+            return 'expired'
+        if time.monotonic() - entry.last_used < self.pre_ping_after:
+            return None
+        try:
+            with entry.connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            entry.connection.rollback()
+            return None
+        except Exception as e:
+            logger.warning(f"Conexão ociosa inválida descartada: {e}")
+            return 'ping'
+
+    def _discard(self, entry: PooledConnection):
+        """Fecha a conexão e libera a vaga; chamar com o lock adquirido"""
+        self._size -= 1
+        try:
+            entry.connection.close()
+        except Exception:
+            pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import date
 
 class EventDAO(ABC):
@@ -19,6 +19,10 @@ class EventDAO(ABC):
     def get_all_events(self) -> List[Dict[str, Any]]:
         pass
     
+    @abstractmethod
+    def iter_all_events(self) -> Iterator[Dict[str, Any]]:
+        pass
+    
     @abstractmethod
     def get_upcoming_events(self, limit: int = None) -> List[Dict[str, Any]]:
         pass
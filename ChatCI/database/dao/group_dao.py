@@ -1,11 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 
 class GroupDAO(ABC):
     @abstractmethod
     def create_group(self, name: str, description: str = "") -> int:
         pass
     
+    @abstractmethod
+    def create_groups(self, groups: List[Tuple[str, str]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        pass
+    
+    @abstractmethod
+    def get_saci_groups(self) -> List[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def update_groups(self, groups: List[Tuple[int, str, str, Dict[str, str]]]) -> List[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def close_groups(self, group_ids: List[int]) -> int:
+        pass
+    
     @abstractmethod
     def get_group_by_id(self, group_id: int) -> Optional[Dict[str, Any]]:
         pass
@@ -18,10 +34,18 @@ class GroupDAO(ABC):
     def get_all_groups(self) -> List[Dict[str, Any]]:
         pass
     
+    @abstractmethod
+    def iter_all_groups(self) -> Iterator[Dict[str, Any]]:
+        pass
+    
     @abstractmethod
     def add_member(self, group_id: int, user_id: int) -> bool:
         pass
     
+    @abstractmethod
+    def add_members(self, memberships: List[Tuple[int, int]]) -> int:
+        pass
+    
     @abstractmethod
     def remove_member(self, group_id: int, user_id: int) -> bool:
         pass
@@ -34,6 +58,14 @@ class GroupDAO(ABC):
     def is_banned(self, group_id: int, user_id: int) -> bool:
         pass
     
+    @abstractmethod
+    def is_closed(self, group_id: int) -> bool:
+        pass
+    
+    @abstractmethod
+    def get_group_authorization(self, group_id: int, user_id: int) -> Dict[str, bool]:
+        pass
+    
     @abstractmethod
     def get_user_groups(self, user_id: int) -> List[Dict[str, Any]]:
         pass
@@ -47,9 +79,17 @@ class GroupDAO(ABC):
         pass
     
     @abstractmethod
-    def get_group_members(self, group_id: int) -> List[Dict[str, Any]]:
+    def get_group_members(self, group_id: int, compact: bool = False) -> List[Dict[str, Any]]:
         pass
     
     @abstractmethod
-    def get_banned_members(self, group_id: int) -> List[Dict[str, Any]]:
-        pass
\ No newline at end of file
+    def get_banned_members(self, group_id: int, compact: bool = False) -> List[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def iter_group_members(self, group_id: int, compact: bool = False) -> Iterator[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def iter_banned_members(self, group_id: int, compact: bool = False) -> Iterator[Dict[str, Any]]:
+        pass
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Iterator, Tuple, Optional
+from datetime import datetime
+
+class LoginEventDAO(ABC):
+    @abstractmethod
+    def record_events(self, events: List[Tuple[Optional[int], str, datetime, Optional[str], str]]) -> int:
+        pass
+    
+    @abstractmethod
+    def import_login_history(self, events: List[Tuple[str, datetime]]) -> int:
+        pass
+    
+    @abstractmethod
+    def get_logins_per_day(self, since: datetime) -> List[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def get_last_logins(self, limit: int = 50) -> List[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def get_failed_attempts(self, since: datetime, limit: int = 100) -> List[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def iter_login_events(self, start: datetime = None, end: datetime = None,
+                          outcome: str = 'success') -> Iterator[Dict[str, Any]]:
+        pass
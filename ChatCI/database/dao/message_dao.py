@@ -1,11 +1,43 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
 
 class MessageDAO(ABC):
     @abstractmethod
-    def create_message(self, group_id: int, user_id: int, text: str, file: str = None) -> int:
+    def create_message(self, group_id: int, user_id: int, text: str, file: str = None,
+                       notify_channel: str = None) -> int:
+        pass
+    
+    @abstractmethod
+    def create_messages(self, messages: List[Tuple[int, int, str]], notify_channel: str = None) -> List[int]:
+        pass
+    
+    @abstractmethod
+    def create_message_in_all_groups(self, user_id: int, text: str,
+                                     notify_channel: str = None) -> List[Tuple[int, int]]:
+        pass
+    
+    @abstractmethod
+    def get_message_by_id(self, message_id: int) -> Optional[Dict[str, Any]]:
         pass
     
     @abstractmethod
     def get_group_messages(self, group_id: int, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def get_group_messages_after(self, group_id: int, after_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def get_group_messages_before(self, group_id: int, before_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def get_latest_message_id(self, group_id: int) -> Optional[int]:
+        pass
+    
+    @abstractmethod
+    def get_group_messages_page(self, group_id: int, cursor: Optional[Tuple[datetime, int]] = None,
+                                limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, int]]]:
+        pass
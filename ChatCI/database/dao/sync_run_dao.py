@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+
+class SyncRunDAO(ABC):
+    @abstractmethod
+    def record_run(self, trigger: str, status: str, started_at: datetime, duration_ms: int,
+                   result: Optional[Dict[str, Any]] = None, error: str = None) -> int:
+        pass
+    
+    @abstractmethod
+    def get_last_run(self, status: str = None) -> Optional[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def get_recent_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 class UserDAO(ABC):
     @abstractmethod
@@ -18,6 +18,18 @@ class UserDAO(ABC):
     def get_all_users(self) -> List[Dict[str, Any]]:
         pass
 
+    @abstractmethod
+    def get_professor_by_name(self, first_name: str, last_name: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def get_professors_by_names(self, names: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def get_users_without_system_messages(self, system_group_prefix: str) -> List[Dict[str, Any]]:
+        pass
+
     @abstractmethod
     def create_user(self, username: str, email: str, password: str, first_name: str, 
                     last_name: str, student: bool = True, professor: bool = False, 
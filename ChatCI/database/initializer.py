@@ -57,11 +57,15 @@ class DatabaseInitializer:
             connection = self.db_manager.get_connection()
             cursor = connection.cursor()
             cursor.execute(
-                "SELECT COUNT(*) FROM schema_migrations WHERE migration_name = %s AND status = 'success'",
+                """
+                SELECT EXISTS (
+                    SELECT 1 FROM schema_migrations
+                    WHERE migration_name = %s AND status = 'success'
+                )
+                """,
                 (migration_name,)
             )
-            count = cursor.fetchone()[0]
-            return count > 0
+            return cursor.fetchone()[0]
         except Exception as e:
             logger.error(f"Erro ao verificar migração: {e}")
             return False
@@ -289,6 +293,178 @@ class DatabaseInitializer:
                     )
                         """
                 ]
+            },
+            {
+                "name": "010_create_messages_group_id_index",
+                "queries": [
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_messages_group_id_id
+                    ON messages (group_id, id)
+                    """
+                ]
+            },
+            {
+                "name": "011_create_messages_group_created_at_index",
+                "queries": [
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_messages_group_created_at_id
+                    ON messages (group_id, created_at DESC, id DESC)
+                    """
+                ]
+            },
+            {
+                "name": "012_create_groups_name_unique_index",
+                "queries": [
+                    # Grupos com nome repetido são fundidos no de menor ID antes de criar o índice:
+                    # membros, banidos e mensagens passam para ele e as cópias são removidas
+                    """
+                    CREATE TEMP TABLE duplicate_groups ON COMMIT DROP AS
+                    SELECT g.id AS duplicate_id, k.keeper_id
+                    FROM groups g
+                    JOIN (
+                        SELECT name, MIN(id) AS keeper_id
+                        FROM groups
+                        GROUP BY name
+                        HAVING COUNT(*) > 1
+                    ) k ON k.name = g.name
+                    WHERE g.id <> k.keeper_id
+                    """,
+                    """
+                    INSERT INTO groups_members (group_id, user_id)
+                    SELECT d.keeper_id, m.user_id
+                    FROM groups_members m
+                    JOIN duplicate_groups d ON d.duplicate_id = m.group_id
+                    ON CONFLICT (group_id, user_id) DO NOTHING
+                    """,
+                    """
+                    INSERT INTO groups_banned_members (group_id, user_id)
+                    SELECT d.keeper_id, b.user_id
+                    FROM groups_banned_members b
+                    JOIN duplicate_groups d ON d.duplicate_id = b.group_id
+                    ON CONFLICT (group_id, user_id) DO NOTHING
+                    """,
+                    """
+                    UPDATE messages m
+                    SET group_id = d.keeper_id
+                    FROM duplicate_groups d
+                    WHERE m.group_id = d.duplicate_id
+                    """,
+                    """
+                    DELETE FROM groups
+                    WHERE id IN (SELECT duplicate_id FROM duplicate_groups)
+                    """,
+                    """
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_groups_name_unique
+                    ON groups (name)
+                    """
+                ]
+            },
+            {
+                "name": "013_create_users_professor_name_index",
+                "queries": [
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_users_professor_lower_name
+                    ON users (lower(first_name), lower(last_name))
+                    WHERE professor
+                    """
+                ]
+            },
+            {
+                "name": "014_add_groups_closed_at",
+                "queries": [
+                    """
+                    ALTER TABLE groups
+                    ADD COLUMN IF NOT EXISTS closed_at TIMESTAMP WITH TIME ZONE NULL
+                    """
+                ]
+            },
+            {
+                "name": "015_create_saci_sync_runs_table",
+                "queries": [
+                    """
+                    CREATE TABLE IF NOT EXISTS saci_sync_runs (
+                        id SERIAL PRIMARY KEY,
+                        trigger VARCHAR(20) NOT NULL,
+                        status VARCHAR(20) NOT NULL,
+                        started_at TIMESTAMP WITH TIME ZONE NOT NULL,
+                        duration_ms INTEGER NOT NULL,
+                        turmas_found INTEGER NOT NULL DEFAULT 0,
+                        groups_created INTEGER NOT NULL DEFAULT 0,
+                        groups_updated INTEGER NOT NULL DEFAULT 0,
+                        groups_closed INTEGER NOT NULL DEFAULT 0,
+                        errors INTEGER NOT NULL DEFAULT 0,
+                        error_message TEXT NULL
+                    )
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_saci_sync_runs_started_at
+                    ON saci_sync_runs (started_at DESC)
+                    """
+                ]
+            },
+            {
+                "name": "016_create_login_events_table",
+                "queries": [
+                    """
+                    CREATE TABLE IF NOT EXISTS login_events (
+                        id BIGSERIAL PRIMARY KEY,
+                        user_id INTEGER NULL REFERENCES users(id) ON DELETE SET NULL,
+                        login VARCHAR(254) NOT NULL,
+                        ts TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                        ip VARCHAR(45) NULL,
+                        outcome VARCHAR(20) NOT NULL
+                    )
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_login_events_user_ts
+                    ON login_events (user_id, ts DESC)
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_login_events_ts
+                    ON login_events (ts)
+                    """
+                ]
+            },
+            {
+                "name": "017_add_groups_saci_key",
+                "queries": [
+                    # A sincronização com o SACI compara as turmas com os grupos pela chave (código, turma)
+                    """
+                    ALTER TABLE groups
+                    ADD COLUMN IF NOT EXISTS saci_code VARCHAR(50) NULL,
+                    ADD COLUMN IF NOT EXISTS saci_turma VARCHAR(50) NULL,
+                    ADD COLUMN IF NOT EXISTS saci_data JSONB NULL
+                    """,
+                    # Grupos já criados pela integração: chave extraída do nome "SACI - código - nome (Tturma)"
+                    """
+                    UPDATE groups
+                    SET saci_code = substring(name from '^SACI - (\\S+) - '),
+                        saci_turma = substring(name from '\\(T([^)]*)\\)$')
+                    WHERE saci_code IS NULL AND name LIKE 'SACI - %'
+                    """,
+                    # Chave incompleta ou repetida: mantém só um grupo por turma (o aberto de menor ID)
+                    """
+                    UPDATE groups
+                    SET saci_code = NULL, saci_turma = NULL
+                    WHERE (saci_code IS NOT NULL AND saci_turma IS NULL)
+                       OR id IN (
+                           SELECT id FROM (
+                               SELECT id, ROW_NUMBER() OVER (
+                                   PARTITION BY saci_code, saci_turma
+                                   ORDER BY closed_at IS NOT NULL, id
+                               ) AS position
+                               FROM groups
+                               WHERE saci_code IS NOT NULL
+                           ) ranked
+                           WHERE position > 1
+                       )
+                    """,
+                    """
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_groups_saci_key
+                    ON groups (saci_code, saci_turma)
+                    WHERE saci_code IS NOT NULL
+                    """
+                ]
             }
         ]    
         success = True
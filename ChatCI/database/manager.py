@@ -1,11 +1,23 @@
 import psycopg2
-from psycopg2 import pool
-from config.settings import DB_CONFIG, MAX_CONNECTIONS
+from psycopg2.extensions import connection as PgConnection
+from contextlib import contextmanager
+from config.settings import (DB_CONFIG, MAX_CONNECTIONS, MIN_CONNECTIONS, DB_POOL_ACQUIRE_TIMEOUT,
+                             DB_POOL_MAX_LIFETIME, DB_POOL_PRE_PING_AFTER)
+from database.connection_pool import ConnectionPool
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('database')
 
+class PreparedStatementConnection(PgConnection):
+    """
+    Conexão que lembra quais prepared statements já foram criados na sua sessão.
+    Uma conexão nova (ex.: após reconexão) começa com o registro vazio e prepara tudo de novo.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+
 class DatabaseManager:
     """
     Classe Singleton para gerenciar a conexão com o banco de dados PostgreSQL.
@@ -27,33 +39,91 @@ class DatabaseManager:
         self._create_connection_pool()
         self._initialized = True
 
-    def _create_connection_pool(self, min_connections=1, max_connections=None):
+    def _create_connection_pool(self, min_connections=None, max_connections=None):
+        if min_connections is None:
+            min_connections = MIN_CONNECTIONS
         if max_connections is None:
             max_connections = MAX_CONNECTIONS
         try:
-            self._connection_pool = pool.ThreadedConnectionPool(
-                min_connections,
-                max_connections,
-                host=self.config['host'],
-                port=self.config['port'],
-                database=self.config['database'],
-                user=self.config['user'],
-                password=self.config['password']
+            self._connection_pool = ConnectionPool(
+                lambda: self._connect(connection_factory=PreparedStatementConnection),
+                min_size=min_connections,
+                max_size=max_connections,
+                acquire_timeout=DB_POOL_ACQUIRE_TIMEOUT,
+                max_lifetime=DB_POOL_MAX_LIFETIME,
+                pre_ping_after=DB_POOL_PRE_PING_AFTER
             )
             logger.info("Pool de conexoes criado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao criar pool de conexoes: {e}")
             raise
 
-    def get_connection(self):
+    def _connect(self, **kwargs):
+        return psycopg2.connect(
+            host=self.config['host'],
+            port=self.config['port'],
+            database=self.config['database'],
+            user=self.config['user'],
+            password=self.config['password'],
+            **kwargs
+        )
+
+    def get_connection(self, timeout=None):
+        """Obtém uma conexão do pool, esperando até timeout segundos (padrão DB_POOL_ACQUIRE_TIMEOUT) se ele estiver cheio"""
         if self._connection_pool:
-            return self._connection_pool.getconn()
+            return self._connection_pool.getconn(timeout)
         raise Exception("Pool de conexões nao inicializado.")
 
+    def create_dedicated_connection(self):
+        """
+        Abre uma conexão fora do pool, para usos de longa duração (ex.: LISTEN).
+        Quem chama é responsável por fechá-la.
+        """
+        return self._connect()
+
+    @contextmanager
+    def advisory_lock(self, key: int):
+        """
+        Tenta obter um advisory lock de sessão no Postgres sem bloquear.
+        Entrega True se o lock foi obtido; ele vale entre todas as réplicas que usam o mesmo banco
+        e é liberado ao sair do bloco.
+        """
+        connection = self.get_connection()
+        acquired = False
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", (key,))
+                acquired = cursor.fetchone()[0]
+            connection.commit()
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    connection.rollback()
+                    with connection.cursor() as cursor:
+                        cursor.execute("SELECT pg_advisory_unlock(%s)", (key,))
+                    connection.commit()
+                except Exception as e:
+                    # Se a conexão caiu, a sessão acabou e o Postgres já liberou o lock. Se ela continua viva
+                    # (ex.: statement timeout no unlock), a sessão ainda segura o lock: fecha a conexão para
+                    # encerrá-la, em vez de devolvê-la ao pool travando as próximas tentativas
+                    logger.error(f"Erro ao liberar advisory lock {key}, fechando a conexão: {e}")
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            self.release_connection(connection)
+
     def release_connection(self, connection):
         if self._connection_pool:
             self._connection_pool.putconn(connection)
 
+    def pool_stats(self):
+        """Métricas do pool: conexões em uso/ociosas, esperas, esgotamentos e reciclagens"""
+        if self._connection_pool:
+            return self._connection_pool.stats()
+        return {}
+
     def close_all_connections(self):
         if self._connection_pool:
             self._connection_pool.closeall()
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from typing import Dict, Any, Optional, FrozenSet, NamedTuple, Tuple, Callable, List
+from config.settings import MEMBERSHIP_CACHE_TTL_SECONDS, MEMBERSHIP_CACHE_MAX_GROUPS
+import threading
+import time
+import logging
+
+logger = logging.getLogger('membership_cache')
+
+class GroupMembership(NamedTuple):
+    members: FrozenSet[int]
+    banned: FrozenSet[int]
+    loaded_at: float
+    closed: bool = False
+
+class MembershipCache:
+    """
+    Classe Singleton com os IDs de membros e banidos de cada grupo (e se ele está encerrado) em memória.
+    Entradas expiram após o TTL e os grupos menos usados são descartados (LRU)
+    quando o limite de grupos é atingido.
+    Cada grupo tem uma geração, incrementada por invalidate: uma carga feita antes de uma
+    invalidação (ex.: leu os membros logo antes de um banimento) não é gravada por cima do estado novo.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(MembershipCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, ttl: float = None, max_groups: int = None):
+        if self._initialized:
+            return
+        self.ttl = ttl if ttl is not None else MEMBERSHIP_CACHE_TTL_SECONDS
+        self.max_groups = max_groups if max_groups is not None else MEMBERSHIP_CACHE_MAX_GROUPS
+        self._entries: "OrderedDict[int, GroupMembership]" = OrderedDict()
+        self._generations: Dict[int, int] = {}
+        self._epoch = 0
+        self._listeners: List[Callable[[int], None]] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_loads = 0
+        self._initialized = True
+
+    def get(self, group_id: int) -> Optional[GroupMembership]:
+        """Retorna os membros/banidos do grupo, ou None se não estiverem em cache"""
+        with self._lock:
+            entry = self._entries.get(group_id)
+            if entry is None or time.monotonic() - entry.loaded_at > self.ttl:
+                if entry is not None:
+                    del self._entries[group_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(group_id)
+            self.hits += 1
+            return entry
+
+    def generation(self, group_id: int) -> Tuple[int, int]:
+        """Geração atual do grupo; ler antes de consultar o banco e repassar ao put"""
+        with self._lock:
+            return self._epoch, self._generations.get(group_id, 0)
+
+    def put(self, group_id: int, members, banned, closed: bool = False,
+            generation: Tuple[int, int] = None) -> GroupMembership:
+        """
+        Guarda os membros/banidos carregados do banco e retorna a entrada.
+        Se o grupo foi invalidado depois de generation ser lida, a carga está desatualizada:
+        a entrada é retornada para quem a carregou, mas não vai para o cache.
+        """
+        entry = GroupMembership(frozenset(members), frozenset(banned), time.monotonic(), closed)
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._generations.get(group_id, 0)):
+                self.stale_loads += 1
+                return entry
+            self._entries[group_id] = entry
+            self._entries.move_to_end(group_id)
+            while len(self._entries) > self.max_groups:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def add_listener(self, listener: Callable[[int], None]):
+        """Registra uma função chamada com o group_id a cada invalidação (ex.: para reavaliar streams abertos)"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def invalidate(self, group_id: int):
+        with self._lock:
+            self._generations[group_id] = self._generations.get(group_id, 0) + 1
+            if self._entries.pop(group_id, None) is not None:
+                self.invalidations += 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(group_id)
+            except Exception as e:
+                logger.error(f"Erro ao avisar a invalidação do grupo {group_id}: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._generations.clear()
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para monitoramento"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_groups": self.max_groups,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_loads": self.stale_loads
+            }
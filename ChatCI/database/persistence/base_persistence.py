@@ -1,16 +1,89 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple, Union, Callable
+from collections import namedtuple
+from functools import lru_cache
 from database.manager import DatabaseManager
+from config.settings import STREAM_FETCH_SIZE, PREPARED_STATEMENTS_ENABLED
+from psycopg2.extras import execute_values
+from psycopg2 import errors
+import itertools
 import logging
+import re
+import uuid
 
 logger = logging.getLogger('base_persistence')
 
+@lru_cache(maxsize=256)
+def row_class(columns_names: Tuple[str, ...]):
+    """
+    Classe de linha compacta (namedtuple) para uma assinatura de colunas, criada uma única vez.
+    As linhas ocupam cerca de metade da memória de um dict e são acessadas por atributo (row.id).
+    """
+    return namedtuple('Row', columns_names, rename=True)
+
+_PLACEHOLDER = re.compile(r'%(%|s|\(\w+\)s)?')
+
+@lru_cache(maxsize=256)
+def to_positional_params(query: str) -> str:
+    """
+    Troca os placeholders %s do psycopg2 pelos $1, $2... usados no PREPARE.
+    O %% (porcentagem literal, ex.: LIKE 'a%%') vira % como o psycopg2 faria; placeholders nomeados
+    (%(nome)s) e % soltos não são suportados em prepared statements e levantam ValueError.
+    """
+    counter = itertools.count(1)
+
+    def replace(match):
+        token = match.group(1)
+        if token == '%':
+            return '%'
+        if token == 's':
+            return f"${next(counter)}"
+        raise ValueError(f"Placeholder não suportado em prepared statement: {match.group(0)!r}")
+
+    return _PLACEHOLDER.sub(replace, query)
+
+def _row_builder(columns_names: Tuple[str, ...], compact: bool):
+    if compact:
+        return row_class(columns_names)._make
+    return lambda row: dict(zip(columns_names, row))
+
 class BasePersistence:
     """Classe base para todos os DAOs com métodos comuns"""
     def __init__(self):
         self.db_manager = DatabaseManager()
         
-    def _execute_query(self, query: str, params: tuple = None) -> List[Dict[str,Any]]:
-        """Executa uma consulta SQL e retorna os resultados"""
+    def _execute(self, cursor, query: str, params: tuple = None, prepared: str = None):
+        """
+        Executa a instrução no cursor. Com prepared (nome da instrução), usa PREPARE na primeira vez
+        em cada conexão e EXECUTE nas seguintes, poupando o envio e o planejamento do SQL.
+        Só deve ser usado em instruções únicas por transação (o retry abaixo faz rollback).
+        """
+        connection = cursor.connection
+        registry = getattr(connection, 'prepared_statements', None)
+        if not prepared or registry is None or not PREPARED_STATEMENTS_ENABLED:
+            cursor.execute(query, params)
+            return
+
+        execute_sql = f"EXECUTE {prepared} ({', '.join(['%s'] * len(params))})" if params else f"EXECUTE {prepared}"
+        if prepared not in registry:
+            cursor.execute(f"PREPARE {prepared} AS {to_positional_params(query)}")
+            registry.add(prepared)
+
+        try:
+            cursor.execute(execute_sql, params)
+        except errors.FeatureNotSupported:
+            # "cached plan must not change result type": o esquema mudou (ex.: coluna nova num SELECT *)
+            connection.rollback()
+            cursor.execute(f"DEALLOCATE {prepared}")
+            cursor.execute(f"PREPARE {prepared} AS {to_positional_params(query)}")
+            cursor.execute(execute_sql, params)
+
+    def _execute_query(self, query: str, params: tuple = None, compact: bool = False,
+                       prepared: str = None) -> List[Union[Dict[str, Any], Tuple]]:
+        """
+        Executa uma consulta SQL e retorna os resultados.
+        Com compact=True cada linha é um namedtuple (ver row_class) em vez de um dict;
+        com prepared a consulta vira um prepared statement da conexão (ver _execute).
+        """
         connection = None
         cursor = None
         results = []
@@ -18,12 +91,11 @@ class BasePersistence:
         try:
             connection = self.db_manager.get_connection()
             cursor = connection.cursor()
-            cursor.execute(query, params)
+            self._execute(cursor, query, params, prepared)
             
             if cursor.description:
-                columns_names = [desc[0] for desc in cursor.description]
-                for row in cursor.fetchall():
-                    results.append(dict(zip(columns_names, row)))
+                build_row = _row_builder(tuple(desc[0] for desc in cursor.description), compact)
+                results = [build_row(row) for row in cursor.fetchall()]
             return results
         
         except Exception as e:
@@ -59,7 +131,9 @@ class BasePersistence:
             if connection:
                 self.db_manager.release_connection(connection)
     
-    def _execute_insert_returning_id(self, query: str, params: tuple = None) -> int:
+    def _execute_returning(self, query: str, params: tuple = None,
+                           compact: bool = False) -> List[Union[Dict[str, Any], Tuple]]:
+        """Executa uma escrita com RETURNING numa única transação e retorna as linhas produzidas"""
         connection = None
         cursor = None
         
@@ -67,6 +141,56 @@ class BasePersistence:
             connection = self.db_manager.get_connection()
             cursor = connection.cursor()
             cursor.execute(query, params)
+            build_row = _row_builder(tuple(desc[0] for desc in cursor.description), compact)
+            results = [build_row(row) for row in cursor.fetchall()]
+            connection.commit()
+            return results
+            
+        except Exception as e:
+            logger.error(f"Erro ao executar escrita: {e}")
+            if connection:
+                connection.rollback()
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                self.db_manager.release_connection(connection)
+    
+    def _execute_transaction(self, work: Callable[[Any], Any]) -> Any:
+        """
+        Executa work(cursor) numa única transação, para escritas com várias instruções:
+        commit se work terminar, rollback se ele levantar exceção. Retorna o que work retornar.
+        """
+        connection = None
+        cursor = None
+        
+        try:
+            connection = self.db_manager.get_connection()
+            cursor = connection.cursor()
+            result = work(cursor)
+            connection.commit()
+            return result
+            
+        except Exception as e:
+            logger.error(f"Erro ao executar transação: {e}")
+            if connection:
+                connection.rollback()
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                self.db_manager.release_connection(connection)
+    
+    def _execute_insert_returning_id(self, query: str, params: tuple = None, prepared: str = None) -> int:
+        connection = None
+        cursor = None
+        
+        try:
+            connection = self.db_manager.get_connection()
+            cursor = connection.cursor()
+            self._execute(cursor, query, params, prepared)
             id_gerado = cursor.fetchone()[0]
             connection.commit()
             return id_gerado
@@ -80,4 +204,85 @@ class BasePersistence:
             if cursor:
                 cursor.close()
             if connection:
-                self.db_manager.release_connection(connection)
\ No newline at end of file
+                self.db_manager.release_connection(connection)
+    
+    def _execute_values_returning_ids(self, query: str, rows: List[tuple], template: str = None,
+                                      page_size: int = 1000) -> List[int]:
+        """
+        Insere várias linhas com execute_values numa única transação
+        e retorna os IDs gerados, na ordem das linhas
+        """
+        results = self._execute_values_query(query, rows, template, page_size)
+        return [row['id'] for row in results]
+    
+    def _execute_values_query(self, query: str, rows: List[tuple], template: str = None,
+                              page_size: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Executa uma instrução com VALUES %s expandido por execute_values numa única transação
+        e retorna as linhas produzidas (RETURNING/SELECT)
+        """
+        if not rows:
+            return []
+
+        connection = None
+        cursor = None
+        
+        try:
+            connection = self.db_manager.get_connection()
+            cursor = connection.cursor()
+            results = execute_values(cursor, query, rows, template=template, page_size=page_size, fetch=True)
+            connection.commit()
+            columns_names = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns_names, row)) for row in results]
+            
+        except Exception as e:
+            logger.error(f"Erro ao executar inserção em lote: {e}")
+            if connection:
+                connection.rollback()
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                self.db_manager.release_connection(connection)
+    
+    def _iter_query(self, query: str, params: tuple = None, itersize: int = STREAM_FETCH_SIZE,
+                    compact: bool = False) -> Iterator[Union[Dict[str, Any], Tuple]]:
+        """
+        Executa uma consulta num cursor nomeado (no servidor) e gera as linhas uma a uma,
+        buscando itersize linhas por ida ao banco, sem carregar o resultado inteiro na memória.
+        Com compact=True as linhas são namedtuples, como em _execute_query.
+        
+        A conexão fica presa ao gerador e volta ao pool quando ele termina ou é fechado
+        (close(), contextlib.closing ou coleta de lixo); quem para no meio deve fechá-lo.
+        """
+        connection = None
+        cursor = None
+        
+        try:
+            connection = self.db_manager.get_connection()
+            cursor = connection.cursor(name=f"iter_{uuid.uuid4().hex}")
+            cursor.itersize = itersize
+            cursor.execute(query, params)
+            
+            build_row = None
+            for row in cursor:
+                if build_row is None:
+                    build_row = _row_builder(tuple(desc[0] for desc in cursor.description), compact)
+                yield build_row(row)
+        
+        except Exception as e:
+            logger.error(f"Erro ao iterar a consulta: {e}")
+            raise
+        finally:
+            if cursor:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            if connection:
+                try:
+                    # Encerra a transação de leitura aberta pelo cursor nomeado
+                    connection.rollback()
+                finally:
+                    self.db_manager.release_connection(connection)
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from .base_persistence import BasePersistence
 import logging
 from datetime import date, datetime
@@ -56,6 +56,11 @@ class EventPersistence(BasePersistence, EventDAO):
         query = "SELECT * FROM event ORDER BY event_date DESC"
         return self._execute_query(query)
     
+    def iter_all_events(self) -> Iterator[Dict[str, Any]]:
+        """Versão em streaming de get_all_events, para respostas grandes"""
+        query = "SELECT * FROM event ORDER BY event_date DESC"
+        return self._iter_query(query)
+    
     def get_upcoming_events(self, limit: int = None) -> List[Dict[str, Any]]:
         """
         Busca eventos futuros
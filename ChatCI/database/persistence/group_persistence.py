@@ -1,13 +1,74 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 from .base_persistence import BasePersistence
+from psycopg2.extras import Json, execute_values
 import logging
 from ..dao.group_dao import GroupDAO
+from ..membership_cache import MembershipCache, GroupMembership
 
 logger = logging.getLogger('group_dao')
 
+# Prefixo do nome provisório usado na primeira passada das renomeações (ver update_groups)
+RENAMING_PREFIX = '__renomeando__ '
+
+def resolve_renames(requested: Dict[int, str], current: Dict[int, str]) -> Dict[int, str]:
+    """
+    Decide o nome final de cada grupo de um lote de renomeações sem violar o nome único.
+    
+    Args:
+        requested: group_id -> nome pedido, para os grupos do lote
+        current: group_id -> nome atual, dos grupos do lote e dos que hoje têm algum dos nomes pedidos
+        
+    Returns:
+        group_id -> nome final; é o nome atual quando o pedido conflita (o nome continuará com um grupo
+        fora do lote ou com um grupo que não pôde ser renomeado, ou foi pedido por mais de um grupo do lote).
+        Trocas e rodízios de nome entre grupos do lote são permitidos.
+    """
+    blocked = set()
+    while True:
+        final = {group_id: current[group_id] if group_id in blocked else name
+                 for group_id, name in requested.items()}
+        holders: Dict[str, List[int]] = {}
+        for group_id, name in current.items():
+            if group_id not in final:
+                holders.setdefault(name, []).append(group_id)
+        for group_id, name in final.items():
+            holders.setdefault(name, []).append(group_id)
+
+        # Quem disputa um nome mantém o atual; isso pode liberar ou ocupar outros nomes, então repete
+        newly_blocked = {group_id for group_id, name in final.items()
+                         if group_id not in blocked and len(holders[name]) > 1}
+        if not newly_blocked:
+            return final
+        blocked |= newly_blocked
+
 class GroupPersistence(BasePersistence, GroupDAO):
     """DAO para manipulação da tabela de grupos"""
     
+    def __init__(self):
+        super().__init__()
+        self.membership_cache = MembershipCache()
+    
+    def _get_membership(self, group_id: int) -> GroupMembership:
+        """Retorna membros, banidos e encerramento do grupo, carregando tudo numa só consulta se necessário"""
+        membership = self.membership_cache.get(group_id)
+        if membership is not None:
+            return membership
+
+        # lida antes da consulta: se uma alteração invalidar o grupo durante a carga, ela não entra no cache
+        generation = self.membership_cache.generation(group_id)
+        query = """
+        SELECT 'member' AS kind, user_id FROM groups_members WHERE group_id = %s
+        UNION ALL
+        SELECT 'banned' AS kind, user_id FROM groups_banned_members WHERE group_id = %s
+        UNION ALL
+        SELECT 'closed' AS kind, NULL FROM groups WHERE id = %s AND closed_at IS NOT NULL
+        """
+        rows = self._execute_query(query, (group_id, group_id, group_id), compact=True, prepared='group_membership')
+        members = [row.user_id for row in rows if row.kind == 'member']
+        banned = [row.user_id for row in rows if row.kind == 'banned']
+        closed = any(row.kind == 'closed' for row in rows)
+        return self.membership_cache.put(group_id, members, banned, closed, generation=generation)
+    
     def create_group(self, name: str, description: str = "") -> int:
         """
         Cria um novo grupo
@@ -26,6 +87,163 @@ class GroupPersistence(BasePersistence, GroupDAO):
         """
         return self._execute_insert_returning_id(query, (name, description))
     
+    def create_groups(self, groups: List[Tuple[str, str]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Cria vários grupos numa única instrução, ignorando os que já existem (pelo nome)
+        
+        Args:
+            groups: Lista de tuplas (name, description)
+            
+        Returns:
+            Tupla (criados, existentes), cada um uma lista de dicionários com id e name
+        """
+        # Remove nomes repetidos mantendo a primeira ocorrência
+        seen_names = set()
+        unique_groups = []
+        for name, description in groups:
+            if name not in seen_names:
+                seen_names.add(name)
+                unique_groups.append((name, description))
+
+        if not unique_groups:
+            return [], []
+
+        query = """
+        WITH input (name, description) AS (
+            VALUES %s
+        ),
+        inserted AS (
+            INSERT INTO groups (name, description)
+            SELECT name, description FROM input
+            ON CONFLICT (name) DO NOTHING
+            RETURNING id, name
+        )
+        SELECT id, name, TRUE AS created FROM inserted
+        UNION ALL
+        SELECT g.id, g.name, FALSE AS created
+        FROM groups g
+        JOIN input i ON i.name = g.name
+        """
+        # Uma única página: a instrução inteira precisa ver a lista completa
+        rows = self._execute_values_query(query, unique_groups, page_size=len(unique_groups))
+        created = [{"id": row['id'], "name": row['name']} for row in rows if row['created']]
+        existing = [{"id": row['id'], "name": row['name']} for row in rows if not row['created']]
+
+        # Um grupo inserido por outra transação durante a instrução é ignorado pelo DO NOTHING
+        # mas não aparece no SELECT (mesmo snapshot); uma nova consulta já enxerga o commit
+        found = {row['name'] for row in rows}
+        missing = [name for name, _ in unique_groups if name not in found]
+        if missing:
+            existing += self._execute_query(
+                "SELECT id, name FROM groups WHERE name = ANY(%s)", (missing,)
+            )
+        return created, existing
+    
+    def get_saci_groups(self) -> List[Dict[str, Any]]:
+        """
+        Retorna os grupos ligados a turmas do SACI (abertos e encerrados), base da sincronização
+        
+        Returns:
+            Lista de dicionários com id, name, saci_code, saci_turma, saci_data (campos da turma
+            na última sincronização, ou None) e closed_at
+        """
+        query = """
+        SELECT id, name, saci_code, saci_turma, saci_data, closed_at
+        FROM groups
+        WHERE saci_code IS NOT NULL
+        """
+        return self._execute_query(query)
+    
+    def update_groups(self, groups: List[Tuple[int, str, str, Dict[str, str]]]) -> List[Dict[str, Any]]:
+        """
+        Atualiza nome, descrição e dados da turma do SACI de vários grupos numa única transação
+        e reabre os que estavam encerrados. Só escreve as linhas que realmente mudaram.
+        Se o novo nome ficaria com dois grupos (já pertence a um grupo fora do lote ou é pedido por
+        mais de um grupo do lote), aquele grupo mantém o nome atual (o resto é atualizado) e volta
+        como name_conflict, em vez de a transação inteira falhar no índice único.
+        Trocas de nome entre grupos do lote são aplicadas em duas passadas, via nome provisório.
+        
+        Args:
+            groups: Lista de tuplas (group_id, new_name, description, turma)
+            
+        Returns:
+            Lista de dicionários com id, name e name_conflict dos grupos alterados
+        """
+        if not groups:
+            return []
+
+        requested = {group_id: name for group_id, name, _, _ in groups}
+
+        def work(cursor):
+            # Trava os grupos do lote e os donos atuais dos nomes pedidos até o fim da transação
+            cursor.execute(
+                "SELECT id, name FROM groups WHERE id = ANY(%s) OR name = ANY(%s) ORDER BY id FOR UPDATE",
+                (list(requested), list(set(requested.values())))
+            )
+            current = dict(cursor.fetchall())
+            batch = {group_id: name for group_id, name in requested.items() if group_id in current}
+            final = resolve_renames(batch, current)
+
+            # O índice único é checado linha a linha: quem muda de nome passa antes por um nome provisório
+            renamed = [group_id for group_id, name in final.items() if name != current[group_id]]
+            if renamed:
+                cursor.execute("UPDATE groups SET name = %s || id WHERE id = ANY(%s)", (RENAMING_PREFIX, renamed))
+
+            rows = [
+                (group_id, final[group_id], description, Json(turma), final[group_id] != name)
+                for group_id, name, description, turma in groups if group_id in final
+            ]
+            if not rows:
+                return []
+            query = """
+            UPDATE groups g
+            SET name = v.name,
+                description = v.description,
+                saci_code = v.saci_data->>'code',
+                saci_turma = v.saci_data->>'turma',
+                saci_data = v.saci_data,
+                closed_at = NULL
+            FROM (VALUES %s) AS v (id, name, description, saci_data, name_conflict)
+            WHERE g.id = v.id
+              AND (v.name_conflict
+                   OR (g.name, g.description, g.saci_data, g.closed_at IS NULL)
+                      IS DISTINCT FROM (v.name, v.description, v.saci_data, TRUE))
+            RETURNING g.id, g.name, v.name_conflict
+            """
+            template = "(%s::integer, %s::varchar, %s::text, %s::jsonb, %s::boolean)"
+            results = execute_values(cursor, query, rows, template=template, page_size=len(rows), fetch=True)
+            return [{"id": row[0], "name": row[1], "name_conflict": row[2]} for row in results]
+
+        updated = self._execute_transaction(work)
+        # Grupos reabertos voltam a aceitar mensagens
+        for group in updated:
+            self.membership_cache.invalidate(group['id'])
+        return updated
+    
+    def close_groups(self, group_ids: List[int]) -> int:
+        """
+        Marca como encerrados os grupos cujas turmas saíram do SACI.
+        Grupos encerrados somem das listagens e não aceitam novas mensagens; o histórico continua legível.
+        
+        Args:
+            group_ids: IDs dos grupos
+            
+        Returns:
+            Quantidade de grupos encerrados
+        """
+        if not group_ids:
+            return 0
+
+        query = """
+        UPDATE groups
+        SET closed_at = CURRENT_TIMESTAMP
+        WHERE id = ANY(%s) AND closed_at IS NULL
+        """
+        closed = self._execute_update(query, (list(group_ids),))
+        for group_id in group_ids:
+            self.membership_cache.invalidate(group_id)
+        return closed
+    
     def get_group_by_id(self, group_id: int) -> Optional[Dict[str, Any]]:
         """Busca um grupo pelo ID"""
         query = "SELECT * FROM groups WHERE id = %s"
@@ -39,10 +257,15 @@ class GroupPersistence(BasePersistence, GroupDAO):
         return results[0] if results else None
     
     def get_all_groups(self) -> List[Dict[str, Any]]:
-        """Busca todos os grupos"""
-        query = "SELECT * FROM groups ORDER BY name"
+        """Busca todos os grupos abertos (sem os encerrados)"""
+        query = "SELECT * FROM groups WHERE closed_at IS NULL ORDER BY name"
         return self._execute_query(query)
     
+    def iter_all_groups(self) -> Iterator[Dict[str, Any]]:
+        """Versão em streaming de get_all_groups, para respostas grandes"""
+        query = "SELECT * FROM groups WHERE closed_at IS NULL ORDER BY name"
+        return self._iter_query(query)
+    
     def add_member(self, group_id: int, user_id: int) -> bool:
         """
         Adiciona um membro a um grupo
@@ -60,11 +283,33 @@ class GroupPersistence(BasePersistence, GroupDAO):
             VALUES (%s, %s)
             """
             rows_affected = self._execute_update(query, (group_id, user_id))
+            self.membership_cache.invalidate(group_id)
             return rows_affected > 0
         except Exception as e:
             logger.error(f"Erro ao adicionar membro ao grupo: {e}")
             return False
         
+    def add_members(self, memberships: List[Tuple[int, int]]) -> int:
+        """
+        Adiciona vários membros a grupos numa única instrução, ignorando os que já são membros
+        
+        Args:
+            memberships: Lista de tuplas (group_id, user_id)
+            
+        Returns:
+            Quantidade de membros adicionados
+        """
+        query = """
+        INSERT INTO groups_members (group_id, user_id)
+        VALUES %s
+        ON CONFLICT (group_id, user_id) DO NOTHING
+        RETURNING group_id
+        """
+        rows = self._execute_values_query(query, memberships)
+        for group_id in {row['group_id'] for row in rows}:
+            self.membership_cache.invalidate(group_id)
+        return len(rows)
+        
     def remove_member(self, group_id: int, user_id: int) -> bool:
         """
         Remove um membro de um grupo
@@ -81,6 +326,7 @@ class GroupPersistence(BasePersistence, GroupDAO):
         WHERE group_id = %s AND user_id = %s
         """
         rows_affected = self._execute_update(query, (group_id, user_id))
+        self.membership_cache.invalidate(group_id)
         return rows_affected > 0
     
     def is_member(self, group_id: int, user_id: int) -> bool:
@@ -94,13 +340,19 @@ class GroupPersistence(BasePersistence, GroupDAO):
         Returns:
             True se o usuário é membro, False caso contrário
         """
-        query = """
-        SELECT COUNT(*) as count
-        FROM groups_members
-        WHERE group_id = %s AND user_id = %s
+        return user_id in self._get_membership(group_id).members
+    
+    def is_closed(self, group_id: int) -> bool:
         """
-        result = self._execute_query(query, (group_id, user_id))
-        return result[0]['count'] > 0 if result else False
+        Verifica se o grupo foi encerrado (turma que saiu do SACI)
+        
+        Args:
+            group_id: ID do grupo
+            
+        Returns:
+            True se o grupo está encerrado, False caso contrário
+        """
+        return self._get_membership(group_id).closed
     
     def is_banned(self, group_id: int, user_id: int) -> bool:
         """
@@ -113,29 +365,51 @@ class GroupPersistence(BasePersistence, GroupDAO):
         Returns:
             True se o usuário está banido, False caso contrário
         """
+        return user_id in self._get_membership(group_id).banned
+    
+    def get_group_authorization(self, group_id: int, user_id: int) -> Dict[str, bool]:
+        """
+        Verifica em uma única consulta se o grupo e o usuário existem
+        e se o usuário é membro ou está banido do grupo
+        
+        Args:
+            group_id: ID do grupo
+            user_id: ID do usuário
+            
+        Returns:
+            Dicionário com group_exists, user_exists, is_member e is_banned
+        """
         query = """
-        SELECT COUNT(*) as count
-        FROM groups_banned_members
-        WHERE group_id = %s AND user_id = %s
+        SELECT
+            EXISTS (SELECT 1 FROM groups WHERE id = %s) AS group_exists,
+            EXISTS (SELECT 1 FROM users WHERE id = %s) AS user_exists,
+            EXISTS (
+                SELECT 1 FROM groups_members
+                WHERE group_id = %s AND user_id = %s
+            ) AS is_member,
+            EXISTS (
+                SELECT 1 FROM groups_banned_members
+                WHERE group_id = %s AND user_id = %s
+            ) AS is_banned
         """
-        result = self._execute_query(query, (group_id, user_id))
-        return result[0]['count'] > 0 if result else False
+        result = self._execute_query(query, (group_id, user_id, group_id, user_id, group_id, user_id))
+        return result[0]
     
     def get_user_groups(self, user_id: int) -> List[Dict[str, Any]]:
         """
-        Retorna todos os grupos que um usuário participa
+        Retorna todos os grupos abertos que um usuário participa
         
         Args:
             user_id: ID do usuário
             
         Returns:
-            Lista de grupos que o usuário participa
+            Lista de grupos que o usuário participa (sem os encerrados)
         """
         query = """
         SELECT g.* 
         FROM groups g
         JOIN groups_members gm ON g.id = gm.group_id
-        WHERE gm.user_id = %s
+        WHERE gm.user_id = %s AND g.closed_at IS NULL
         ORDER BY g.name
         """
         return self._execute_query(query, (user_id,))
@@ -152,16 +426,19 @@ class GroupPersistence(BasePersistence, GroupDAO):
             True se o usuário foi banido, False caso contrário
         """
         try:
-            # Remove o usuário do grupo, se for membro
-            if self.is_member(group_id, user_id):
-                self.remove_member(group_id, user_id)
-            
-            # Adiciona à lista de banidos
+            # Remove o usuário do grupo (se for membro) e adiciona à lista de banidos
+            # numa única instrução, na mesma transação
             query = """
+            WITH removed AS (
+                DELETE FROM groups_members
+                WHERE group_id = %s AND user_id = %s
+            )
             INSERT INTO groups_banned_members (group_id, user_id)
             VALUES (%s, %s)
+            ON CONFLICT (group_id, user_id) DO NOTHING
             """
-            rows_affected = self._execute_update(query, (group_id, user_id))
+            rows_affected = self._execute_update(query, (group_id, user_id, group_id, user_id))
+            self.membership_cache.invalidate(group_id)
             return rows_affected > 0
         except Exception as e:
             logger.error(f"Erro ao banir usuário: {e}")
@@ -184,17 +461,19 @@ class GroupPersistence(BasePersistence, GroupDAO):
             WHERE group_id = %s AND user_id = %s
             """
             rows_affected = self._execute_update(query, (group_id, user_id))
+            self.membership_cache.invalidate(group_id)
             return rows_affected > 0
         except Exception as e:
             logger.error(f"Erro ao desbanir usuário: {e}")
             return False
 
-    def get_group_members(self, group_id: int) -> List[Dict[str, Any]]:
+    def get_group_members(self, group_id: int, compact: bool = False) -> List[Dict[str, Any]]:
         """
         Retorna todos os membros de um grupo
         
         Args:
             group_id: ID do grupo
+            compact: Retorna namedtuples (acesso por atributo) em vez de dicts
             
         Returns:
             Lista de membros do grupo
@@ -206,14 +485,15 @@ class GroupPersistence(BasePersistence, GroupDAO):
         WHERE gm.group_id = %s
         ORDER BY u.username
         """
-        return self._execute_query(query, (group_id,))
+        return self._execute_query(query, (group_id,), compact=compact)
 
-    def get_banned_members(self, group_id: int) -> List[Dict[str, Any]]:
+    def get_banned_members(self, group_id: int, compact: bool = False) -> List[Dict[str, Any]]:
         """
         Retorna todos os usuários banidos de um grupo
         
         Args:
             group_id: ID do grupo
+            compact: Retorna namedtuples (acesso por atributo) em vez de dicts
             
         Returns:
             Lista de usuários banidos do grupo
@@ -225,4 +505,26 @@ class GroupPersistence(BasePersistence, GroupDAO):
         WHERE gbm.group_id = %s
         ORDER BY u.username
         """
-        return self._execute_query(query, (group_id,))
\ No newline at end of file
+        return self._execute_query(query, (group_id,), compact=compact)
+
+    def iter_group_members(self, group_id: int, compact: bool = False) -> Iterator[Dict[str, Any]]:
+        """Versão em streaming de get_group_members, para grupos grandes"""
+        query = """
+        SELECT u.id, u.username, u.first_name, u.last_name, u.email
+        FROM users u
+        JOIN groups_members gm ON u.id = gm.user_id
+        WHERE gm.group_id = %s
+        ORDER BY u.username
+        """
+        return self._iter_query(query, (group_id,), compact=compact)
+
+    def iter_banned_members(self, group_id: int, compact: bool = False) -> Iterator[Dict[str, Any]]:
+        """Versão em streaming de get_banned_members, para grupos grandes"""
+        query = """
+        SELECT u.id, u.username, u.first_name, u.last_name, u.email
+        FROM users u
+        JOIN groups_banned_members gbm ON u.id = gbm.user_id
+        WHERE gbm.group_id = %s
+        ORDER BY u.username
+        """
+        return self._iter_query(query, (group_id,), compact=compact)
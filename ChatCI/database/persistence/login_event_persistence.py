@@ -0,0 +1,188 @@
+from typing import List, Dict, Any, Iterator, Tuple, Optional
+from .base_persistence import BasePersistence
+import logging
+from datetime import datetime
+from ..dao.login_event_dao import LoginEventDAO
+
+logger = logging.getLogger('login_event_dao')
+
+class LoginEventPersistence(BasePersistence, LoginEventDAO):
+    """DAO para o histórico de logins (tabela login_events)"""
+    
+    def record_events(self, events: List[Tuple[Optional[int], str, datetime, Optional[str], str]]) -> int:
+        """
+        Grava um lote de tentativas de login numa única instrução e atualiza users.last_login
+        com o login bem-sucedido mais recente de cada usuário do lote
+        
+        Args:
+            events: Lista de tuplas (user_id, login, ts, ip, outcome)
+            
+        Returns:
+            Quantidade de eventos gravados
+        """
+        if not events:
+            return 0
+
+        query = """
+        WITH input (user_id, login, ts, ip, outcome) AS (
+            VALUES %s
+        ),
+        inserted AS (
+            INSERT INTO login_events (user_id, login, ts, ip, outcome)
+            SELECT user_id, login, ts, ip, outcome FROM input
+            RETURNING id
+        ),
+        touched AS (
+            UPDATE users u
+            SET last_login = latest.ts
+            FROM (
+                SELECT user_id, MAX(ts) AS ts
+                FROM input
+                WHERE outcome = 'success' AND user_id IS NOT NULL
+                GROUP BY user_id
+            ) latest
+            WHERE u.id = latest.user_id
+              AND (u.last_login IS NULL OR u.last_login < latest.ts)
+            RETURNING u.id
+        )
+        SELECT COUNT(*) AS inserted FROM inserted
+        """
+        template = "(%s::integer, %s::varchar, %s::timestamptz, %s::varchar, %s::varchar)"
+        # Uma única página: a instrução inteira precisa ver o lote completo
+        rows = self._execute_values_query(query, events, template=template, page_size=len(events))
+        return rows[0]['inserted'] if rows else 0
+    
+    def import_login_history(self, events: List[Tuple[str, datetime]]) -> int:
+        """
+        Importa logins bem-sucedidos lidos dos logs em arquivo (TXT/HTML), que só guardam o username
+        e o horário em segundos. O usuário é resolvido pelo username; logins que já estão na tabela
+        (mesmo login no mesmo segundo) são ignorados, então importar o mesmo arquivo de novo não duplica nada.
+        
+        Args:
+            events: Lista de tuplas (username, ts)
+            
+        Returns:
+            Quantidade de eventos inseridos
+        """
+        if not events:
+            return 0
+
+        query = """
+        WITH input (login, ts) AS (
+            VALUES %s
+        ),
+        new_events AS (
+            SELECT DISTINCT i.login, i.ts
+            FROM input i
+            WHERE NOT EXISTS (
+                SELECT 1 FROM login_events e
+                WHERE e.outcome = 'success' AND e.login = i.login
+                  AND e.ts >= i.ts AND e.ts < i.ts + INTERVAL '1 second'
+            )
+        ),
+        inserted AS (
+            INSERT INTO login_events (user_id, login, ts, outcome)
+            SELECT u.id, n.login, n.ts, 'success'
+            FROM new_events n
+            LEFT JOIN users u ON u.username = n.login
+            RETURNING user_id, ts
+        ),
+        touched AS (
+            UPDATE users u
+            SET last_login = latest.ts
+            FROM (
+                SELECT user_id, MAX(ts) AS ts
+                FROM inserted
+                WHERE user_id IS NOT NULL
+                GROUP BY user_id
+            ) latest
+            WHERE u.id = latest.user_id
+              AND (u.last_login IS NULL OR u.last_login < latest.ts)
+            RETURNING u.id
+        )
+        SELECT COUNT(*) AS inserted FROM inserted
+        """
+        template = "(%s::varchar, %s::timestamptz)"
+        rows = self._execute_values_query(query, events, template=template, page_size=len(events))
+        return rows[0]['inserted'] if rows else 0
+    
+    def get_logins_per_day(self, since: datetime) -> List[Dict[str, Any]]:
+        """
+        Conta logins por dia a partir de uma data
+        
+        Args:
+            since: Início do período
+            
+        Returns:
+            Lista de dicionários com day, successful, failed e unique_users
+        """
+        query = """
+        SELECT date_trunc('day', ts)::date AS day,
+               COUNT(*) FILTER (WHERE outcome = 'success') AS successful,
+               COUNT(*) FILTER (WHERE outcome <> 'success') AS failed,
+               COUNT(DISTINCT user_id) FILTER (WHERE outcome = 'success') AS unique_users
+        FROM login_events
+        WHERE ts >= %s
+        GROUP BY day
+        ORDER BY day
+        """
+        return self._execute_query(query, (since,))
+    
+    def get_last_logins(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Retorna o último login de cada usuário, dos mais recentes para os mais antigos
+        
+        Args:
+            limit: Número máximo de usuários
+            
+        Returns:
+            Lista de dicionários com user_id, username, last_login e ip
+        """
+        query = """
+        SELECT last.user_id, u.username, last.ts AS last_login, last.ip
+        FROM (
+            SELECT DISTINCT ON (user_id) user_id, ts, ip
+            FROM login_events
+            WHERE outcome = 'success' AND user_id IS NOT NULL
+            ORDER BY user_id, ts DESC
+        ) last
+        JOIN users u ON u.id = last.user_id
+        ORDER BY last.ts DESC
+        LIMIT %s
+        """
+        return self._execute_query(query, (limit,))
+    
+    def get_failed_attempts(self, since: datetime, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Agrupa as tentativas malsucedidas por login informado e IP
+        
+        Args:
+            since: Início do período
+            limit: Número máximo de grupos
+            
+        Returns:
+            Lista de dicionários com login, ip, attempts e last_attempt, dos mais frequentes primeiro
+        """
+        query = """
+        SELECT login, ip, COUNT(*) AS attempts, MAX(ts) AS last_attempt
+        FROM login_events
+        WHERE ts >= %s AND outcome <> 'success'
+        GROUP BY login, ip
+        ORDER BY attempts DESC, last_attempt DESC
+        LIMIT %s
+        """
+        return self._execute_query(query, (since, limit))
+    
+    def iter_login_events(self, start: datetime = None, end: datetime = None,
+                          outcome: str = 'success') -> Iterator[Dict[str, Any]]:
+        """Percorre o histórico em ordem cronológica num cursor no servidor, opcionalmente em [start, end)"""
+        query = """
+        SELECT e.user_id, COALESCE(u.username, e.login) AS username, e.ts, e.ip, e.outcome
+        FROM login_events e
+        LEFT JOIN users u ON u.id = e.user_id
+        WHERE e.outcome = %s
+          AND (%s::timestamptz IS NULL OR e.ts >= %s)
+          AND (%s::timestamptz IS NULL OR e.ts < %s)
+        ORDER BY e.ts
+        """
+        return self._iter_query(query, (outcome, start, start, end, end))
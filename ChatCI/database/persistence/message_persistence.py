@@ -1,15 +1,35 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from .base_persistence import BasePersistence
 import logging
+import base64
+import json
+import re
 from datetime import datetime
 from ..dao.message_dao import MessageDAO
 
 logger = logging.getLogger('message_dao')
 
+def with_notify(insert_query: str, channel: str) -> str:
+    """
+    Envolve um INSERT ... RETURNING id, group_id para emitir, na mesma instrução, um NOTIFY por mensagem.
+    O Postgres só entrega o NOTIFY no commit, então ele sai exatamente quando a linha fica visível
+    (e nunca se a transação falhar). O canal vai no texto do SQL (execute_values só aceita um %s),
+    por isso precisa ser um identificador simples, como no LISTEN do listener.
+    """
+    if not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', channel):
+        raise ValueError(f"Canal de NOTIFY inválido: {channel!r}")
+    return f"""
+    WITH inserted AS ({insert_query})
+    SELECT inserted.*,
+           pg_notify('{channel}', json_build_object('group_id', inserted.group_id, 'message_id', inserted.id)::text)
+    FROM inserted
+    """
+
 class MessagePersistence(BasePersistence, MessageDAO):
     """DAO para manipulação da tabela de mensagens"""
     
-    def create_message(self, group_id: int, user_id: int, text: str, file: str = None) -> int:
+    def create_message(self, group_id: int, user_id: int, text: str, file: str = None,
+                       notify_channel: str = None) -> int:
         """
         Cria uma nova mensagem em um grupo
         
@@ -18,6 +38,7 @@ class MessagePersistence(BasePersistence, MessageDAO):
             user_id: ID do usuário que enviou a mensagem
             text: Conteúdo da mensagem
             file: Caminho para arquivo anexo (opcional)
+            notify_channel: Canal do LISTEN/NOTIFY avisado na mesma transação (opcional)
             
         Returns:
             ID da mensagem criada
@@ -25,9 +46,70 @@ class MessagePersistence(BasePersistence, MessageDAO):
         query = """
         INSERT INTO messages (group_id, user_id, text, file)
         VALUES (%s, %s, %s, %s)
-        RETURNING id
+        RETURNING id, group_id
+        """
+        params = (group_id, user_id, text, file)
+        if notify_channel:
+            return self._execute_insert_returning_id(with_notify(query, notify_channel), params,
+                                                     prepared='create_message_notify')
+        return self._execute_insert_returning_id(query, params, prepared='create_message')
+    
+    def create_messages(self, messages: List[Tuple[int, int, str]], notify_channel: str = None) -> List[int]:
+        """
+        Cria várias mensagens numa única transação
+        
+        Args:
+            messages: Lista de tuplas (group_id, user_id, text)
+            notify_channel: Canal do LISTEN/NOTIFY avisado na mesma transação (opcional)
+            
+        Returns:
+            IDs das mensagens criadas, na mesma ordem da entrada
+        """
+        query = """
+        INSERT INTO messages (group_id, user_id, text)
+        VALUES %s
+        RETURNING id, group_id
         """
-        return self._execute_insert_returning_id(query, (group_id, user_id, text, file))
+        if notify_channel:
+            query = with_notify(query, notify_channel)
+        return self._execute_values_returning_ids(query, messages)
+    
+    def create_message_in_all_groups(self, user_id: int, text: str,
+                                     notify_channel: str = None) -> List[Tuple[int, int]]:
+        """
+        Cria a mesma mensagem em todos os grupos abertos numa única instrução (tudo ou nada),
+        sem trazer a lista de grupos para a aplicação
+        
+        Args:
+            user_id: ID do autor
+            text: Texto da mensagem
+            notify_channel: Canal do LISTEN/NOTIFY avisado na mesma transação (opcional)
+            
+        Returns:
+            Lista de tuplas (group_id, message_id)
+        """
+        query = """
+        INSERT INTO messages (group_id, user_id, text)
+        SELECT id, %s, %s
+        FROM groups
+        WHERE closed_at IS NULL
+        RETURNING id, group_id
+        """
+        if notify_channel:
+            query = with_notify(query, notify_channel)
+        rows = self._execute_returning(query, (user_id, text), compact=True)
+        return [(row.group_id, row.id) for row in rows]
+    
+    def get_message_by_id(self, message_id: int) -> Optional[Dict[str, Any]]:
+        """Busca uma mensagem pelo ID, com os dados do autor"""
+        query = """
+        SELECT m.*, u.username, u.first_name, u.last_name 
+        FROM messages m
+        JOIN users u ON m.user_id = u.id
+        WHERE m.id = %s
+        """
+        results = self._execute_query(query, (message_id,))
+        return results[0] if results else None
     
     def get_group_messages(self, group_id: int, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
         """
@@ -49,4 +131,128 @@ class MessagePersistence(BasePersistence, MessageDAO):
         ORDER BY m.created_at DESC
         LIMIT %s OFFSET %s
         """
-        return self._execute_query(query, (group_id, limit, offset))
\ No newline at end of file
+        return self._execute_query(query, (group_id, limit, offset), prepared='group_messages')
+    
+    def get_group_messages_after(self, group_id: int, after_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Busca apenas as mensagens de um grupo mais novas que o último ID visto pelo cliente
+        
+        Args:
+            group_id: ID do grupo
+            after_id: ID da última mensagem conhecida pelo cliente
+            limit: Número máximo de mensagens a retornar
+            
+        Returns:
+            Lista das mensagens seguintes a after_id (mais antigas primeiro); se houver mais que limit,
+            o cliente continua a partir do maior ID recebido, sem pular nenhuma
+        """
+        query = """
+        SELECT m.*, u.username, u.first_name, u.last_name 
+        FROM messages m
+        JOIN users u ON m.user_id = u.id
+        WHERE m.group_id = %s AND m.id > %s
+        ORDER BY m.id ASC
+        LIMIT %s
+        """
+        return self._execute_query(query, (group_id, after_id, limit), prepared='group_messages_after')
+    
+    def get_group_messages_before(self, group_id: int, before_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Busca as mensagens de um grupo anteriores a um ID (histórico)
+        
+        Args:
+            group_id: ID do grupo
+            before_id: ID da mensagem mais antiga já carregada pelo cliente
+            limit: Número máximo de mensagens a retornar
+            
+        Returns:
+            Lista de mensagens com ID menor que before_id (mais recentes primeiro)
+        """
+        query = """
+        SELECT m.*, u.username, u.first_name, u.last_name 
+        FROM messages m
+        JOIN users u ON m.user_id = u.id
+        WHERE m.group_id = %s AND m.id < %s
+        ORDER BY m.id DESC
+        LIMIT %s
+        """
+        return self._execute_query(query, (group_id, before_id, limit))
+    
+    def get_latest_message_id(self, group_id: int) -> Optional[int]:
+        """
+        Retorna o ID da mensagem mais recente de um grupo
+        
+        Args:
+            group_id: ID do grupo
+            
+        Returns:
+            ID da última mensagem ou None se o grupo não tiver mensagens
+        """
+        query = "SELECT MAX(id) AS latest_id FROM messages WHERE group_id = %s"
+        result = self._execute_query(query, (group_id,), prepared='latest_message_id')
+        return result[0]['latest_id'] if result else None
+    
+    def get_group_messages_page(self, group_id: int, cursor: Optional[Tuple[datetime, int]] = None,
+                                limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, int]]]:
+        """
+        Busca uma página do histórico de um grupo usando paginação por chave (keyset)
+        
+        Args:
+            group_id: ID do grupo
+            cursor: Par (created_at, id) da última mensagem da página anterior, ou None para a primeira página
+            limit: Número máximo de mensagens a retornar
+            
+        Returns:
+            Tupla (mensagens, próximo cursor); o cursor é None quando não há mais páginas
+        """
+        if cursor is None:
+            query = """
+            SELECT m.*, u.username, u.first_name, u.last_name 
+            FROM messages m
+            JOIN users u ON m.user_id = u.id
+            WHERE m.group_id = %s
+            ORDER BY m.created_at DESC, m.id DESC
+            LIMIT %s
+            """
+            params = (group_id, limit + 1)
+        else:
+            query = """
+            SELECT m.*, u.username, u.first_name, u.last_name 
+            FROM messages m
+            JOIN users u ON m.user_id = u.id
+            WHERE m.group_id = %s AND (m.created_at, m.id) < (%s, %s)
+            ORDER BY m.created_at DESC, m.id DESC
+            LIMIT %s
+            """
+            params = (group_id, cursor[0], cursor[1], limit + 1)
+
+        messages = self._execute_query(query, params)
+        if len(messages) <= limit:
+            return messages, None
+
+        messages = messages[:limit]
+        last = messages[-1]
+        return messages, (last['created_at'], last['id'])
+
+    @staticmethod
+    def encode_cursor(cursor: Optional[Tuple[datetime, int]]) -> Optional[str]:
+        """Converte um cursor (created_at, id) em um token opaco para a API"""
+        if cursor is None:
+            return None
+        created_at, message_id = cursor
+        payload = json.dumps({"t": created_at.isoformat(), "i": message_id})
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(token: str) -> Tuple[datetime, int]:
+        """
+        Converte um token opaco da API de volta em um cursor (created_at, id)
+        
+        Raises:
+            ValueError: se o token for inválido
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            return datetime.fromisoformat(payload["t"]), int(payload["i"])
+        except Exception as e:
+            raise ValueError(f"Cursor inválido: {token}") from e
\ No newline at end of file
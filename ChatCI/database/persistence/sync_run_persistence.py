@@ -0,0 +1,57 @@
+from typing import List, Dict, Any, Optional
+from .base_persistence import BasePersistence
+import logging
+from datetime import datetime
+from ..dao.sync_run_dao import SyncRunDAO
+
+logger = logging.getLogger('sync_run_dao')
+
+class SyncRunPersistence(BasePersistence, SyncRunDAO):
+    """DAO para o histórico de execuções da sincronização com o SACI"""
+    
+    def record_run(self, trigger: str, status: str, started_at: datetime, duration_ms: int,
+                   result: Optional[Dict[str, Any]] = None, error: str = None) -> int:
+        """
+        Registra uma execução da sincronização
+        
+        Args:
+            trigger: Origem da execução ('scheduled' ou 'manual')
+            status: 'succeeded', 'failed' ou 'skipped'
+            started_at: Início da execução
+            duration_ms: Duração em milissegundos
+            result: Resultado da integração (contagens e erros)
+            error: Mensagem da exceção, se houve
+            
+        Returns:
+            ID do registro criado
+        """
+        result = result or {}
+        errors = result.get('errors') or 0
+        query = """
+        INSERT INTO saci_sync_runs
+            (trigger, status, started_at, duration_ms, turmas_found, groups_created,
+             groups_updated, groups_closed, errors, error_message)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING id
+        """
+        return self._execute_insert_returning_id(query, (
+            trigger, status, started_at, duration_ms,
+            result.get('turmas_found', 0), result.get('groups_created', 0),
+            result.get('groups_updated', 0), result.get('groups_closed', 0),
+            errors if isinstance(errors, int) else len(errors), error
+        ))
+    
+    def get_last_run(self, status: str = None) -> Optional[Dict[str, Any]]:
+        """Busca a execução mais recente, opcionalmente filtrando pelo status"""
+        if status:
+            query = "SELECT * FROM saci_sync_runs WHERE status = %s ORDER BY started_at DESC LIMIT 1"
+            results = self._execute_query(query, (status,))
+        else:
+            query = "SELECT * FROM saci_sync_runs ORDER BY started_at DESC LIMIT 1"
+            results = self._execute_query(query)
+        return results[0] if results else None
+    
+    def get_recent_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Busca as execuções mais recentes"""
+        query = "SELECT * FROM saci_sync_runs ORDER BY started_at DESC LIMIT %s"
+        return self._execute_query(query, (limit,))
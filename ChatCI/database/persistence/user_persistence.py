@@ -1,10 +1,10 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from .base_persistence import BasePersistence
-import hashlib
 import secrets
 import logging
 from datetime import datetime, timedelta
 from ..dao.user_dao import UserDAO
+from services.password_hasher import PasswordHasher
 
 logger = logging.getLogger('user_dao')
 
@@ -16,7 +16,7 @@ class UserPersistence(BasePersistence, UserDAO):
     
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         query = "SELECT * FROM users WHERE email = %s"
-        results = self._execute_query(query, (email,))
+        results = self._execute_query(query, (email,), prepared='user_by_email')
         return results[0] if results else None
     
     def get_user_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
@@ -28,6 +28,74 @@ class UserPersistence(BasePersistence, UserDAO):
         query = "SELECT * FROM users ORDER BY id"
         return self._execute_query(query)
     
+    def get_professor_by_name(self, first_name: str, last_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca um professor pelo nome, sem diferenciar maiúsculas/minúsculas
+        (usa o índice em lower(first_name), lower(last_name))
+        """
+        query = """
+        SELECT id, username, first_name, last_name, email
+        FROM users
+        WHERE professor AND lower(first_name) = lower(%s) AND lower(last_name) = lower(%s)
+        ORDER BY id
+        LIMIT 1
+        """
+        results = self._execute_query(query, (first_name, last_name))
+        return results[0] if results else None
+    
+    def get_professors_by_names(self, names: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Resolve vários nomes de professores numa única consulta
+        
+        Args:
+            names: Lista de tuplas (first_name, last_name)
+            
+        Returns:
+            Dicionário {(first_name, last_name): professor} apenas com os nomes encontrados
+        """
+        if not names:
+            return {}
+
+        query = """
+        SELECT DISTINCT ON (n.first_name, n.last_name)
+            n.first_name AS searched_first_name, n.last_name AS searched_last_name,
+            u.id, u.username, u.first_name, u.last_name, u.email
+        FROM unnest(%s::text[], %s::text[]) AS n (first_name, last_name)
+        JOIN users u
+            ON lower(u.first_name) = lower(n.first_name)
+            AND lower(u.last_name) = lower(n.last_name)
+        WHERE u.professor
+        ORDER BY n.first_name, n.last_name, u.id
+        """
+        first_names = [first_name for first_name, _ in names]
+        last_names = [last_name for _, last_name in names]
+        professors = {}
+        for row in self._execute_query(query, (first_names, last_names)):
+            key = (row.pop('searched_first_name'), row.pop('searched_last_name'))
+            professors[key] = row
+        return professors
+    
+    def get_users_without_system_messages(self, system_group_prefix: str) -> List[Dict[str, Any]]:
+        """
+        Retorna os usuários que ainda não receberam nenhuma mensagem do sistema:
+        os que não têm grupo de sistema e os que têm o grupo vazio
+        
+        Args:
+            system_group_prefix: Prefixo do nome do grupo de sistema (seguido do username)
+            
+        Returns:
+            Lista com id, username e system_group_id (None se o grupo ainda não existe)
+        """
+        query = """
+        SELECT u.id, u.username, g.id AS system_group_id
+        FROM users u
+        LEFT JOIN groups g ON g.name = %s || u.username
+        WHERE g.id IS NULL
+           OR NOT EXISTS (SELECT 1 FROM messages m WHERE m.group_id = g.id)
+        ORDER BY u.id
+        """
+        return self._execute_query(query, (system_group_prefix,))
+    
     # first_name: 20 caracteres
     # last_name: 30 caracteres
     # email: @ci.ufpb.br ou @academico.ufpb.br ou @di.ufpb.br
@@ -54,15 +122,8 @@ class UserPersistence(BasePersistence, UserDAO):
             verification_token = secrets.token_urlsafe(32)
             token_expires = datetime.now() + timedelta(days=1)
 
-        salt = secrets.token_hex(8)
-        hashed_password = hashlib.pbkdf2_hmac(
-            'sha256', 
-            password.encode('utf-8'), 
-            salt.encode('utf-8'), 
-            150000
-        ).hex()
-        
-        django_password = f"pbkdf2_sha256$150000${salt}${hashed_password}"
+        # PBKDF2 no executor limitado (PasswordHasherBusyError se estiver cheio)
+        django_password = PasswordHasher().hash_password(password)
         
         query = """
             INSERT INTO users (
@@ -98,15 +159,7 @@ class UserPersistence(BasePersistence, UserDAO):
         
         # Se estiver atualizando a senha, hashear
         if 'password' in fields:
-            salt = secrets.token_hex(8)
-            hashed_password = hashlib.pbkdf2_hmac(
-                'sha256', 
-                fields['password'].encode('utf-8'), 
-                salt.encode('utf-8'), 
-                150000
-            ).hex()
-            
-            fields['password'] = f"pbkdf2_sha256$150000${salt}${hashed_password}"
+            fields['password'] = PasswordHasher().hash_password(fields['password'])
 
         set_clauses = []
         params = []
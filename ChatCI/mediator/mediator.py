@@ -1,5 +1,7 @@
 from interface.interfaces import IMediator, IComponent
-from commands.commands import ScrapeCommand, CreateGroupCommand, SendMessageCommand
+from commands.commands import ScrapeCommand, CreateGroupsCommand, SyncGroupsCommand, SendMessageCommand, SendMessagesCommand
+from services.message_broker import MessageNotifier
+from config.settings import SACI_URL
 from typing import Dict, Any, List
 import logging
 
@@ -10,10 +12,12 @@ class Mediator(IMediator):
         self.components = {}
         self.group_dao = None
         self.message_dao = None
+        self.message_notifier = None
     
     def set_daos(self, group_dao, message_dao):
         self.group_dao = group_dao
         self.message_dao = message_dao
+        self.message_notifier = MessageNotifier(message_dao)
     
     def register_component(self, name: str, component: IComponent):
         self.components[name] = component
@@ -24,16 +28,20 @@ class Mediator(IMediator):
             return self._handle_scrape(data)
         elif event == "CREATE_GROUPS":
             return self._handle_create_groups(data)
+        elif event == "SYNC_GROUPS":
+            return self._handle_sync_groups(data)
         elif event == "SEND_MESSAGE":
             return self._handle_send_message(data)
+        elif event == "SEND_MESSAGES":
+            return self._handle_send_messages(data)
         elif event == "RUN_INTEGRATION":
-            return self._handle_integration()
+            return self._handle_integration(data or {})
         else:
             logger.warning(f"Unknown event: {event}")
             return None
     
     def _handle_scrape(self, data: Dict) -> List[Dict]:
-        url = data.get('url', 'https://sa.ci.ufpb.br/salas/ci')
+        url = data.get('url', SACI_URL)
         command = ScrapeCommand(url)
         return command.execute()
     
@@ -41,43 +49,94 @@ class Mediator(IMediator):
         turmas = data.get('turmas', [])
         results = {"created": 0, "existing": 0, "errors": 0}
         
-        for turma in turmas:
-            try:
-                command = CreateGroupCommand(self.group_dao, turma)
-                result = command.execute()
-                
-                if result["status"] == "created":
-                    results["created"] += 1
-                    self.notify("SEND_MESSAGE", {
-                        "group_id": result["group_id"],
-                        "user_id": 1,
-                        "text": f"Bem-vindos ao grupo da disciplina {turma['nome']}!"
-                    })
-                else:
-                    results["existing"] += 1
-            except Exception as e:
-                logger.error(f"Error creating group: {e}")
-                results["errors"] += 1
+        try:
+            command = CreateGroupsCommand(self.group_dao, turmas)
+            result = command.execute()
+        except Exception as e:
+            logger.error(f"Error creating groups: {e}")
+            results["errors"] = len(turmas)
+            return results
+        
+        results["created"] = len(result["created"])
+        results["existing"] = len(result["existing"])
+        self._send_welcome_messages(result["created"])
+        
+        return results
+    
+    def _handle_sync_groups(self, data: Dict) -> Dict:
+        turmas = data.get('turmas', [])
+        results = {"created": 0, "existing": 0, "updated": 0, "closed": 0, "unchanged": 0,
+                   "changes": [], "errors": 0}
+        
+        try:
+            command = SyncGroupsCommand(self.group_dao, turmas)
+            result = command.execute()
+        except Exception as e:
+            logger.error(f"Error syncing groups: {e}")
+            results["errors"] = len(turmas)
+            return results
+        
+        results["created"] = len(result["created"])
+        results["existing"] = len(result["existing"]) + result["unchanged"]
+        results["updated"] = len(result["updated"])
+        results["closed"] = result["closed"]
+        results["unchanged"] = result["unchanged"]
+        results["changes"] = result["changes"]
+        logger.info(
+            f"SACI sync: {results['created']} created, {results['updated']} updated, "
+            f"{results['closed']} closed, {results['unchanged']} unchanged"
+        )
+        self._send_welcome_messages(result["created"])
         
         return results
     
+    def _send_welcome_messages(self, groups: List[Dict]):
+        welcome_messages = [{
+            "group_id": group["id"],
+            "user_id": 1,
+            "text": f"Bem-vindos ao grupo da disciplina {group['turma']['nome']}!"
+        } for group in groups]
+        
+        if welcome_messages:
+            try:
+                self.notify("SEND_MESSAGES", {"messages": welcome_messages})
+            except Exception as e:
+                logger.error(f"Error sending welcome messages: {e}")
+    
     def _handle_send_message(self, data: Dict) -> int:
         command = SendMessageCommand(
             self.message_dao,
             data['group_id'],
             data['user_id'],
-            data['text']
+            data['text'],
+            self.message_notifier
         )
         return command.execute()
     
-    def _handle_integration(self) -> Dict:
-        turmas = self.notify("SCRAPE_SACI", {"url": "https://sa.ci.ufpb.br/salas/ci"})
+    def _handle_send_messages(self, data: Dict) -> List[int]:
+        command = SendMessagesCommand(
+            self.message_dao,
+            data['messages'],
+            self.message_notifier
+        )
+        return command.execute()
+    
+    def _handle_integration(self, data: Dict) -> Dict:
+        progress = data.get('progress') or (lambda phase, value: None)
+
+        progress("scraping", 0.1)
+        turmas = self.notify("SCRAPE_SACI", {"url": SACI_URL})
         
-        results = self.notify("CREATE_GROUPS", {"turmas": turmas})
+        progress("syncing_groups", 0.6)
+        results = self.notify("SYNC_GROUPS", {"turmas": turmas})
         
         return {
             "turmas_found": len(turmas),
             "groups_created": results["created"],
             "groups_existing": results["existing"],
+            "groups_updated": results["updated"],
+            "groups_closed": results["closed"],
+            "groups_unchanged": results["unchanged"],
+            "changes": results["changes"],
             "errors": results["errors"]
         }
\ No newline at end of file
@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+from datetime import datetime
+from config.settings import JOB_WORKERS, JOB_HISTORY_SIZE
+import threading
+import uuid
+import logging
+
+logger = logging.getLogger('job_manager')
+
+class Job:
+    """Estado de um job em segundo plano, consultado pelo endpoint de status"""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = Job.QUEUED
+        self.phase = None
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in (Job.QUEUED, Job.RUNNING)
+
+    def update_progress(self, phase: str, progress: float):
+        self.phase = phase
+        self.progress = progress
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "phase": self.phase,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class JobManager:
+    """
+    Classe Singleton que executa jobs num pool de threads.
+    Só existe um job ativo por tipo: submeter de novo enquanto ele roda devolve o mesmo job.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(JobManager, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, max_workers: int = None, history_size: int = None):
+        if self._initialized:
+            return
+        self.history_size = history_size if history_size is not None else JOB_HISTORY_SIZE
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers if max_workers is not None else JOB_WORKERS,
+            thread_name_prefix='job'
+        )
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active_by_kind: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._initialized = True
+
+    def submit(self, kind: str, func: Callable[[Callable[[str, float], None]], Any]) -> Tuple[Job, bool]:
+        """
+        Agenda func para rodar em segundo plano. func recebe uma função progress(phase, progress).
+        
+        Returns:
+            Tupla (job, criado); criado é False quando já havia um job ativo do mesmo tipo
+        """
+        with self._lock:
+            active = self._active_by_kind.get(kind)
+            if active is not None and active.active:
+                return active, False
+
+            job = Job(kind)
+            self._jobs[job.id] = job
+            self._active_by_kind[kind] = job
+            self._trim_history()
+
+        self._executor.submit(self._run, job, func)
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: Job, func: Callable):
+        job.status = Job.RUNNING
+        job.started_at = datetime.now()
+        try:
+            job.result = func(job.update_progress)
+            job.status = Job.SUCCEEDED
+            job.update_progress('done', 1.0)
+        except Exception as e:
+            logger.error(f"Job {job.kind} ({job.id}) falhou: {e}")
+            job.error = str(e)
+            job.status = Job.FAILED
+        finally:
+            job.finished_at = datetime.now()
+
+    def _trim_history(self):
+        while len(self._jobs) > self.history_size:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.active:
+                break
+            del self._jobs[oldest_id]
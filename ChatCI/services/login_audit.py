@@ -0,0 +1,174 @@
+from typing import List, Dict, Any, Iterator
+from itertools import islice
+from business.login_event import (LoginEvent, SUCCESS, LOGIN_LOG_FILE, LOGIN_LOG_IMPORTING_FILE,
+                                  LEGACY_HTML_LOG_FILES, iter_login_log, iter_html_login_log)
+from business.login_txt_report_generator import LoginTxtReportGenerator
+from database.manager import DatabaseManager
+from database.persistence.login_event_persistence import LoginEventPersistence
+from config.settings import (LOGIN_AUDIT_QUEUE_SIZE, LOGIN_AUDIT_BATCH_SIZE, LOGIN_AUDIT_FLUSH_SECONDS,
+                             LOGIN_IMPORT_LOCK_KEY)
+import atexit
+import os
+import queue
+import threading
+import logging
+
+logger = logging.getLogger('login_audit')
+
+class LoginAuditService:
+    """
+    Classe Singleton que tira o registro dos logins do caminho da requisição.
+    O login só enfileira um LoginEvent (sucesso ou falha); uma thread em segundo plano junta os eventos
+    em lotes e grava cada lote na tabela login_events numa única instrução, que também atualiza users.last_login.
+    Os relatórios HTML e PDF são gerados sob demanda a partir da tabela (endpoints de relatórios).
+    Se o banco estiver indisponível, os logins bem-sucedidos do lote vão para o log TXT para não se perderem;
+    esse log (e o histórico antigo em TXT/HTML) é importado para a tabela quando o escritor inicia
+    e depois de cada lote gravado com sucesso.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(LoginAuditService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, batch_size: int = None, flush_interval: float = None):
+        if self._initialized:
+            return
+        self.batch_size = batch_size or LOGIN_AUDIT_BATCH_SIZE
+        self.flush_interval = flush_interval or LOGIN_AUDIT_FLUSH_SECONDS
+        self._queue = queue.Queue(maxsize=LOGIN_AUDIT_QUEUE_SIZE)
+        self.login_event_dao = LoginEventPersistence()
+        self._lock = threading.Lock()
+        self._dropped = 0
+        self._written = 0
+        self._batches = 0
+        self._failed_batches = 0
+        self._imported = 0
+        self._writer = threading.Thread(target=self._run, name='login-audit-writer', daemon=True)
+        self._writer.start()
+        # Ao encerrar o processo, grava o que ainda estiver na fila
+        atexit.register(self._shutdown)
+        self._initialized = True
+
+    def record_login(self, user, ip: str = None):
+        """Enfileira o login; nunca bloqueia nem falha o login"""
+        self._enqueue(LoginEvent.from_user(user, ip=ip))
+
+    def record_failed_login(self, login: str, ip: str = None):
+        """Enfileira uma tentativa malsucedida (login é o e-mail ou username informado)"""
+        self._enqueue(LoginEvent.failed(login, ip))
+
+    def _enqueue(self, event: LoginEvent):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            logger.warning("Fila de auditoria de logins cheia, evento descartado")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Espera os eventos enfileirados serem gravados (ex.: antes de ler os relatórios)"""
+        # Mesma condição usada por Queue.join, que é notificada pelo task_done do último evento,
+        # mas com limite de tempo
+        done = self._queue.all_tasks_done
+        with done:
+            return done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def _shutdown(self):
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "written": self._written,
+                "batches": self._batches,
+                "dropped": self._dropped,
+                "failed_batches": self._failed_batches,
+                "imported": self._imported
+            }
+
+    def _run(self):
+        self._import_login_logs(legacy=True)
+        while True:
+            batch = self._next_batch()
+            if batch:
+                written = self._write(batch)
+                for _ in batch:
+                    self._queue.task_done()
+                # o banco voltou: traz de volta os logins que foram para o log TXT enquanto ele estava fora
+                if written and (os.path.exists(LOGIN_LOG_FILE) or os.path.exists(LOGIN_LOG_IMPORTING_FILE)):
+                    self._import_login_logs()
+
+    def _import_login_logs(self, legacy: bool = False):
+        """
+        Importa para login_events o log TXT (histórico antigo e fallback) e, com legacy, os relatórios HTML antigos.
+        O TXT é renomeado (LOGIN_LOG_IMPORTING_FILE) antes da leitura, para que novas falhas caiam num arquivo novo,
+        e apagado depois; se a importação falhar, o arquivo renomeado fica para a próxima tentativa
+        (logins já importados são ignorados). Os HTML são renomeados para .imported.
+        """
+        try:
+            with DatabaseManager().advisory_lock(LOGIN_IMPORT_LOCK_KEY) as acquired:
+                if not acquired:
+                    return
+                if legacy:
+                    for path in LEGACY_HTML_LOG_FILES:
+                        if os.path.exists(path):
+                            self._import_events(path, iter_html_login_log(path))
+                            os.replace(path, path + '.imported')
+
+                # duas passadas: o que sobrou de uma importação interrompida e o log TXT atual
+                for _ in range(2):
+                    if not os.path.exists(LOGIN_LOG_IMPORTING_FILE):
+                        if not os.path.exists(LOGIN_LOG_FILE):
+                            break
+                        os.replace(LOGIN_LOG_FILE, LOGIN_LOG_IMPORTING_FILE)
+                    self._import_events(LOGIN_LOG_FILE, iter_login_log(LOGIN_LOG_IMPORTING_FILE))
+                    os.remove(LOGIN_LOG_IMPORTING_FILE)
+        except Exception as e:
+            logger.error(f"Erro ao importar os logs de login para o banco: {e}")
+
+    def _import_events(self, source: str, events: Iterator[LoginEvent]):
+        imported = 0
+        for chunk in iter(lambda: list(islice(events, self.batch_size)), []):
+            count = self.login_event_dao.import_login_history([(event.username, event.timestamp) for event in chunk])
+            imported += count
+            with self._lock:
+                self._imported += count
+        if imported:
+            logger.info(f"{imported} logins importados de {source}")
+
+    def _write(self, batch: List[LoginEvent]) -> bool:
+        """Grava o lote no banco; retorna False se ele precisou ir para o log TXT"""
+        try:
+            written = self.login_event_dao.record_events([event.to_row() for event in batch])
+            with self._lock:
+                self._written += written
+                self._batches += 1
+            return True
+        except Exception as e:
+            with self._lock:
+                self._failed_batches += 1
+            logger.error(f"Erro ao gravar {len(batch)} logins no banco: {e}")
+            successes = [event for event in batch if event.outcome == SUCCESS]
+            try:
+                if successes:
+                    LoginTxtReportGenerator().generateReport(successes)
+            except Exception as e:
+                logger.error(f"Erro ao gravar {len(successes)} logins no log TXT: {e}")
+            return False
+
+    def _next_batch(self) -> List[LoginEvent]:
+        """Espera o primeiro evento por até flush_interval e junta os que já estiverem na fila"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
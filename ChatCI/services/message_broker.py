@@ -0,0 +1,166 @@
+from typing import Dict, Any, Set, List, Tuple, Optional
+from database.manager import DatabaseManager
+from config.settings import MESSAGE_PUSH_BACKEND, MESSAGE_NOTIFY_CHANNEL
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+import json
+import queue
+import select
+import threading
+import logging
+
+logger = logging.getLogger('message_broker')
+
+# Colocado nas filas dos inscritos quando os membros/banidos do grupo mudam, para que cada stream
+# confira de novo se o seu usuário ainda tem acesso
+MEMBERSHIP_CHANGED = object()
+
+class MessageBroker:
+    """
+    Classe Singleton que distribui mensagens novas para os clientes inscritos em cada grupo.
+    Cada inscrição é uma fila; o endpoint de streaming consome a fila do seu cliente.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(MessageBroker, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, max_queue_size: int = 100):
+        if self._initialized:
+            return
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[int, Set[queue.Queue]] = {}
+        self._lock = threading.Lock()
+        self._initialized = True
+
+    def subscribe(self, group_id: int) -> queue.Queue:
+        """Inscreve um cliente no grupo e retorna a fila onde as mensagens chegarão"""
+        subscription = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers.setdefault(group_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, group_id: int, subscription: queue.Queue):
+        """Remove a inscrição de um cliente"""
+        with self._lock:
+            subscribers = self._subscribers.get(group_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[group_id]
+
+    def subscriber_count(self, group_id: int) -> int:
+        with self._lock:
+            return len(self._subscribers.get(group_id, ()))
+
+    def membership_changed(self, group_id: int):
+        """Acorda os streams do grupo para reavaliarem o acesso (registrado como listener do MembershipCache)"""
+        self.publish(group_id, MEMBERSHIP_CHANGED)
+
+    def publish(self, group_id: int, message: Dict[str, Any]):
+        """Entrega a mensagem para todos os inscritos do grupo"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(group_id, ()))
+
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(message)
+            except queue.Full:
+                # Cliente lento: descarta, ele recupera o atraso pelo polling com after_id
+                logger.warning(f"Fila de streaming cheia no grupo {group_id}, mensagem descartada")
+
+
+class MessageNotifier:
+    """
+    Avisa que uma mensagem foi criada.
+    Com o backend 'postgres' o NOTIFY sai na própria transação do INSERT (os DAOs recebem
+    transaction_channel) e é entregue a todas as réplicas pelo listener no commit;
+    com o backend 'memory' publica direto no broker do processo depois da inserção.
+    """
+    def __init__(self, message_dao, backend: str = MESSAGE_PUSH_BACKEND, channel: str = MESSAGE_NOTIFY_CHANNEL):
+        self.message_dao = message_dao
+        self.backend = backend
+        self.channel = channel
+        self.broker = MessageBroker()
+
+    @property
+    def transaction_channel(self) -> Optional[str]:
+        """Canal a passar como notify_channel nas inserções de mensagens (None se não houver NOTIFY)"""
+        return self.channel if self.backend == 'postgres' else None
+
+    def message_created(self, group_id: int, message_id: int):
+        self.messages_created([(group_id, message_id)])
+
+    def messages_created(self, messages: List[Tuple[int, int]]):
+        """Publica no broker local as mensagens criadas; recebe tuplas (group_id, message_id)"""
+        if self.backend == 'postgres':
+            # já notificadas no commit da inserção
+            return
+        try:
+            for group_id, message_id in messages:
+                if self.broker.subscriber_count(group_id) > 0:
+                    message = self.message_dao.get_message_by_id(message_id)
+                    if message:
+                        self.broker.publish(group_id, message)
+        except Exception as e:
+            # A mensagem já foi salva; falhar a notificação não deve falhar o envio
+            logger.error(f"Erro ao notificar {len(messages)} novas mensagens: {e}")
+
+
+class MessageNotificationListener(threading.Thread):
+    """
+    Thread com uma única conexão dedicada fazendo LISTEN no canal de mensagens.
+    Cada NOTIFY recebido é carregado uma vez do banco e repassado ao MessageBroker.
+    """
+    def __init__(self, message_dao, channel: str = MESSAGE_NOTIFY_CHANNEL,
+                 poll_timeout: float = 5.0, reconnect_delay: float = 5.0):
+        super().__init__(name='message-notification-listener', daemon=True)
+        self.message_dao = message_dao
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self.broker = MessageBroker()
+        self.db_manager = DatabaseManager()
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            connection = None
+            try:
+                connection = self.db_manager.create_dedicated_connection()
+                connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                logger.info(f"Escutando notificações no canal {self.channel}")
+
+                while not self._stop_event.is_set():
+                    if select.select([connection], [], [], self.poll_timeout) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notification = connection.notifies.pop(0)
+                        self._dispatch(notification.payload)
+            except Exception as e:
+                logger.error(f"Erro no listener de mensagens, reconectando: {e}")
+                self._stop_event.wait(self.reconnect_delay)
+            finally:
+                if connection:
+                    connection.close()
+
+    def _dispatch(self, payload: str):
+        try:
+            data = json.loads(payload)
+            group_id = data['group_id']
+            if self.broker.subscriber_count(group_id) == 0:
+                return
+            message = self.message_dao.get_message_by_id(data['message_id'])
+            if message:
+                self.broker.publish(group_id, message)
+        except Exception as e:
+            logger.error(f"Erro ao processar notificação {payload}: {e}")
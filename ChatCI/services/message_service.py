@@ -1,11 +1,16 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from database.persistence.message_persistence import MessagePersistence
 from database.persistence.group_persistence import GroupPersistence
 from database.factory.user_dao_factory import UserDAOFactory
+from services.message_broker import MessageNotifier
 import logging
 
 logger = logging.getLogger('message_service')
 
+SYSTEM_USER_ID = 1
+SYSTEM_GROUP_PREFIX = "Mensagens do Sistema - "
+BROADCAST_BATCH_SIZE = 1000
+
 class MessageService:
     """Serviço simplificado para gerenciamento de mensagens"""
     
@@ -13,6 +18,7 @@ class MessageService:
         self.message_dao = MessagePersistence()
         self.group_dao = GroupPersistence()
         self.user_dao = UserDAOFactory.get_instance()
+        self.notifier = MessageNotifier(self.message_dao)
     
     def send_message_to_group(self, group_id: int, user_id: int, text: str) -> int:
         """Envia uma mensagem para um grupo"""
@@ -23,6 +29,10 @@ class MessageService:
         if self.group_dao.is_banned(group_id, user_id):
             logger.warning(f"Usuário {user_id} está banido do grupo {group_id}")
             return None
+
+        if self.group_dao.is_closed(group_id):
+            logger.warning(f"Grupo {group_id} está encerrado")
+            return None
         
         return self.message_dao.create_message(group_id, user_id, text)
     
@@ -35,5 +45,88 @@ class MessageService:
         
         welcome_message = f"Bem-vindos ao grupo {group['name']}!"
 
-        system_user_id = 1
-        self.message_dao.create_message(group_id, system_user_id, welcome_message)
\ No newline at end of file
+        self.message_dao.create_message(group_id, SYSTEM_USER_ID, welcome_message)
+    
+    def send_messages(self, messages: List[Tuple[int, int, str]]) -> List[int]:
+        """Envia várias mensagens (group_id, user_id, text) numa única inserção em lote"""
+        message_ids = self.message_dao.create_messages(messages, notify_channel=self.notifier.transaction_channel)
+        self.notifier.messages_created(
+            [(group_id, message_id) for (group_id, _, _), message_id in zip(messages, message_ids)]
+        )
+        return message_ids
+    
+    def send_group_welcome_messages(self, groups: List[Dict[str, Any]]) -> List[int]:
+        """Envia a mensagem de boas-vindas para vários grupos novos de uma vez"""
+        return self.send_messages([
+            (group['id'], SYSTEM_USER_ID, f"Bem-vindos ao grupo {group['name']}!")
+            for group in groups
+        ])
+    
+    def broadcast_message_to_all_groups(self, user_id: int, text: str) -> List[int]:
+        """
+        Envia a mesma mensagem para todos os grupos abertos numa única instrução INSERT ... SELECT:
+        ou todos os grupos recebem a mensagem ou nenhum, e a lista de grupos não passa pela aplicação.
+        Com o backend 'postgres' os NOTIFY saem no commit da própria instrução; com o 'memory'
+        a publicação local é feita depois, em lotes de BROADCAST_BATCH_SIZE.
+        """
+        created = self.message_dao.create_message_in_all_groups(
+            user_id, text, notify_channel=self.notifier.transaction_channel
+        )
+        for start in range(0, len(created), BROADCAST_BATCH_SIZE):
+            self.notifier.messages_created(created[start:start + BROADCAST_BATCH_SIZE])
+        return [message_id for _, message_id in created]
+    
+    def send_welcome_message_to_new_user(self, user_id: int):
+        """Envia a mensagem de boas-vindas no grupo de sistema de um usuário"""
+        user = self.user_dao.get_user_by_id(user_id)
+        if not user:
+            logger.error(f"Usuário {user_id} não encontrado")
+            return
+        self.send_welcome_messages_to_users([{"id": user['id'], "username": user['username'], "system_group_id": None}])
+    
+    def send_welcome_messages_to_new_users(self) -> int:
+        """
+        Envia boas-vindas a todos os usuários que ainda não têm mensagens do sistema.
+        O número de consultas é constante, independente da quantidade de usuários.
+        """
+        users = self.user_dao.get_users_without_system_messages(SYSTEM_GROUP_PREFIX)
+        return self.send_welcome_messages_to_users(users)
+    
+    def send_welcome_messages_to_users(self, users: List[Dict[str, Any]]) -> int:
+        """
+        Cria os grupos de sistema que faltam, garante o usuário como membro
+        e envia a mensagem de boas-vindas, tudo em lote
+        
+        Args:
+            users: Lista de dicionários com id, username e system_group_id (ou None)
+            
+        Returns:
+            Quantidade de mensagens enviadas
+        """
+        if not users:
+            return 0
+
+        system_group_ids = {user['id']: user['system_group_id'] for user in users}
+        missing = [user for user in users if not user['system_group_id']]
+        if missing:
+            names = {}
+            groups = []
+            for user in missing:
+                name = f"{SYSTEM_GROUP_PREFIX}{user['username']}"
+                names[name] = user['id']
+                groups.append((name, f"Mensagens do sistema para {user['username']}"))
+
+            created, existing = self.group_dao.create_groups(groups)
+            for group in created + existing:
+                system_group_ids[names[group['name']]] = group['id']
+
+        self.group_dao.add_members([
+            (group_id, user_id) for user_id, group_id in system_group_ids.items() if group_id
+        ])
+
+        usernames = {user['id']: user['username'] for user in users}
+        message_ids = self.send_messages([
+            (group_id, SYSTEM_USER_ID, f"Bem-vindo(a) ao ChatCI, {usernames[user_id]}!")
+            for user_id, group_id in system_group_ids.items() if group_id
+        ])
+        return len(message_ids)
\ No newline at end of file
@@ -0,0 +1,155 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any
+from config.settings import PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE, PASSWORD_HASH_TIMEOUT
+import bisect
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+import logging
+
+logger = logging.getLogger('password_hasher')
+
+PBKDF2_ALGORITHM = 'pbkdf2_sha256'
+PBKDF2_ITERATIONS = 150000
+
+# Limites (em ms) dos buckets do histograma de duração do hash
+HASH_BUCKETS_MS = [10, 50, 100, 250, 500, 1000, 2500, 5000]
+
+class PasswordHasherBusyError(Exception):
+    """Todos os workers estão ocupados e a fila de hashing está cheia; o cliente deve tentar de novo"""
+
+class PasswordHasher:
+    """
+    Classe Singleton que executa o PBKDF2 (150000 iterações) num pool de threads de tamanho fixo.
+    O pbkdf2_hmac libera o GIL, então os workers usam núcleos de verdade, mas no máximo
+    max_workers ao mesmo tempo: uma rajada de logins não ocupa todas as threads do servidor.
+    Além dos workers, só max_queue hashes podem esperar na fila; acima disso a chamada
+    falha na hora com PasswordHasherBusyError (a API responde 429).
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(PasswordHasher, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, max_workers: int = None, max_queue: int = None, timeout: float = None):
+        if self._initialized:
+            return
+        self.max_workers = max_workers if max_workers is not None else PASSWORD_HASH_WORKERS
+        self.max_queue = max_queue if max_queue is not None else PASSWORD_HASH_QUEUE_SIZE
+        self.timeout = timeout if timeout is not None else PASSWORD_HASH_TIMEOUT
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pbkdf2')
+        # Uma vaga por hash em execução ou na fila; devolvida quando o hash termina
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed_total = 0
+        self._rejected_total = 0
+        self._timeouts_total = 0
+        self._hash_total_ms = 0.0
+        self._wait_total_ms = 0.0
+        self._hash_buckets = [0] * (len(HASH_BUCKETS_MS) + 1)
+        self._initialized = True
+
+    def hash_password(self, password: str) -> str:
+        """
+        Gera o hash da senha no formato do Django (algoritmo$iterações$salt$hash)
+        
+        Raises:
+            PasswordHasherBusyError: Se não houver vaga no executor
+        """
+        salt = secrets.token_hex(8)
+        hashed = self._submit(password, salt, PBKDF2_ITERATIONS)
+        return f"{PBKDF2_ALGORITHM}${PBKDF2_ITERATIONS}${salt}${hashed}"
+
+    def verify_password(self, password: str, encoded: str) -> bool:
+        """
+        Confere a senha com o hash armazenado, usando o mesmo salt e número de iterações
+        
+        Raises:
+            PasswordHasherBusyError: Se não houver vaga no executor
+        """
+        partes = encoded.split('$')
+        if len(partes) != 4:
+            return False
+
+        _, iteracoes, salt, hash_armazenado = partes
+        hash_calculado = self._submit(password, salt, int(iteracoes))
+        return hmac.compare_digest(hash_calculado, hash_armazenado)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed_total
+            buckets = {f"le_{limit}ms": count for limit, count in zip(HASH_BUCKETS_MS, self._hash_buckets)}
+            buckets["gt_5000ms"] = self._hash_buckets[-1]
+            return {
+                "workers": self.max_workers,
+                "queue_limit": self.max_queue,
+                "queued": self._queued,
+                "running": self._running,
+                "completed_total": completed,
+                "rejected_total": self._rejected_total,
+                "timeouts_total": self._timeouts_total,
+                "hash_avg_ms": round(self._hash_total_ms / completed, 3) if completed else 0.0,
+                "queue_wait_avg_ms": round(self._wait_total_ms / completed, 3) if completed else 0.0,
+                "hash_histogram": buckets
+            }
+
+    def _submit(self, password: str, salt: str, iterations: int) -> str:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected_total += 1
+            logger.warning("Fila de hashing de senhas cheia, requisição rejeitada")
+            raise PasswordHasherBusyError("Servidor ocupado, tente novamente em instantes")
+
+        with self._lock:
+            self._queued += 1
+        try:
+            future = self._executor.submit(self._pbkdf2, password, salt, iterations, time.monotonic())
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+        # A vaga só volta quando o hash termina (ou é cancelado), mesmo que quem pediu desista antes
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                with self._lock:
+                    self._queued -= 1
+            with self._lock:
+                self._timeouts_total += 1
+            logger.warning(f"Hash de senha não concluído em {self.timeout}s")
+            raise PasswordHasherBusyError("Servidor ocupado, tente novamente em instantes")
+
+    def _release(self, future):
+        self._slots.release()
+
+    def _pbkdf2(self, password: str, salt: str, iterations: int, submitted_at: float) -> str:
+        started_at = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return hashlib.pbkdf2_hmac(
+                'sha256',
+                password.encode('utf-8'),
+                salt.encode('utf-8'),
+                iterations
+            ).hex()
+        finally:
+            hash_ms = (time.monotonic() - started_at) * 1000
+            with self._lock:
+                self._running -= 1
+                self._completed_total += 1
+                self._hash_total_ms += hash_ms
+                self._wait_total_ms += (started_at - submitted_at) * 1000
+                self._hash_buckets[bisect.bisect_left(HASH_BUCKETS_MS, hash_ms)] += 1
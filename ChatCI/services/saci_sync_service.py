@@ -0,0 +1,119 @@
+from typing import Dict, Any, Callable, Optional
+from datetime import datetime, timezone
+from database.manager import DatabaseManager
+from config.settings import (SACI_SYNC_INTERVAL_SECONDS, SACI_SYNC_RETRY_SECONDS, SACI_SYNC_MAX_BACKOFF_SECONDS,
+                             SACI_SYNC_LOCK_KEY)
+import threading
+import time
+import logging
+
+logger = logging.getLogger('saci_sync_service')
+
+class SaciSyncRunner:
+    """
+    Executa a integração com o SACI sob um advisory lock do Postgres, para que só uma réplica
+    sincronize por vez, e registra cada execução no histórico (saci_sync_runs).
+    """
+    def __init__(self, run_integration: Callable[[Callable[[str, float], None]], Dict[str, Any]], sync_run_dao,
+                 lock_key: int = SACI_SYNC_LOCK_KEY):
+        self.run_integration = run_integration
+        self.sync_run_dao = sync_run_dao
+        self.lock_key = lock_key
+        self.db_manager = DatabaseManager()
+
+    def run(self, trigger: str, progress: Callable[[str, float], None] = None,
+            min_interval: float = None) -> Dict[str, Any]:
+        """
+        Roda a integração e retorna o resultado dela, com 'skipped' indicando se outra
+        réplica já estava sincronizando (ou sincronizou há menos de min_interval segundos).
+        Exceções da integração são registradas no histórico e repassadas.
+        """
+        progress = progress or (lambda phase, value: None)
+
+        with self.db_manager.advisory_lock(self.lock_key) as acquired:
+            if not acquired:
+                logger.info("Sincronização SACI já em andamento em outra instância, pulando")
+                return {"skipped": True, "reason": "locked"}
+
+            if min_interval and self._ran_recently(min_interval):
+                logger.info("Sincronização SACI executada recentemente por outra instância, pulando")
+                return {"skipped": True, "reason": "recent"}
+
+            started_at = datetime.now(timezone.utc)
+            start = time.monotonic()
+            try:
+                result = self.run_integration(progress)
+            except Exception as e:
+                self._record(trigger, 'failed', started_at, start, error=str(e))
+                raise
+
+            status = 'failed' if is_failed_sync(result) else 'succeeded'
+            self._record(trigger, status, started_at, start, result=result)
+            return dict(result, skipped=False)
+
+    def _ran_recently(self, min_interval: float) -> bool:
+        last_run = self.sync_run_dao.get_last_run(status='succeeded')
+        if not last_run:
+            return False
+        elapsed = (datetime.now(timezone.utc) - last_run['started_at']).total_seconds()
+        return elapsed < min_interval
+
+    def _record(self, trigger: str, status: str, started_at: datetime, start: float,
+                result: Optional[Dict[str, Any]] = None, error: str = None):
+        duration_ms = int((time.monotonic() - start) * 1000)
+        try:
+            self.sync_run_dao.record_run(trigger, status, started_at, duration_ms, result, error)
+        except Exception as e:
+            # O histórico é informativo; não deve mascarar o resultado da sincronização
+            logger.error(f"Erro ao registrar execução da sincronização SACI: {e}")
+
+def is_failed_sync(result: Dict[str, Any]) -> bool:
+    """Scraping vazio ou com erros conta como falha para fins de backoff"""
+    return not result.get('turmas_found') or bool(result.get('errors'))
+
+class SaciSyncScheduler(threading.Thread):
+    """
+    Thread que roda a sincronização a cada intervalo. Em caso de falha tenta de novo
+    com backoff exponencial (retry_delay, 2x, 4x... até max_backoff), voltando ao
+    intervalo normal após a primeira execução bem-sucedida.
+    """
+    def __init__(self, runner: SaciSyncRunner, interval: float = SACI_SYNC_INTERVAL_SECONDS,
+                 retry_delay: float = SACI_SYNC_RETRY_SECONDS, max_backoff: float = SACI_SYNC_MAX_BACKOFF_SECONDS):
+        super().__init__(name='saci-sync-scheduler', daemon=True)
+        self.runner = runner
+        self.interval = interval
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def next_delay(self) -> float:
+        if self.failures == 0:
+            return self.interval
+        return min(self.retry_delay * 2 ** (self.failures - 1), self.max_backoff)
+
+    def run(self):
+        logger.info(f"Agendador da sincronização SACI iniciado (intervalo de {self.interval}s)")
+        delay = 0
+        while not self._stop_event.wait(delay):
+            self.run_once()
+            delay = self.next_delay()
+
+    def run_once(self):
+        try:
+            # Depois de falhas, não espera o intervalo de outra réplica para tentar de novo
+            min_interval = self.interval / 2 if self.failures == 0 else None
+            result = self.runner.run('scheduled', min_interval=min_interval)
+            if result.get('skipped'):
+                return
+            if is_failed_sync(result):
+                self.failures += 1
+                logger.warning(f"Sincronização SACI falhou ({self.failures}x seguidas): {result.get('errors')}")
+            else:
+                self.failures = 0
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Erro na sincronização SACI ({self.failures}x seguidas): {e}")
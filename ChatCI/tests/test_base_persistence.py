@@ -0,0 +1,25 @@
+import unittest
+from database.persistence.base_persistence import to_positional_params
+
+class ToPositionalParamsTest(unittest.TestCase):
+    """Conversão dos placeholders do psycopg2 para o texto do PREPARE"""
+
+    def test_numbers_placeholders_in_order(self):
+        self.assertEqual(
+            to_positional_params("SELECT * FROM messages WHERE group_id = %s AND id > %s LIMIT %s"),
+            "SELECT * FROM messages WHERE group_id = $1 AND id > $2 LIMIT $3"
+        )
+
+    def test_literal_percent_is_not_a_placeholder(self):
+        self.assertEqual(
+            to_positional_params("SELECT id FROM users WHERE email LIKE '%%s@ci.ufpb.br' AND id = %s"),
+            "SELECT id FROM users WHERE email LIKE '%s@ci.ufpb.br' AND id = $1"
+        )
+
+    def test_rejects_unsupported_placeholders(self):
+        for query in ("SELECT %(id)s", "SELECT 10 % 3"):
+            with self.assertRaises(ValueError):
+                to_positional_params(query)
+
+if __name__ == '__main__':
+    unittest.main()
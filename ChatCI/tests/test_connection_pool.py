@@ -0,0 +1,131 @@
+import threading
+import time
+import unittest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from database.connection_pool import ConnectionPool, PoolTimeoutError
+
+TRANSACTION_STATUS_INTRANS = 2
+
+class FakeInfo:
+    def __init__(self):
+        self.transaction_status = TRANSACTION_STATUS_IDLE
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.connection.pings += 1
+        if self.connection.broken:
+            raise Exception("server closed the connection unexpectedly")
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.pings = 0
+        self.rollbacks = 0
+        self.info = FakeInfo()
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+def new_pool(**kwargs) -> ConnectionPool:
+    options = dict(min_size=0, max_size=1, acquire_timeout=0.2, max_lifetime=0, pre_ping_after=60)
+    options.update(kwargs)
+    return ConnectionPool(FakeConnection, **options)
+
+class ConnectionPoolTest(unittest.TestCase):
+    """Pool de conexões com conexões falsas, sem banco"""
+
+    def test_reuses_returned_connection(self):
+        pool = new_pool()
+        connection = pool.getconn()
+        pool.putconn(connection)
+
+        self.assertIs(pool.getconn(), connection)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_times_out_when_every_connection_is_in_use(self):
+        pool = new_pool()
+        pool.getconn()
+
+        start = time.monotonic()
+        with self.assertRaises(PoolTimeoutError):
+            pool.getconn(timeout=0.1)
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        stats = pool.stats()
+        self.assertEqual(stats["timeouts_total"], 1)
+        self.assertEqual(stats["exhausted_total"], 1)
+
+    def test_waiter_gets_the_connection_returned_by_another_thread(self):
+        pool = new_pool(acquire_timeout=2)
+        connection = pool.getconn()
+        threading.Timer(0.05, pool.putconn, args=(connection,)).start()
+
+        self.assertIs(pool.getconn(), connection)
+
+    def test_rolls_back_connection_returned_mid_transaction(self):
+        pool = new_pool()
+        connection = pool.getconn()
+        connection.info.transaction_status = TRANSACTION_STATUS_INTRANS
+        pool.putconn(connection)
+
+        self.assertEqual(connection.rollbacks, 1)
+
+    def test_recent_idle_connection_is_not_pinged(self):
+        pool = new_pool(pre_ping_after=60)
+        connection = pool.getconn()
+        pool.putconn(connection)
+        pool.getconn()
+
+        self.assertEqual(connection.pings, 0)
+
+    def test_stale_idle_connection_failing_the_ping_is_replaced(self):
+        pool = new_pool(pre_ping_after=0)
+        connection = pool.getconn()
+        pool.putconn(connection)
+        connection.broken = True
+
+        replacement = pool.getconn()
+
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()["ping_failures_total"], 1)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_connection_older_than_max_lifetime_is_recycled(self):
+        pool = new_pool(max_lifetime=0.05)
+        connection = pool.getconn()
+        time.sleep(0.06)
+        pool.putconn(connection)
+
+        self.assertTrue(connection.closed)
+        self.assertIsNot(pool.getconn(), connection)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_closed_pool_refuses_new_checkouts(self):
+        pool = new_pool(min_size=1)
+        idle = pool._idle[0].connection
+        pool.closeall()
+
+        self.assertTrue(idle.closed)
+        with self.assertRaises(Exception):
+            pool.getconn()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from unittest import mock
+from database.membership_cache import MembershipCache
+from database.persistence import group_persistence
+from database.persistence.group_persistence import GroupPersistence, resolve_renames, RENAMING_PREFIX
+
+class ResolveRenamesTest(unittest.TestCase):
+    """Nome final de cada grupo de um lote de renomeações, sem banco"""
+
+    def test_swap_between_groups_of_the_batch_is_allowed(self):
+        final = resolve_renames({1: "B", 2: "A"}, {1: "A", 2: "B"})
+
+        self.assertEqual(final, {1: "B", 2: "A"})
+
+    def test_rotation_between_groups_of_the_batch_is_allowed(self):
+        final = resolve_renames({1: "B", 2: "C", 3: "A"}, {1: "A", 2: "B", 3: "C"})
+
+        self.assertEqual(final, {1: "B", 2: "C", 3: "A"})
+
+    def test_two_groups_asking_for_the_same_new_name_keep_theirs(self):
+        final = resolve_renames({1: "X", 2: "X"}, {1: "A", 2: "B"})
+
+        self.assertEqual(final, {1: "A", 2: "B"})
+
+    def test_name_of_a_group_outside_the_batch_is_not_taken(self):
+        final = resolve_renames({1: "C"}, {1: "A", 3: "C"})
+
+        self.assertEqual(final, {1: "A"})
+
+    def test_blocked_rename_blocks_the_group_waiting_for_its_name(self):
+        # 2 não pode ir para C (grupo 3, fora do lote), então continua com B e 1 não pode assumir B
+        final = resolve_renames({1: "B", 2: "C"}, {1: "A", 2: "B", 3: "C"})
+
+        self.assertEqual(final, {1: "A", 2: "B"})
+
+    def test_group_keeping_its_name_wins_over_a_group_asking_for_it(self):
+        final = resolve_renames({1: "A", 2: "A"}, {1: "A", 2: "B"})
+
+        self.assertEqual(final, {1: "A", 2: "B"})
+
+class FakeCursor:
+    def __init__(self, names):
+        self.names = names
+        self.statements = []
+
+    def execute(self, query, params=None):
+        self.statements.append((" ".join(query.split()), params))
+
+    def fetchall(self):
+        return list(self.names.items())
+
+class UpdateGroupsTest(unittest.TestCase):
+    """update_groups com o banco simulado: ordem das instruções e linhas enviadas"""
+
+    def setUp(self):
+        MembershipCache._instance = None
+        self.groups = GroupPersistence.__new__(GroupPersistence)
+        self.groups.membership_cache = MembershipCache()
+
+    def run_update(self, names, batch):
+        cursor = FakeCursor(names)
+        self.groups._execute_transaction = lambda work: work(cursor)
+        sent = []
+
+        def fake_execute_values(cur, query, rows, template=None, page_size=None, fetch=False):
+            sent.extend(rows)
+            return [(row[0], row[1], row[4]) for row in rows]
+
+        with mock.patch.object(group_persistence, 'execute_values', fake_execute_values):
+            updated = self.groups.update_groups(batch)
+        return cursor.statements, sent, updated
+
+    def test_name_swap_goes_through_provisional_names(self):
+        statements, sent, updated = self.run_update(
+            {1: "SACI - A", 2: "SACI - B"},
+            [(1, "SACI - B", "d1", {"code": "1"}), (2, "SACI - A", "d2", {"code": "2"})]
+        )
+
+        self.assertEqual(statements[1], ("UPDATE groups SET name = %s || id WHERE id = ANY(%s)",
+                                         (RENAMING_PREFIX, [1, 2])))
+        self.assertEqual([(row[0], row[1], row[4]) for row in sent],
+                         [(1, "SACI - B", False), (2, "SACI - A", False)])
+        self.assertEqual(updated, [
+            {"id": 1, "name": "SACI - B", "name_conflict": False},
+            {"id": 2, "name": "SACI - A", "name_conflict": False}
+        ])
+
+    def test_same_new_name_in_the_batch_is_reported_as_conflict(self):
+        statements, sent, updated = self.run_update(
+            {1: "SACI - A", 2: "SACI - B"},
+            [(1, "SACI - X", "d1", {"code": "1"}), (2, "SACI - X", "d2", {"code": "2"})]
+        )
+
+        self.assertEqual(len(statements), 1)  # só o SELECT ... FOR UPDATE, nenhum nome provisório
+        self.assertEqual(updated, [
+            {"id": 1, "name": "SACI - A", "name_conflict": True},
+            {"id": 2, "name": "SACI - B", "name_conflict": True}
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import threading
+import time
+import unittest
+from services.job_manager import JobManager, Job
+
+def new_manager(**kwargs) -> JobManager:
+    """Instância nova do singleton, com seu próprio pool de threads"""
+    JobManager._instance = None
+    return JobManager(**kwargs)
+
+def wait_finished(job: Job, timeout: float = 1.0):
+    deadline = time.monotonic() + timeout
+    while job.active and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+class JobManagerTest(unittest.TestCase):
+    """Jobs em segundo plano, um ativo por tipo"""
+
+    def test_submitting_the_same_kind_while_active_returns_the_running_job(self):
+        manager = new_manager(max_workers=2, history_size=10)
+        release = threading.Event()
+
+        job, created = manager.submit('saci', lambda progress: release.wait(1))
+        again, created_again = manager.submit('saci', lambda progress: None)
+
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertIs(again, job)
+
+        release.set()
+        wait_finished(job)
+        self.assertEqual(job.status, Job.SUCCEEDED)
+
+        next_job, created = manager.submit('saci', lambda progress: None)
+        self.assertTrue(created)
+        self.assertIsNot(next_job, job)
+
+    def test_different_kinds_run_independently(self):
+        manager = new_manager(max_workers=2, history_size=10)
+        release = threading.Event()
+
+        first, _ = manager.submit('saci', lambda progress: release.wait(1))
+        second, created = manager.submit('relatorio', lambda progress: None)
+
+        self.assertTrue(created)
+        self.assertIsNot(first, second)
+        release.set()
+
+    def test_records_result_progress_and_failure(self):
+        manager = new_manager(max_workers=1, history_size=10)
+
+        def work(progress):
+            progress('scraping', 0.5)
+            return {"turmas": 3}
+
+        ok, _ = manager.submit('ok', work)
+        wait_finished(ok)
+        self.assertEqual(ok.result, {"turmas": 3})
+        self.assertEqual((ok.phase, ok.progress), ('done', 1.0))
+
+        def broken(progress):
+            raise RuntimeError("SACI fora do ar")
+
+        failed, _ = manager.submit('falha', broken)
+        wait_finished(failed)
+        self.assertEqual(failed.status, Job.FAILED)
+        self.assertEqual(failed.error, "SACI fora do ar")
+        self.assertIsNotNone(failed.finished_at)
+
+    def test_history_keeps_only_the_most_recent_finished_jobs(self):
+        manager = new_manager(max_workers=1, history_size=2)
+        jobs = []
+        for kind in ('a', 'b', 'c'):
+            job, _ = manager.submit(kind, lambda progress: None)
+            wait_finished(job)
+            jobs.append(job)
+
+        self.assertIsNone(manager.get(jobs[0].id))
+        self.assertIs(manager.get(jobs[2].id), jobs[2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+from business.login_event import LOGIN_LOG_FILE, FAILED, iter_login_log
+from services import login_audit
+from services.login_audit import LoginAuditService
+
+class FakeLoginEventDao:
+    """LoginEventPersistence em memória; fail simula o banco fora do ar e release segura a gravação"""
+
+    def __init__(self):
+        self.rows = []
+        self.imported = []
+        self.fail = False
+        self.release = threading.Event()
+        self.release.set()
+
+    def record_events(self, rows) -> int:
+        self.release.wait(2)
+        if self.fail:
+            raise RuntimeError("banco indisponível")
+        self.rows.extend(rows)
+        return len(rows)
+
+    def import_login_history(self, logins) -> int:
+        self.imported.extend(logins)
+        return len(logins)
+
+class FakeDatabaseManager:
+    @contextmanager
+    def advisory_lock(self, key):
+        yield True
+
+class LoginAuditServiceTest(unittest.TestCase):
+    """Fila, gravação em lote e fallback para o log TXT, sem banco"""
+
+    def setUp(self):
+        # o escritor lê e grava os logs de login no diretório atual
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.dao = FakeLoginEventDao()
+        patches = [
+            mock.patch.object(login_audit, 'LoginEventPersistence', return_value=self.dao),
+            mock.patch.object(login_audit, 'DatabaseManager', FakeDatabaseManager),
+            mock.patch.object(login_audit.atexit, 'register'),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        LoginAuditService._instance = None
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def new_service(self, **kwargs) -> LoginAuditService:
+        kwargs.setdefault('batch_size', 10)
+        kwargs.setdefault('flush_interval', 0.05)
+        return LoginAuditService(**kwargs)
+
+    def test_flush_waits_for_queued_events_to_be_written(self):
+        service = self.new_service()
+
+        service.record_login({"id": 1, "username": "ana"}, ip="10.0.0.1")
+        service.record_failed_login("bob@ufpb.br")
+
+        self.assertTrue(service.flush(timeout=1))
+        self.assertEqual([(row[1], row[4]) for row in self.dao.rows], [("ana", "success"), ("bob@ufpb.br", FAILED)])
+        stats = service.stats()
+        self.assertEqual((stats["queued"], stats["written"], stats["failed_batches"]), (0, 2, 0))
+
+    def test_flush_times_out_while_the_batch_is_being_written(self):
+        self.dao.release.clear()
+        service = self.new_service()
+
+        service.record_login({"id": 1, "username": "ana"})
+
+        self.assertFalse(service.flush(timeout=0.1))
+        self.dao.release.set()
+        self.assertTrue(service.flush(timeout=1))
+
+    def test_failed_batch_keeps_only_successful_logins_in_the_txt_log(self):
+        self.dao.fail = True
+        service = self.new_service()
+
+        service.record_login({"id": 1, "username": "ana"})
+        service.record_failed_login("intruso")
+
+        self.assertTrue(service.flush(timeout=1))
+        self.assertEqual([event.username for event in iter_login_log(LOGIN_LOG_FILE)], ["ana"])
+        self.assertEqual(service.stats()["failed_batches"], 1)
+
+    def test_next_written_batch_imports_the_txt_log(self):
+        self.dao.fail = True
+        service = self.new_service()
+        service.record_login({"id": 1, "username": "ana"})
+        service.flush(timeout=1)
+
+        self.dao.fail = False
+        service.record_login({"id": 2, "username": "bia"})
+        service.flush(timeout=1)
+        # a importação roda depois do task_done do lote
+        self.wait_for(lambda: service.stats()["imported"] == 1)
+
+        self.assertEqual([login for login, _ in self.dao.imported], ["ana"])
+        self.assertFalse(os.path.exists(LOGIN_LOG_FILE))
+
+    def test_event_is_dropped_when_the_queue_is_full(self):
+        self.dao.release.clear()
+        with mock.patch.object(login_audit, 'LOGIN_AUDIT_QUEUE_SIZE', 1):
+            service = self.new_service(batch_size=1)
+        service.record_login({"id": 1, "username": "ana"})
+        # espera o escritor pegar o primeiro evento, que fica preso na gravação
+        self.wait_for(lambda: service.stats()["queued"] == 0)
+
+        service.record_login({"id": 2, "username": "bia"})
+        service.record_login({"id": 3, "username": "caio"})
+
+        self.assertEqual(service.stats()["dropped"], 1)
+        self.dao.release.set()
+        self.assertTrue(service.flush(timeout=1))
+
+    def wait_for(self, condition, timeout: float = 1.0):
+        event = threading.Event()
+        for _ in range(int(timeout / 0.01)):
+            if condition():
+                return
+            event.wait(0.01)
+        self.fail("condição não satisfeita a tempo")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import threading
+import time
+import unittest
+from collections import namedtuple
+from database.membership_cache import MembershipCache
+from database.persistence.group_persistence import GroupPersistence
+
+Row = namedtuple('Row', ['kind', 'user_id'])
+
+def new_cache(ttl: float = 30, max_groups: int = 100) -> MembershipCache:
+    """Instância nova do singleton, para que um teste não veja o cache de outro"""
+    MembershipCache._instance = None
+    return MembershipCache(ttl=ttl, max_groups=max_groups)
+
+class MembershipCacheTest(unittest.TestCase):
+    """Cache de membros/banidos em memória, sem banco"""
+
+    def test_hit_after_put_and_miss_after_ttl(self):
+        cache = new_cache(ttl=0.05)
+        cache.put(1, [10, 11], [12])
+
+        entry = cache.get(1)
+        self.assertEqual(entry.members, frozenset({10, 11}))
+        self.assertEqual(entry.banned, frozenset({12}))
+
+        time.sleep(0.06)
+        self.assertIsNone(cache.get(1))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used_group(self):
+        cache = new_cache(max_groups=2)
+        cache.put(1, [], [])
+        cache.put(2, [], [])
+        cache.get(1)
+        cache.put(3, [], [])
+
+        self.assertIsNotNone(cache.get(1))
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_load_started_before_invalidate_is_not_cached(self):
+        cache = new_cache()
+        generation = cache.generation(1)
+        cache.invalidate(1)
+
+        entry = cache.put(1, [10], [], generation=generation)
+
+        self.assertEqual(entry.members, frozenset({10}))
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.stale_loads, 1)
+
+    def test_load_started_before_clear_is_not_cached(self):
+        cache = new_cache()
+        generation = cache.generation(1)
+        cache.clear()
+
+        cache.put(1, [10], [], generation=generation)
+
+        self.assertIsNone(cache.get(1))
+
+    def test_load_after_invalidate_is_cached(self):
+        cache = new_cache()
+        cache.invalidate(1)
+        cache.put(1, [10], [], generation=cache.generation(1))
+
+        self.assertIsNotNone(cache.get(1))
+
+class GroupMembershipLoadTest(unittest.TestCase):
+    """_get_membership concorrendo com um banimento, com a consulta ao banco simulada"""
+
+    def setUp(self):
+        self.cache = new_cache()
+        # sem __init__: não abre o pool de conexões
+        self.groups = GroupPersistence.__new__(GroupPersistence)
+        self.groups.membership_cache = self.cache
+
+    def test_ban_committed_during_load_is_not_overwritten(self):
+        query_started = threading.Event()
+        ban_committed = threading.Event()
+
+        def slow_query(query, params, **kwargs):
+            # lê o estado antigo (usuário 10 membro e não banido) e só termina depois do banimento
+            query_started.set()
+            ban_committed.wait(1)
+            return [Row('member', 10)]
+
+        self.groups._execute_query = slow_query
+        loader = threading.Thread(target=self.groups.is_banned, args=(1, 10))
+        loader.start()
+
+        query_started.wait(1)
+        # ban_user: grava no banco, faz commit e invalida o grupo
+        self.cache.invalidate(1)
+        ban_committed.set()
+        loader.join(1)
+
+        self.groups._execute_query = lambda query, params, **kwargs: [Row('banned', 10)]
+        self.assertTrue(self.groups.is_banned(1, 10))
+        self.assertFalse(self.groups.is_member(1, 10))
+
+if __name__ == '__main__':
+    unittest.main()
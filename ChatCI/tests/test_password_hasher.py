@@ -0,0 +1,100 @@
+import threading
+import time
+import unittest
+from unittest import mock
+from services import password_hasher
+from services.password_hasher import PasswordHasher, PasswordHasherBusyError
+
+def new_hasher(**kwargs) -> PasswordHasher:
+    """Instância nova do singleton, com seu próprio pool de workers"""
+    PasswordHasher._instance = None
+    return PasswordHasher(**kwargs)
+
+class BlockingPbkdf2:
+    """Substitui o pbkdf2_hmac: cada chamada espera release() antes de terminar"""
+    def __init__(self):
+        self.started = threading.Semaphore(0)
+        self.finish = threading.Event()
+
+    def __call__(self, name, password, salt, iterations):
+        self.started.release()
+        self.finish.wait(5)
+        return b"\x00" * 32
+
+    def release(self):
+        self.finish.set()
+
+class PasswordHasherTest(unittest.TestCase):
+    """Vagas, fila e tempo limite do pool de hashing"""
+
+    def test_hash_and_verify_round_trip(self):
+        hasher = new_hasher(max_workers=1, max_queue=0, timeout=30)
+        with mock.patch.object(password_hasher, 'PBKDF2_ITERATIONS', 1000):
+            encoded = hasher.hash_password("segredo")
+
+        self.assertTrue(encoded.startswith("pbkdf2_sha256$1000$"))
+        self.assertTrue(hasher.verify_password("segredo", encoded))
+        self.assertFalse(hasher.verify_password("outra", encoded))
+        self.assertFalse(hasher.verify_password("segredo", "formato-invalido"))
+        self.assertEqual(hasher.stats()["completed_total"], 3)
+
+    def test_rejects_when_workers_and_queue_are_full(self):
+        hasher = new_hasher(max_workers=1, max_queue=0, timeout=5)
+        pbkdf2 = BlockingPbkdf2()
+        with mock.patch.object(password_hasher.hashlib, 'pbkdf2_hmac', pbkdf2):
+            first = threading.Thread(target=hasher.hash_password, args=("a",))
+            first.start()
+            pbkdf2.started.acquire(timeout=1)
+
+            with self.assertRaises(PasswordHasherBusyError):
+                hasher.hash_password("b")
+
+            pbkdf2.release()
+            first.join(1)
+
+        stats = hasher.stats()
+        self.assertEqual(stats["rejected_total"], 1)
+        self.assertEqual(stats["completed_total"], 1)
+        self.assertEqual((stats["queued"], stats["running"]), (0, 0))
+
+    def test_timed_out_hash_keeps_its_slot_until_it_finishes(self):
+        hasher = new_hasher(max_workers=1, max_queue=0, timeout=0.05)
+        pbkdf2 = BlockingPbkdf2()
+        with mock.patch.object(password_hasher.hashlib, 'pbkdf2_hmac', pbkdf2):
+            with self.assertRaises(PasswordHasherBusyError):
+                hasher.hash_password("a")
+            self.assertEqual(hasher.stats()["timeouts_total"], 1)
+
+            # o hash abandonado ainda roda no worker: a vaga não foi devolvida
+            with self.assertRaises(PasswordHasherBusyError):
+                hasher.hash_password("b")
+            self.assertEqual(hasher.stats()["rejected_total"], 1)
+
+            pbkdf2.release()
+            deadline = time.monotonic() + 1
+            while hasher.stats()["completed_total"] < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        hasher.timeout = 5
+        with mock.patch.object(password_hasher, 'PBKDF2_ITERATIONS', 1000):
+            self.assertTrue(hasher.hash_password("c"))
+
+    def test_queued_hash_that_times_out_is_cancelled_and_frees_its_slot(self):
+        hasher = new_hasher(max_workers=1, max_queue=1, timeout=0.05)
+        pbkdf2 = BlockingPbkdf2()
+        with mock.patch.object(password_hasher.hashlib, 'pbkdf2_hmac', pbkdf2):
+            with self.assertRaises(PasswordHasherBusyError):
+                hasher.hash_password("ocupa o worker")
+            with self.assertRaises(PasswordHasherBusyError):
+                hasher.hash_password("fica na fila")
+
+            stats = hasher.stats()
+            self.assertEqual(stats["timeouts_total"], 2)
+            self.assertEqual((stats["queued"], stats["running"]), (0, 1))
+            # a vaga do hash cancelado na fila já voltou: cabe mais um na fila
+            self.assertTrue(hasher._slots.acquire(blocking=False))
+            hasher._slots.release()
+            pbkdf2.release()
+
+if __name__ == '__main__':
+    unittest.main()
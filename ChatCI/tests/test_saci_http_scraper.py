@@ -0,0 +1,65 @@
+import os
+import unittest
+from bot.saci_http_scraper import parse_turmas_html
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+class ParseTurmasHtmlTest(unittest.TestCase):
+    """Interpreta uma página salva do SACI, sem rede nem navegador"""
+
+    def test_parses_every_turma_row(self):
+        turmas = parse_turmas_html(load_fixture('saci_salas_ci.html'))
+
+        self.assertEqual(turmas, [
+            {
+                "code": "1204112",
+                "turma": "01",
+                "nome": "ADMINISTRAÇÃO DE SISTEMAS DE INFORMAÇÕES",
+                "hora": "6T2345",
+                "alunos": "9",
+                "departamento": "CCSA - DA",
+                "sala": "CI 308",
+                "professor": "undefined"
+            },
+            {
+                "code": "5102009",
+                "turma": "01",
+                "nome": "ALGEBRA LINEAR COMPUTACIONAL",
+                "hora": "35M23",
+                "alunos": "34",
+                "departamento": "CI-DCC",
+                "sala": "CI T03 (Auditório)",
+                "professor": "FELIPE ANTONIO GARCIA MORENO"
+            },
+            {
+                "code": "GDCOC0076",
+                "turma": "02",
+                "nome": "ANÁLISE E PROJETO DE ALGORITMOS",
+                "hora": "35T45",
+                "alunos": "60",
+                "departamento": "CI-DCC",
+                "sala": "CI 102",
+                "professor": "BRUNO PETRATO BRUCK"
+            },
+            {
+                "code": "GDCOC0076",
+                "turma": "01",
+                "nome": "ANÁLISE E PROJETO DE ALGORITMOS",
+                "hora": "35T45",
+                "alunos": "63",
+                "departamento": "CI-DCC",
+                "sala": "CI T06",
+                "professor": "LUCIDIO DOS ANJOS FORMIGA CABRAL"
+            }
+        ])
+
+    def test_page_without_table_has_no_turmas(self):
+        # página renderizada no cliente: o scraper HTTP devolve vazio e o Selenium assume
+        self.assertEqual(parse_turmas_html("<html><body><div id='app'></div></body></html>"), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from datetime import datetime
+from bot.saci_sync import diff_turmas, turma_data, changed_fields
+
+def turma(code: str, numero: str = "01", **fields) -> dict:
+    data = {"code": code, "turma": numero, "nome": f"DISCIPLINA {code}", "hora": "24M12",
+            "alunos": "30", "departamento": "CI", "sala": "CI 101", "professor": "Fulano de Tal"}
+    data.update(fields)
+    return data
+
+def group_name(t: dict) -> str:
+    return f"SACI - {t['code']} - {t['nome']} (T{t['turma']})"
+
+def group_for(group_id: int, t: dict, closed_at=None, name: str = None) -> dict:
+    return {"id": group_id, "name": name or group_name(t), "saci_code": t["code"], "saci_turma": t["turma"],
+            "saci_data": turma_data(t), "closed_at": closed_at}
+
+class DiffTurmasTest(unittest.TestCase):
+    """Comparação das turmas do SACI com os grupos do banco, sem banco"""
+
+    def test_unchanged_turma_is_only_counted(self):
+        t = turma("1107180")
+
+        diff = diff_turmas([group_for(1, t)], [t], group_name)
+
+        self.assertEqual((diff.added, diff.changed, diff.removed, diff.unchanged), ([], [], [], 1))
+
+    def test_new_turma_is_added(self):
+        t = turma("1107180")
+
+        diff = diff_turmas([], [t], group_name)
+
+        self.assertEqual(diff.added, [t])
+
+    def test_changed_fields_closed_group_and_pending_rename_are_changes(self):
+        sala = turma("1", sala="CI 205")
+        reaberta = turma("2")
+        renomeada = turma("3")
+        groups = [
+            group_for(1, turma("1")),
+            group_for(2, reaberta, closed_at=datetime(2025, 1, 1)),
+            group_for(3, renomeada, name="SACI - 3 - NOME ANTIGO (T01)"),
+        ]
+
+        diff = diff_turmas(groups, [sala, reaberta, renomeada], group_name)
+
+        self.assertEqual([group["id"] for group, _ in diff.changed], [1, 2, 3])
+        self.assertEqual(changed_fields(groups[0]["saci_data"], turma_data(sala)), ["sala"])
+
+    def test_only_open_groups_whose_turma_disappeared_are_removed(self):
+        aberto = group_for(1, turma("1"))
+        encerrado = group_for(2, turma("2"), closed_at=datetime(2025, 1, 1))
+
+        diff = diff_turmas([aberto, encerrado], [], group_name)
+
+        self.assertEqual(diff.removed, [aberto])
+
+    def test_same_code_with_another_turma_number_is_a_different_turma(self):
+        t1 = turma("1", "01")
+        t2 = turma("1", "02")
+
+        diff = diff_turmas([group_for(1, t1)], [t1, t2], group_name)
+
+        self.assertEqual(diff.added, [t2])
+        self.assertEqual(diff.unchanged, 1)
+
+    def test_repeated_key_keeps_first_occurrence(self):
+        first = turma("1", sala="CI 101")
+        repeated = turma("1", sala="CI 999")
+
+        diff = diff_turmas([], [first, repeated], group_name)
+
+        self.assertEqual(diff.added, [first])
+
+if __name__ == '__main__':
+    unittest.main()
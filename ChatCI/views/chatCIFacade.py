@@ -15,12 +15,13 @@ class ChatCIFacade:
         self.file_adapter = BinaryFileAdapter()
         
     #login
-    def login(self, email_ou_username: str, senha: str):
+    def login(self, email_ou_username: str, senha: str, ip: str = None):
         """
         Tenta autenticar um usuário. 
         Retorna o dict do usuário em caso de sucesso, ou None caso falhe.
+        O ip (opcional) é registrado no histórico de logins.
         """
-        return self.user.validar_login(email_ou_username, senha)
+        return self.user.validar_login(email_ou_username, senha, ip)
 
     def logout(self, session: dict):
         """
@@ -1,32 +1,66 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Link } from 'react-router-dom';
 import api from '../services/api';
 
+const JOB_POLL_INTERVAL = 2000;
+
 const AdminPanel = () => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
   const [integrationResult, setIntegrationResult] = useState(null);
+  const [jobPhase, setJobPhase] = useState(null);
+  const pollRef = useRef(null);
+
+  useEffect(() => {
+    return () => clearTimeout(pollRef.current);
+  }, []);
+
+  const pollJob = async (jobId) => {
+    try {
+      const response = await api.get(`/api/admin/jobs/${jobId}`);
+      const job = response.data.job;
+
+      if (job.status === 'succeeded' && job.result.skipped) {
+        setSuccess('Uma sincronização SACI já está em andamento ou foi executada agora há pouco.');
+        setLoading(false);
+      } else if (job.status === 'succeeded') {
+        setSuccess('Integração SACI executada com sucesso!');
+        setIntegrationResult(job.result);
+        setLoading(false);
+      } else if (job.status === 'failed') {
+        setError(`Erro na integração SACI: ${job.error}`);
+        setLoading(false);
+      } else {
+        setJobPhase(job.phase);
+        pollRef.current = setTimeout(() => pollJob(jobId), JOB_POLL_INTERVAL);
+      }
+    } catch (error) {
+      setError('Erro ao consultar o andamento da integração SACI');
+      setLoading(false);
+      console.error(error);
+    }
+  };
 
   const runSaciIntegration = async () => {
     setLoading(true);
     setError('');
     setSuccess('');
     setIntegrationResult(null);
+    setJobPhase(null);
     
     try {
       const response = await api.post('/api/admin/scrape-saci');
       if (response.data.success) {
-        setSuccess('Integração SACI executada com sucesso!');
-        setIntegrationResult(response.data);
+        pollJob(response.data.job_id);
       } else {
         setError('Erro na integração SACI');
+        setLoading(false);
       }
     } catch (error) {
       setError('Erro ao executar integração SACI');
-      console.error(error);
-    } finally {
       setLoading(false);
+      console.error(error);
     }
   };
 
@@ -46,7 +80,7 @@ const AdminPanel = () => {
             className="btn btn-primary"
             disabled={loading}
           >
-            {loading ? 'Executando...' : 'Executar Integração'}
+            {loading ? `Executando${jobPhase ? ` (${jobPhase})` : ''}...` : 'Executar Integração'}
           </button>
           
           {integrationResult && (
@@ -56,6 +90,8 @@ const AdminPanel = () => {
                 <li className="list-group-item">Turmas encontradas: {integrationResult.turmas_found}</li>
                 <li className="list-group-item">Grupos criados: {integrationResult.groups_created}</li>
                 <li className="list-group-item">Grupos existentes: {integrationResult.groups_existing}</li>
+                <li className="list-group-item">Grupos atualizados: {integrationResult.groups_updated}</li>
+                <li className="list-group-item">Grupos encerrados: {integrationResult.groups_closed}</li>
               </ul>
               
               {integrationResult.errors && integrationResult.errors.length > 0 && (
@@ -23,7 +23,7 @@ const Dashboard = () => {
 
   const fetchGroups = async () => {
     try {
-      const response = await api.get('/api/grupos');
+      const response = await api.get('/api/grupos', { params: { stream: true } });
       // Check if the response contains the expected data structure
       if (response.data && response.data.all_groups) {
         setAllGroups(response.data.all_groups);
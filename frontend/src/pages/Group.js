@@ -13,21 +13,54 @@ const Group = () => {
   const { currentUser, isAdmin } = useAuth();
   const { groupId } = useParams();
   const messagesEndRef = useRef(null);
-  const [messageInterval, setMessageInterval] = useState(null);
+  const lastMessageIdRef = useRef(null);
+  const streamingRef = useRef(false);
 
   useEffect(() => {
+    lastMessageIdRef.current = null;
     fetchGroupDetails();
     fetchMessages();
     fetchMembers();
 
-    // Setup interval to fetch messages
+    // Receive new messages pushed by the server
+    const stream = new EventSource(
+      `${api.defaults.baseURL}/api/grupos/${groupId}/mensagens/stream`,
+      { withCredentials: true }
+    );
+    stream.onopen = () => {
+      streamingRef.current = true;
+      // Catch up on anything sent while the stream was down
+      fetchNewMessages();
+    };
+    stream.onerror = () => {
+      streamingRef.current = false;
+    };
+    stream.addEventListener('message', (event) => {
+      const message = JSON.parse(event.data);
+      addMessages([message]);
+      if (lastMessageIdRef.current == null || message.id > lastMessageIdRef.current) {
+        lastMessageIdRef.current = message.id;
+      }
+    });
+
+    // Fall back to fetching only new messages while the stream is unavailable
     const interval = setInterval(() => {
-      fetchMessages();
+      if (!streamingRef.current) {
+        fetchNewMessages();
+      }
     }, 5000);
-    setMessageInterval(interval);
+
+    // Removed from or banned in the group: stop reconnecting and polling
+    stream.addEventListener('revoked', () => {
+      stream.close();
+      clearInterval(interval);
+      setError('Você não tem mais acesso a este grupo');
+    });
 
     return () => {
-      clearInterval(messageInterval);
+      stream.close();
+      streamingRef.current = false;
+      clearInterval(interval);
     };
   }, [groupId]);
 
@@ -59,6 +92,46 @@ const Group = () => {
       const response = await api.get(`/api/grupos/${groupId}/mensagens`);
       if (response.data.success) {
         setMessages(response.data.messages);
+        lastMessageIdRef.current = response.data.latest_id;
+      }
+    } catch (error) {
+      console.error('Erro ao carregar mensagens', error);
+    }
+  };
+
+  const addMessages = (newMessages) => {
+    if (newMessages.length === 0) return;
+    setMessages(prev => {
+      const knownIds = new Set(prev.map(message => message.id));
+      return [...newMessages.filter(message => !knownIds.has(message.id)), ...prev];
+    });
+  };
+
+  const fetchNewMessages = async () => {
+    if (lastMessageIdRef.current == null) {
+      fetchMessages();
+      return;
+    }
+
+    try {
+      const response = await api.get(`/api/grupos/${groupId}/mensagens`, {
+        params: { after_id: lastMessageIdRef.current },
+        validateStatus: status => (status >= 200 && status < 300) || status === 304
+      });
+      if (response.status === 304 || !response.data.success) {
+        return;
+      }
+
+      // after_id devolve as mensagens mais antigas primeiro; a lista exibida é das mais recentes para as mais antigas
+      const received = response.data.messages;
+      if (received.length === 0) {
+        return;
+      }
+      addMessages([...received].reverse());
+      lastMessageIdRef.current = Math.max(...received.map(message => message.id));
+      if (response.data.latest_id != null && lastMessageIdRef.current < response.data.latest_id) {
+        // Ainda há mensagens além do limite da página
+        fetchNewMessages();
       }
     } catch (error) {
       console.error('Erro ao carregar mensagens', error);
@@ -67,7 +140,7 @@ const Group = () => {
 
   const fetchMembers = async () => {
     try {
-      const response = await api.get(`/api/grupos/${groupId}/membros`);
+      const response = await api.get(`/api/grupos/${groupId}/membros`, { params: { stream: true } });
       if (response.data.success) {
         setMembers(response.data.members);
       }
@@ -87,8 +160,8 @@ const Group = () => {
       
       if (response.data.success) {
         setNewMessage('');
-        // Fetch updated messages
-        fetchMessages();
+        // Fetch only the messages we have not seen yet
+        fetchNewMessages();
       }
     } catch (error) {
       setError('Erro ao enviar mensagem');